@@ -28,8 +28,13 @@ function flattenEmbeddingOutput(value) {
   return [];
 }
 
+// Vecteur quantifie : tableau JSON ou Int8Array (index packe).
+function isQuantizedVector(value) {
+  return Array.isArray(value) || ArrayBuffer.isView(value);
+}
+
 function scoreQuantizedEmbedding(queryVector, encodedVector, scale = 127) {
-  if (!Array.isArray(encodedVector) || !queryVector.length) {
+  if (!isQuantizedVector(encodedVector) || !queryVector.length) {
     return null;
   }
 
@@ -55,7 +60,7 @@ function scoreQuantizedMultiEmbeddings(queryVector, vectorEntries, scale = 127,
 
   vectorEntries.forEach(entry => {
     const slot = entry?.slot || '';
-    const rawEmbedding = Array.isArray(entry?.embedding) ? entry.embedding : entry;
+    const rawEmbedding = isQuantizedVector(entry?.embedding) ? entry.embedding : entry;
     const score = scoreQuantizedEmbedding(queryVector, rawEmbedding, scale);
     if (!Number.isFinite(score)) {
       return;
@@ -0,0 +1,39 @@
+// Index semantique packe : entete JSON (ordre des scrutins, modele) + matrice
+// int8 contigue (une ligne par vecteur). Decode vers la disposition JSON
+// historique ({ model, votes }) avec des Int8Array partageant le meme buffer,
+// sans recopier ni parser les vecteurs.
+export const PACKED_SEMANTIC_INDEX_FORMAT = 'int8-row-major';
+
+export function decodePackedSemanticIndex(header, buffer) {
+  if (header?.format !== PACKED_SEMANTIC_INDEX_FORMAT || !Array.isArray(header?.voteIds)) {
+    throw new Error('Entete d\'index semantique packe invalide.');
+  }
+
+  const [rows, dimension] = Array.isArray(header.shape) ? header.shape.map(Number) : [0, 0];
+  const matrix = new Int8Array(buffer);
+  if (matrix.length !== rows * dimension || header.voteIds.length !== rows) {
+    throw new Error(`Index semantique packe incoherent : ${matrix.length} octets pour ${rows}x${dimension}.`);
+  }
+
+  const slots = Array.isArray(header.slots) ? header.slots : null;
+  const votes = {};
+  header.voteIds.forEach((voteId, row) => {
+    const embedding = matrix.subarray(row * dimension, (row + 1) * dimension);
+    if (!slots) {
+      votes[voteId] = { embedding };
+      return;
+    }
+
+    if (!votes[voteId]) {
+      votes[voteId] = { vectors: [] };
+    }
+    votes[voteId].vectors.push({ slot: slots[row], embedding });
+  });
+
+  return {
+    schemaVersion: header.schemaVersion,
+    generatedAt: header.generatedAt,
+    model: header.model || {},
+    votes
+  };
+}
@@ -0,0 +1,42 @@
+import { describe, it, expect } from 'vitest';
+import { decodePackedSemanticIndex } from './packed-semantic-index.js';
+
+function buildBuffer(rows) {
+  return Int8Array.from(rows.flat()).buffer;
+}
+
+describe('packed-semantic-index', () => {
+  it('decodes a single-vector matrix into per-vote Int8Array views', () => {
+    const header = {
+      schemaVersion: 1,
+      format: 'int8-row-major',
+      shape: [2, 3],
+      model: { strategy: 'single_vector', dimension: 3 },
+      voteIds: ['1', '2']
+    };
+    const payload = decodePackedSemanticIndex(header, buildBuffer([[1, -2, 3], [-127, 0, 127]]));
+
+    expect(payload.model.dimension).toBe(3);
+    expect(Array.from(payload.votes['2'].embedding)).toEqual([-127, 0, 127]);
+    expect(payload.votes['1'].embedding).toBeInstanceOf(Int8Array);
+  });
+
+  it('groups multi-vector rows by vote with their slot', () => {
+    const header = {
+      format: 'int8-row-major',
+      shape: [3, 2],
+      model: { strategy: 'multi_vector_sections' },
+      voteIds: ['1', '1', '2'],
+      slots: ['subject_summary', 'title_keywords', 'subject_summary']
+    };
+    const payload = decodePackedSemanticIndex(header, buildBuffer([[1, 2], [3, 4], [5, 6]]));
+
+    expect(payload.votes['1'].vectors.map(vector => vector.slot)).toEqual(['subject_summary', 'title_keywords']);
+    expect(Array.from(payload.votes['2'].vectors[0].embedding)).toEqual([5, 6]);
+  });
+
+  it('rejects a matrix that does not match the header shape', () => {
+    const header = { format: 'int8-row-major', shape: [2, 3], voteIds: ['1', '2'] };
+    expect(() => decodePackedSemanticIndex(header, buildBuffer([[1, 2, 3]]))).toThrow('incoherent');
+  });
+});
@@ -7,6 +7,7 @@ import {
   RAG_SEMANTIC_REMOTE_INDEX_PATH,
 } from '../core/config.js';
 import { loadExternalScript } from '../core/external-script-loader.js';
+import { decodePackedSemanticIndex } from './packed-semantic-index.js';
 
 const SEARCH_INDEX_DEFAULT_SEMANTIC_MODE = 'single_vector';
 const MINI_SEARCH_CDN_URL = 'https://cdn.jsdelivr.net/npm/minisearch@6.3.0/dist/umd/index.min.js';
@@ -302,6 +303,35 @@ export function createSearchIndexRepository({
     }
   }
 
+  // Variante binaire (matrice int8 + entete) : ~4x moins d'octets et aucun
+  // parsing des vecteurs. Repli silencieux sur l'artefact JSON en cas d'echec.
+  async function loadPackedSemanticIndex(artifactInfo) {
+    const packed = artifactInfo.artifact?.packed;
+    if (!packed?.path || !packed?.dataPath) {
+      return null;
+    }
+
+    const resolvePackedUrl = path => (path.startsWith('http') || path.startsWith('/')
+      ? path
+      : new URL(path, buildUrl(RAG_MANIFEST_PATH)).toString());
+
+    try {
+      const [headerResponse, dataResponse] = await Promise.all([
+        fetchImpl(buildVersionedUrl(resolvePackedUrl(packed.path), packed.sha256 || artifactInfo.versionToken)),
+        fetchImpl(buildVersionedUrl(resolvePackedUrl(packed.dataPath), packed.dataSha256 || artifactInfo.versionToken))
+      ]);
+      if (!headerResponse.ok || !dataResponse.ok) {
+        return null;
+      }
+
+      const payload = decodePackedSemanticIndex(await headerResponse.json(), await dataResponse.arrayBuffer());
+      return payload.model ? payload : null;
+    } catch (error) {
+      logger.warn(`⚠️ Index sémantique packé illisible (${packed.path}), repli JSON.`, error);
+      return null;
+    }
+  }
+
   async function loadSemanticIndex(mode = SEARCH_INDEX_DEFAULT_SEMANTIC_MODE) {
     const artifactInfo = await resolveSemanticArtifactInfo(mode);
     const modeId = artifactInfo.modeId || normalizeSemanticModeId(mode);
@@ -318,6 +348,14 @@ export function createSearchIndexRepository({
         return false;
       }
 
+      const packedPayload = await loadPackedSemanticIndex(artifactInfo);
+      if (packedPayload) {
+        state.semanticIndexes[modeId] = packedPayload;
+        state.semanticIndexLoadedModes[modeId] = true;
+        logger.log(`✅ Index sémantique (${modeId}) chargé depuis l'artefact packé.`);
+        return true;
+      }
+
       const candidatePaths = [
         buildVersionedUrl(artifactInfo.path, artifactInfo.versionToken),
         buildVersionedUrl(getFallbackSemanticArtifactPath(modeId), artifactInfo.versionToken)
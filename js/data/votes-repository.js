@@ -1,3 +1,76 @@
+// Fichiers de votes par depute : deux dispositions coexistent.
+// - legacy : tableau d'objets { date, titre, sort, numero, vote } ;
+// - compacte (schemaVersion 2) : { table, votes: [[indexScrutin, codePosition], ...] },
+//   les metadonnees de scrutin etant factorisees dans une table partagee
+//   (public/data/votes/scrutins.json). Les deux sont exposees au reste de
+//   l'application sous la forme legacy.
+const DEFAULT_SCRUTIN_TABLE_FILENAME = 'scrutins.json';
+const DEFAULT_POSITION_LABELS = ['Absent', 'Pour', 'Contre', 'Abstention', 'Non-votant'];
+
+const scrutinTablePromises = new Map();
+
+function isCompactVotesPayload(payload) {
+  return Boolean(payload) && !Array.isArray(payload) && Array.isArray(payload.votes);
+}
+
+function fetchScrutinTable(url, fetchImpl, { refresh = false } = {}) {
+  if (!refresh && scrutinTablePromises.has(url)) {
+    return scrutinTablePromises.get(url);
+  }
+
+  // no-cache : revalidation conditionnelle, la table grossit a chaque mise a jour.
+  const promise = (async () => {
+    const response = await fetchImpl(url, { cache: refresh ? 'no-store' : 'no-cache' });
+    if (!response.ok) {
+      const error = new Error(`HTTP ${response.status} sur la table des scrutins.`);
+      error.status = response.status;
+      throw error;
+    }
+
+    const table = await response.json();
+    if (!Array.isArray(table?.scrutins)) {
+      throw new Error('Table des scrutins invalide.');
+    }
+    return table;
+  })();
+
+  scrutinTablePromises.set(url, promise);
+  promise.catch(() => {
+    if (scrutinTablePromises.get(url) === promise) {
+      scrutinTablePromises.delete(url);
+    }
+  });
+  return promise;
+}
+
+function referencesUnknownScrutin(payload, table) {
+  const size = table.scrutins.length;
+  return payload.votes.some(([scrutinIndex]) => scrutinIndex >= size);
+}
+
+export function expandCompactDeputeVotes(payload, table) {
+  const fields = Array.isArray(table?.fields) ? table.fields : ['numero', 'date', 'titre', 'sort'];
+  const positions = Array.isArray(table?.positions) ? table.positions : DEFAULT_POSITION_LABELS;
+  const fieldIndex = Object.fromEntries(fields.map((field, index) => [field, index]));
+
+  return payload.votes
+    .filter(([scrutinIndex]) => Array.isArray(table.scrutins[scrutinIndex]))
+    .map(([scrutinIndex, position]) => {
+      const row = table.scrutins[scrutinIndex];
+      return {
+        date: row[fieldIndex.date] ?? '',
+        titre: row[fieldIndex.titre] ?? '',
+        sort: row[fieldIndex.sort] ?? '',
+        numero: row[fieldIndex.numero] ?? '',
+        vote: positions[position] || 'Inconnu'
+      };
+    });
+}
+
+export function resetScrutinTableCache() {
+  scrutinTablePromises.clear();
+}
+
 export async function loadDeputeVotes(
   deputeId,
   {
@@ -13,7 +86,20 @@ export async function loadDeputeVotes(
       error.status = response.status;
       throw error;
     }
-    return { votes: await response.json(), error: null };
+
+    const payload = await response.json();
+    if (!isCompactVotesPayload(payload)) {
+      return { votes: payload, error: null };
+    }
+
+    const tableUrl = `${basePath}/${payload.table || DEFAULT_SCRUTIN_TABLE_FILENAME}`;
+    let table = await fetchScrutinTable(tableUrl, fetchImpl);
+    if (referencesUnknownScrutin(payload, table)) {
+      // Fichier depute plus recent que la table en cache : on force un rechargement.
+      table = await fetchScrutinTable(tableUrl, fetchImpl, { refresh: true });
+    }
+
+    return { votes: expandCompactDeputeVotes(payload, table), error: null };
   } catch (error) {
     logger.error(`Votes: echec du chargement pour ${deputeId}.`, error);
     return { votes: [], error: error.message || 'Chargement des votes impossible.' };
@@ -0,0 +1,111 @@
+import { beforeEach, describe, it, expect, vi } from 'vitest';
+import { expandCompactDeputeVotes, loadDeputeVotes, resetScrutinTableCache } from './votes-repository.js';
+
+const LEGACY_VOTES = [
+  { date: '2026-07-21', titre: 'le sous-amendement n° 2', sort: 'adopté', numero: '8428', vote: 'Pour' }
+];
+
+const SCRUTIN_TABLE = {
+  schemaVersion: 2,
+  fields: ['numero', 'date', 'titre', 'sort'],
+  positions: ['Absent', 'Pour', 'Contre', 'Abstention', 'Non-votant'],
+  scrutins: [
+    ['1', '2024-10-01', "l'ensemble du projet de loi de finances", 'adopté'],
+    ['2', '2024-10-02', "l'amendement n° 12", 'rejeté']
+  ]
+};
+
+const COMPACT_VOTES = {
+  schemaVersion: 2,
+  table: 'scrutins.json',
+  votes: [[1, 2], [0, 1]]
+};
+
+function jsonResponse(body) {
+  return { ok: true, json: async () => body };
+}
+
+function createFetchMock(routes) {
+  return vi.fn(async url => {
+    const path = String(url);
+    const match = Object.keys(routes).find(suffix => path.endsWith(suffix));
+    if (!match) {
+      return { ok: false, status: 404 };
+    }
+    const body = routes[match];
+    return jsonResponse(typeof body === 'function' ? body() : body);
+  });
+}
+
+const silentLogger = { error: vi.fn() };
+
+describe('votes-repository', () => {
+  beforeEach(() => {
+    resetScrutinTableCache();
+  });
+
+  it('returns legacy per-deputy arrays unchanged', async () => {
+    const fetchImpl = createFetchMock({ 'PA1.json': LEGACY_VOTES });
+    const result = await loadDeputeVotes('PA1', { fetchImpl, logger: silentLogger });
+
+    expect(result).toEqual({ votes: LEGACY_VOTES, error: null });
+    expect(fetchImpl).toHaveBeenCalledTimes(1);
+  });
+
+  it('expands compact files against the shared scrutin table', async () => {
+    const fetchImpl = createFetchMock({ 'PA1.json': COMPACT_VOTES, 'scrutins.json': SCRUTIN_TABLE });
+    const { votes, error } = await loadDeputeVotes('PA1', { fetchImpl, logger: silentLogger });
+
+    expect(error).toBeNull();
+    expect(votes).toEqual([
+      { date: '2024-10-02', titre: "l'amendement n° 12", sort: 'rejeté', numero: '2', vote: 'Contre' },
+      { date: '2024-10-01', titre: "l'ensemble du projet de loi de finances", sort: 'adopté', numero: '1', vote: 'Pour' }
+    ]);
+  });
+
+  it('fetches the shared table once for several deputies', async () => {
+    const fetchImpl = createFetchMock({
+      'PA1.json': COMPACT_VOTES,
+      'PA2.json': { ...COMPACT_VOTES, votes: [[0, 3]] },
+      'scrutins.json': SCRUTIN_TABLE
+    });
+
+    await loadDeputeVotes('PA1', { fetchImpl, logger: silentLogger });
+    const { votes } = await loadDeputeVotes('PA2', { fetchImpl, logger: silentLogger });
+
+    expect(votes[0].vote).toBe('Abstention');
+    expect(fetchImpl.mock.calls.filter(([url]) => String(url).endsWith('scrutins.json'))).toHaveLength(1);
+  });
+
+  it('reloads a stale table when a deputy file references a newer scrutin', async () => {
+    let tableVersion = 0;
+    const fetchImpl = createFetchMock({
+      'PA1.json': { ...COMPACT_VOTES, votes: [[2, 1]] },
+      'scrutins.json': () => {
+        tableVersion += 1;
+        return tableVersion === 1
+          ? SCRUTIN_TABLE
+          : { ...SCRUTIN_TABLE, scrutins: [...SCRUTIN_TABLE.scrutins, ['3', '2024-10-03', 'la motion de censure', 'rejeté']] };
+      }
+    });
+
+    const { votes } = await loadDeputeVotes('PA1', { fetchImpl, logger: silentLogger });
+
+    expect(votes).toEqual([{ date: '2024-10-03', titre: 'la motion de censure', sort: 'rejeté', numero: '3', vote: 'Pour' }]);
+    expect(fetchImpl).toHaveBeenLastCalledWith('public/data/votes/scrutins.json', { cache: 'no-store' });
+  });
+
+  it('reports an error when the shared table is unavailable', async () => {
+    const fetchImpl = createFetchMock({ 'PA1.json': COMPACT_VOTES });
+    const result = await loadDeputeVotes('PA1', { fetchImpl, logger: silentLogger });
+
+    expect(result.votes).toEqual([]);
+    expect(result.error).toContain('HTTP 404');
+  });
+
+  it('skips pairs that point outside the table', () => {
+    const votes = expandCompactDeputeVotes({ votes: [[0, 2], [9, 1]] }, SCRUTIN_TABLE);
+    expect(votes).toHaveLength(1);
+    expect(votes[0].numero).toBe('1');
+  });
+});
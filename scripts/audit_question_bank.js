@@ -108,7 +108,8 @@ async function buildRuntimeHelpers() {
     routerConstantsModule,
     intentDetectorsModule,
     analysisContextModule,
-    voteHelpersModule
+    voteHelpersModule,
+    votesRepositoryModule
   ] = await Promise.all([
     importModule('js/domain/router.js'),
     importModule('js/domain/deterministic-responses.js'),
@@ -121,14 +122,21 @@ async function buildRuntimeHelpers() {
     importModule('js/domain/router-constants.js'),
     importModule('js/domain/intent-detectors.js'),
     importModule('js/domain/analysis-context.js'),
-    importModule('js/domain/vote-helpers.js')
+    importModule('js/domain/vote-helpers.js'),
+    importModule('js/data/votes-repository.js')
   ]);
 
   const latest = loadJson(LATEST_DEPUTES_PATH);
   const deputesPayload = loadJson(path.join(DEPUTES_DIR, `${latest.version}.json`));
   const deputes = deputesPayload.deputes || deputesPayload;
   const depute = deputes.find(entry => entry.id === 'PA1008') || deputes[0];
-  const votes = loadJson(path.join(VOTES_DIR, `${depute.id}.json`));
+  const votesPayload = loadJson(path.join(VOTES_DIR, `${depute.id}.json`));
+  const votes = Array.isArray(votesPayload)
+    ? votesPayload
+    : votesRepositoryModule.expandCompactDeputeVotes(
+      votesPayload,
+      loadJson(path.join(VOTES_DIR, votesPayload.table || 'scrutins.json'))
+    );
   const searchIndexPath = fs.existsSync(RAG_LEXICAL_INDEX_PATH) ? RAG_LEXICAL_INDEX_PATH : LEGACY_LEXICAL_INDEX_PATH;
   const searchIndex = loadJson(searchIndexPath);
 
@@ -0,0 +1,80 @@
+"""Mesure le debit d'encodage E5 (textes/s) selon le nombre de processus.
+
+Usage :
+    python scripts/benchmark_semantic_encoding.py --workers 1,2,4 [--backend onnx] [--limit 2000]
+
+Les textes sont ceux de l'index lexical publie (documents de reference et
+sections multi-vector) ; a defaut, un corpus synthetique de titres de
+longueurs variees. Sert a choisir --semantic-workers pour la taille du runner.
+"""
+
+import argparse
+import os
+import random
+import time
+
+from generate_semantic_index import (
+    FICHIER_LEXICAL_INDEX,
+    SEMANTIC_ENCODER_BACKENDS,
+    SEMANTIC_PYTHON_MODEL_ID,
+    collect_multivector_texts,
+    collect_single_vector_texts,
+    encode_semantic_texts,
+    load_semantic_encoder,
+    sort_semantic_vote_items,
+)
+import json_backend
+
+SYNTHETIC_TITLES = [
+    "l'ensemble du projet de loi de finances pour 2026 (première lecture)",
+    "l'amendement n° {n} de M. X à l'article 3 de la proposition de loi visant à protéger le logement des étudiants",
+    "la motion de censure déposée en application de l'article 49, alinéa 3, de la Constitution",
+    "le sous-amendement n° {n}",
+    "l'article premier du projet de loi relatif à l'immigration, à l'intégration et au séjour des étrangers en France",
+]
+
+
+def load_benchmark_texts(limit: int):
+    if os.path.exists(FICHIER_LEXICAL_INDEX):
+        vote_items = sort_semantic_vote_items(json_backend.load_path(FICHIER_LEXICAL_INDEX))
+        texts = [text for _vote_id, text in collect_single_vector_texts(vote_items)]
+        texts += [text for _mapping, text in collect_multivector_texts(vote_items)]
+        if texts:
+            return texts[:limit], FICHIER_LEXICAL_INDEX
+
+    rng = random.Random(7)
+    texts = [rng.choice(SYNTHETIC_TITLES).format(n=rng.randint(1, 5000)) for _ in range(limit)]
+    return texts, "corpus synthetique"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Debit d'encodage E5 selon le nombre de processus")
+    parser.add_argument('--workers', default="1,2,4", help="Nombres de processus a comparer (ex. 1,2,4)")
+    parser.add_argument('--backend', choices=SEMANTIC_ENCODER_BACKENDS, default="torch")
+    parser.add_argument('--model', default=SEMANTIC_PYTHON_MODEL_ID, help="Identifiant HuggingFace ou dossier local")
+    parser.add_argument('--limit', type=int, default=2000, help="Nombre de textes encodes par mesure")
+    args = parser.parse_args()
+
+    texts, origin = load_benchmark_texts(args.limit)
+    encoder = load_semantic_encoder(args.model, backend=args.backend)
+    if encoder is None:
+        return
+
+    # Chauffe : premiere passe (allocation, caches) hors mesure.
+    encode_semantic_texts(encoder, texts[:64])
+
+    print(f"\n📊 {len(texts)} textes ({origin}), backend {args.backend}, {os.cpu_count()} CPU")
+    results = []
+    for workers in [int(value) for value in args.workers.split(",") if value.strip()]:
+        started = time.perf_counter()
+        encode_semantic_texts(encoder, texts, workers=workers)
+        elapsed = time.perf_counter() - started
+        results.append((workers, elapsed))
+
+    print("\nprocessus | duree (s) | textes/s")
+    for workers, elapsed in results:
+        print(f"{workers:>9} | {elapsed:>9.2f} | {len(texts) / elapsed:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Compare le debit (titres/s) de classify_vote et get_synonyms avant et apres l'automate.
+
+Usage :
+    python scripts/benchmark_term_matching.py [--limit 20000] [--repeat 3]
+
+Les titres sont ceux de l'index lexical publie ; a defaut, un corpus
+synthetique de titres citant les termes de CATEGORIES et SYNONYMES. Les
+sorties des deux implementations sont comparees titre par titre.
+"""
+
+import argparse
+import os
+import random
+import time
+from typing import List
+
+import json_backend
+from generate_semantic_index import (
+    CATEGORIES,
+    FICHIER_LEXICAL_INDEX,
+    SYNONYMES,
+    classify_vote,
+    extract_keywords_from_title,
+    get_synonyms,
+)
+
+SYNTHETIC_TEMPLATES = [
+    "l'amendement n° {n} de M. X à l'article {a} du projet de loi relatif à {t1} et à {t2} (première lecture)",
+    "l'ensemble de la proposition de loi visant à renforcer {t1} ({t2})",
+    "la motion de censure déposée en application de l'article 49, alinéa 3, de la Constitution",
+    "le sous-amendement n° {n} à l'amendement n° {a} sur {t1}",
+]
+
+
+def classify_vote_legacy(titre: str) -> str:
+    """Implementation historique : une recherche de sous-chaine par terme."""
+    titre_lower = titre.lower()
+    scores = {}
+    for category, terms in CATEGORIES.items():
+        score = sum(1 for term in terms if term.lower() in titre_lower)
+        if score > 0:
+            scores[category] = score
+    if scores:
+        return max(scores, key=scores.get)
+    return "autre"
+
+
+def get_synonyms_legacy(keywords: List[str]) -> List[str]:
+    """Implementation historique : double boucle mots-cles x SYNONYMES."""
+    all_synonyms = {}
+    for kw in keywords:
+        for base_word, syns in SYNONYMES.items():
+            if base_word in kw or kw in base_word:
+                all_synonyms.update(dict.fromkeys(syns))
+    return list(all_synonyms)
+
+
+def build_synthetic_titles(limit: int, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    vocabulary = [term for terms in CATEGORIES.values() for term in terms]
+    vocabulary += [term for base_word, terms in SYNONYMES.items() for term in [base_word] + terms]
+    titles = []
+    for _ in range(limit):
+        terms = [rng.choice(vocabulary) for _ in range(2)]
+        terms = [term.upper() if rng.random() < 0.1 else term for term in terms]
+        titles.append(rng.choice(SYNTHETIC_TEMPLATES).format(
+            n=rng.randint(1, 5000), a=rng.randint(1, 60), t1=terms[0], t2=terms[1]
+        ))
+    return titles
+
+
+def load_benchmark_titles(limit: int):
+    if os.path.exists(FICHIER_LEXICAL_INDEX):
+        votes = json_backend.load_path(FICHIER_LEXICAL_INDEX).get("votes", {})
+        titles = [entry.get("titre") or "" for entry in votes.values()]
+        if titles:
+            return titles[:limit], FICHIER_LEXICAL_INDEX
+    return build_synthetic_titles(limit), "corpus synthetique"
+
+
+def measure(titles: List[str], keywords: List[List[str]], classify, synonyms, repeat: int) -> float:
+    """Meilleur debit (titres/s) sur `repeat` passes."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for titre, title_keywords in zip(titles, keywords):
+            classify(titre)
+            synonyms(title_keywords)
+        best = min(best, time.perf_counter() - started)
+    return len(titles) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Debit de classify_vote + get_synonyms : boucles contre automate")
+    parser.add_argument("--limit", type=int, default=20000, help="Nombre de titres")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes par mesure (meilleure retenue)")
+    args = parser.parse_args()
+
+    titles, origin = load_benchmark_titles(args.limit)
+    keywords = [extract_keywords_from_title(titre) for titre in titles]
+
+    mismatches = sum(
+        1
+        for titre, title_keywords in zip(titles, keywords)
+        if classify_vote(titre) != classify_vote_legacy(titre)
+        or get_synonyms(title_keywords) != get_synonyms_legacy(title_keywords)
+    )
+    legacy_rate = measure(titles, keywords, classify_vote_legacy, get_synonyms_legacy, args.repeat)
+    matcher_rate = measure(titles, keywords, classify_vote, get_synonyms, args.repeat)
+
+    print(f"\n📊 {len(titles)} titres ({origin}), sorties differentes : {mismatches}")
+    print("\nimplementation | titres/s")
+    print(f"boucles        | {legacy_rate:>8.0f}")
+    print(f"automate       | {matcher_rate:>8.0f}  (x{matcher_rate / legacy_rate:.2f})")
+
+
+if __name__ == "__main__":
+    main()
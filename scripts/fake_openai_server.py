@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""Faux serveur OpenAI-compatible, hors ligne, pour les chemins API du pipeline.
+
+Sert POST /embeddings (RemoteEmbeddingEncoder, generate_semantic_index.py) et
+POST /chat/completions (call_llm, generate_dossier_fiches.py), sous n'importe
+quel prefixe (/v1/embeddings...). Permet d'exercer lots, reessais et limites
+de debit, et de mesurer le debit de bout en bout, sans reseau ni quota.
+
+- embeddings deterministes : un texte donne toujours le meme vecteur
+  (graine = sha256(modele + texte)), dimension configurable ;
+- chat : fiche JSON factice valide pour parse_fiche_json, « OK » pour la
+  sonde de configuration (max_tokens <= 16) ;
+- latence configurable (moyenne + gigue) ;
+- injection d'erreurs 429 / 5xx (taux aleatoire, graine fixe) et limite RPM
+  cote serveur, avec en-tete Retry-After ;
+- GET /stats : compteurs de requetes, erreurs et textes embeddes.
+
+Usage :
+    python scripts/fake_openai_server.py --port 8787 --latency-ms 400 --error-rate-429 0.1
+    EMBEDDING_API_KEY=x EMBEDDING_API_BASE_URL=http://127.0.0.1:8787/v1 python scripts/generate_semantic_index.py ...
+    ANALYSIS_API_KEY=x ANALYSIS_API_BASE_URL=http://127.0.0.1:8787/v1 python scripts/generate_dossier_fiches.py ...
+
+En test : start_fake_server(FakeServerConfig(...)) demarre le serveur dans
+un thread et retourne (serveur, url_de_base).
+"""
+
+import argparse
+import hashlib
+import http.server
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+
+# Dimension amont du modele Nemotron (tronquee a 512 par le client).
+DEFAULT_EMBEDDING_DIMENSION = 2048
+
+
+@dataclass
+class FakeServerConfig:
+    port: int = 8787
+    dimension: int = DEFAULT_EMBEDDING_DIMENSION
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate_429: float = 0.0
+    error_rate_5xx: float = 0.0
+    # Limite cote serveur (0 = illimitee) : au-dela, 429 + Retry-After.
+    rpm: int = 0
+    retry_after_s: float = 1.0
+    # Cle attendue (Bearer) ; vide = toute cle acceptee.
+    api_key: str = ""
+    seed: int = 0
+
+
+def embed_text(text: str, model: str, dimension: int) -> list:
+    """Vecteur deterministe (gaussien, non normalise) pour un texte."""
+    seed = int.from_bytes(hashlib.sha256(f"{model}\x1f{text}".encode("utf-8")).digest()[:8], "big")
+    rng = random.Random(seed)
+    return [round(rng.gauss(0.0, 1.0), 6) for _ in range(dimension)]
+
+
+def build_fake_fiche(user_content: str) -> dict:
+    """Fiche factice au format attendu par parse_fiche_json, derivee du prompt."""
+    match = re.search(r"DOSSIER L[ÉE]GISLATIF : (.+)", user_content)
+    titre = match.group(1).strip() if match else "texte de loi"
+    verdicts = ("incitations_alignees", "incitations_mitigees", "incitations_opposees", "indetermine")
+    verdict = verdicts[int(hashlib.sha256(titre.encode("utf-8")).hexdigest(), 16) % len(verdicts)]
+    return {
+        "objectifAffiche": f"Le texte « {titre} » vise l'objectif affiché dans son exposé des motifs.",
+        "mecanismesCles": [
+            {"resume": "Création d'une obligation déclarative.", "articleRef": "art. 1", "citation": None},
+            {"resume": "Ajustement d'un seuil d'application.", "articleRef": "art. 2", "citation": None},
+        ],
+        "verdictIncitations": verdict,
+        "justificationVerdict": "Fiche factice produite par le serveur de test, sans analyse réelle.",
+        "pointsDeVigilance": ["Réponse factice (serveur de test)."],
+        "themes": ["test"],
+    }
+
+
+class FakeOpenAIState:
+    """Compteurs et limite RPM partages entre les threads du serveur."""
+
+    def __init__(self, config: FakeServerConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.lock = threading.Lock()
+        self.recent_requests = deque()
+        self.stats = {
+            "requests": 0,
+            "embeddingsRequests": 0,
+            "chatRequests": 0,
+            "embeddedTexts": 0,
+            "rateLimited": 0,
+            "serverErrors": 0,
+            "maxInFlight": 0,
+        }
+        self.in_flight = 0
+
+    def admit(self) -> int | None:
+        """Code d'erreur a injecter pour cette requete, None si elle passe."""
+        with self.lock:
+            self.stats["requests"] += 1
+            now = time.monotonic()
+            if self.config.rpm > 0:
+                while self.recent_requests and now - self.recent_requests[0] >= 60.0:
+                    self.recent_requests.popleft()
+                if len(self.recent_requests) >= self.config.rpm:
+                    self.stats["rateLimited"] += 1
+                    return 429
+                self.recent_requests.append(now)
+
+            draw = self.rng.random()
+            if draw < self.config.error_rate_429:
+                self.stats["rateLimited"] += 1
+                return 429
+            if draw < self.config.error_rate_429 + self.config.error_rate_5xx:
+                self.stats["serverErrors"] += 1
+                return 503
+            return None
+
+    def latency(self) -> float:
+        with self.lock:
+            jitter = self.rng.uniform(-1.0, 1.0) * self.config.jitter_ms
+        return max(0.0, self.config.latency_ms + jitter) / 1000.0
+
+    def enter(self):
+        with self.lock:
+            self.in_flight += 1
+            self.stats["maxInFlight"] = max(self.stats["maxInFlight"], self.in_flight)
+
+    def leave(self):
+        with self.lock:
+            self.in_flight -= 1
+
+    def count(self, key: str, amount: int = 1):
+        with self.lock:
+            self.stats[key] += amount
+
+
+class FakeOpenAIHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state: FakeOpenAIState = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status: int, payload: dict, headers: dict | None = None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/stats"):
+            with self.state.lock:
+                stats = dict(self.state.stats)
+            self.send_json(200, stats)
+        else:
+            self.send_json(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length)
+        path = self.path.rstrip("/")
+
+        config = self.state.config
+        if config.api_key and self.headers.get("Authorization") != f"Bearer {config.api_key}":
+            self.send_json(401, {"error": {"message": "invalid api key"}})
+            return
+
+        try:
+            payload = json.loads(raw or b"{}")
+        except ValueError:
+            self.send_json(400, {"error": {"message": "invalid JSON body"}})
+            return
+
+        self.state.enter()
+        try:
+            time.sleep(self.state.latency())
+            error_status = self.state.admit()
+            if error_status == 429:
+                self.send_json(
+                    429,
+                    {"error": {"message": "rate limit exceeded"}},
+                    {"Retry-After": f"{config.retry_after_s:g}"}
+                )
+            elif error_status is not None:
+                self.send_json(error_status, {"error": {"message": "injected server error"}})
+            elif path.endswith("/embeddings"):
+                self.handle_embeddings(payload)
+            elif path.endswith("/chat/completions"):
+                self.handle_chat(payload)
+            else:
+                self.send_json(404, {"error": {"message": f"unknown endpoint {self.path}"}})
+        finally:
+            self.state.leave()
+
+    def handle_embeddings(self, payload: dict):
+        texts = payload.get("input")
+        if isinstance(texts, str):
+            texts = [texts]
+        if not isinstance(texts, list) or not texts:
+            self.send_json(400, {"error": {"message": "input must be a non-empty list"}})
+            return
+
+        model = str(payload.get("model") or "fake-embedding")
+        dimension = self.state.config.dimension
+        self.state.count("embeddingsRequests")
+        self.state.count("embeddedTexts", len(texts))
+        self.send_json(200, {
+            "object": "list",
+            "model": model,
+            "data": [
+                {"object": "embedding", "index": position, "embedding": embed_text(str(text), model, dimension)}
+                for position, text in enumerate(texts)
+            ],
+            "usage": {"prompt_tokens": sum(len(str(text).split()) for text in texts)},
+        })
+
+    def handle_chat(self, payload: dict):
+        messages = payload.get("messages")
+        if not isinstance(messages, list) or not messages:
+            self.send_json(400, {"error": {"message": "messages must be a non-empty list"}})
+            return
+
+        self.state.count("chatRequests")
+        user_content = "\n".join(
+            str(message.get("content") or "") for message in messages if message.get("role") == "user"
+        )
+        if int(payload.get("max_tokens") or 0) <= 16:
+            content = "OK"
+        else:
+            content = json.dumps(build_fake_fiche(user_content), ensure_ascii=False, indent=2)
+        self.send_json(200, {
+            "object": "chat.completion",
+            "model": payload.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        })
+
+
+def build_fake_server(config: FakeServerConfig) -> http.server.ThreadingHTTPServer:
+    handler = type("BoundFakeOpenAIHandler", (FakeOpenAIHandler,), {"state": FakeOpenAIState(config)})
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", config.port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_fake_server(config: FakeServerConfig):
+    """Demarre le serveur dans un thread (port 0 = port libre). Retourne (serveur, url_de_base)."""
+    server = build_fake_server(config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/v1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Faux serveur OpenAI-compatible (embeddings + chat) hors ligne")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--dimension", type=int, default=DEFAULT_EMBEDDING_DIMENSION, help="Dimension des embeddings renvoyes")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Latence moyenne par requete")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Gigue uniforme +/- autour de la latence")
+    parser.add_argument("--error-rate-429", type=float, default=0.0, help="Part des requetes rejetees en 429")
+    parser.add_argument("--error-rate-5xx", type=float, default=0.0, help="Part des requetes rejetees en 503")
+    parser.add_argument("--rpm", type=int, default=0, help="Limite de requetes par minute (0 = aucune)")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Valeur de l'en-tete Retry-After (s)")
+    parser.add_argument("--api-key", default="", help="Cle Bearer exigee (vide = toute cle)")
+    parser.add_argument("--seed", type=int, default=0, help="Graine de l'injection d'erreurs et de la gigue")
+    args = parser.parse_args()
+
+    server = build_fake_server(FakeServerConfig(
+        port=args.port,
+        dimension=args.dimension,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate_429=args.error_rate_429,
+        error_rate_5xx=args.error_rate_5xx,
+        rpm=args.rpm,
+        retry_after_s=args.retry_after,
+        api_key=args.api_key,
+        seed=args.seed,
+    ))
+    print(f"Faux serveur OpenAI-compatible : http://127.0.0.1:{server.server_port}/v1")
+    print("Appuyez sur Ctrl+C pour arreter.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nServeur arrete.")
+
+
+if __name__ == "__main__":
+    main()
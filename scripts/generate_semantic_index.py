@@ -8,19 +8,33 @@ Le fichier public/data/search_index.json reste un miroir legacy optionnel
 pour compatibilite temporaire avec les anciens chemins.
 """
 
-import json
 import os
-import glob
 import random
 import re
 import hashlib
+import threading
 import time
 from collections import defaultdict
-from typing import Dict, List, Sequence, Tuple
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
 import numpy as np
 import sys
 from datetime import datetime, timezone
 
+import json_backend
+from lexical_bm25 import (
+    LEXICAL_STOPWORDS,
+    build_incremental_bm25_index,
+    build_lexical_delta,
+    describe_bm25_artifact,
+    next_generation,
+    write_bm25_index,
+)
+from lexical_shards import describe_lexical_shards, write_lexical_shards
+from semantic_ann import describe_ivf_artifact, write_ivf_index
+from semantic_binary import describe_binary_artifact, write_binary_index
+from term_matcher import build_term_matcher, find_terms
+from scrutins_corpus import ARCHIVE_SCRUTINS, DOSSIER_SCRUTINS, Scrutin, load_scrutins_corpus, scrutins_available
+
 # Force UTF-8 encoding for stdout/stderr to handle emojis on Windows
 if hasattr(sys.stdout, 'reconfigure'):
     sys.stdout.reconfigure(encoding='utf-8')
@@ -28,17 +42,34 @@ if hasattr(sys.stderr, 'reconfigure'):
     sys.stderr.reconfigure(encoding='utf-8')
 
 # --- CONFIGURATION ---
-DOSSIER_SCRUTINS = "./Scrutins/json"
 FICHIER_LEXICAL_INDEX = "./public/data/rag/lexical_index.json"
 FICHIER_SEMANTIC_INDEX = "./public/data/rag/semantic_index.json"
 FICHIER_SEMANTIC_MULTIVECTOR_INDEX = "./public/data/rag/semantic_multivector_index.json"
 FICHIER_LEGACY_SEARCH_INDEX = "./public/data/search_index.json"
+# Statistiques BM25 precalculees (scripts/lexical_bm25.py) : entete JSON + postings .pst.
+FICHIER_LEXICAL_BM25 = "./public/data/rag/lexical_bm25.json"
+# Fragments a chargement paresseux (scripts/lexical_shards.py) : repertoire,
+# postings par tranche de vocabulaire, metadonnees par tranche de numeros.
+DOSSIER_LEXICAL_SHARDS = "./public/data/rag/lexical_shards"
 FICHIER_RAG_MANIFEST = "./public/data/rag/manifest.json"
 FICHIER_DOSSIERS_INDEX = "./public/data/dossiers/index.json"
 INDEX_SCHEMA_VERSION = 3
 RAG_MANIFEST_SCHEMA_VERSION = 3
 SEMANTIC_INDEX_SCHEMA_VERSION = 2
 SEMANTIC_MULTIVECTOR_INDEX_SCHEMA_VERSION = 2
+# Variante binaire des index E5 : matrice int8 contigue (une ligne par vecteur,
+# ordre ligne) + entete JSON (ordre des scrutins, descripteur de modele).
+FICHIER_SEMANTIC_INDEX_PACKED = "./public/data/rag/semantic_index_packed.json"
+FICHIER_SEMANTIC_MULTIVECTOR_INDEX_PACKED = "./public/data/rag/semantic_multivector_index_packed.json"
+PACKED_SEMANTIC_INDEX_SCHEMA_VERSION = 1
+# Index ANN (IVF, scripts/semantic_ann.py) sur les lignes des index packes.
+FICHIER_SEMANTIC_INDEX_IVF = "./public/data/rag/semantic_index_ivf.json"
+FICHIER_SEMANTIC_MULTIVECTOR_INDEX_IVF = "./public/data/rag/semantic_multivector_index_ivf.json"
+# Codes binaires centres (scripts/semantic_binary.py) : premier etage a 1/8 des octets.
+FICHIER_SEMANTIC_INDEX_BINARY = "./public/data/rag/semantic_index_binary.json"
+FICHIER_SEMANTIC_MULTIVECTOR_INDEX_BINARY = "./public/data/rag/semantic_multivector_index_binary.json"
+PACKED_SEMANTIC_INDEX_FORMAT = "int8-row-major"
+PACKED_SEMANTIC_DATA_EXTENSION = ".i8"
 SEMANTIC_BROWSER_MODEL_ID = "Xenova/multilingual-e5-small"
 SEMANTIC_PYTHON_MODEL_ID = "intfloat/multilingual-e5-small"
 SEMANTIC_MODEL_ID = "multilingual-e5-small"
@@ -51,6 +82,20 @@ SEMANTIC_MODEL_POOLING = "mean"
 SEMANTIC_MODEL_NORMALIZE = True
 SEMANTIC_MODEL_EXPECTED_DIMENSION = 384
 SEMANTIC_MODEL_MAX_LENGTH = 512
+# Budget de tokens par lot d'encodage (lignes x longueur paddee) : les textes
+# tries par longueur forment des lots homogenes, sans padding inutile.
+SEMANTIC_ENCODE_TOKEN_BUDGET = 16384
+# Backends d'inference de l'encodeur E5 local (--semantic-backend). Les
+# exports ONNX sont caches a cote des modeles HuggingFace (cache du workflow).
+SEMANTIC_ENCODER_BACKENDS = ("torch", "onnx", "onnx-int8")
+SEMANTIC_ONNX_CACHE_DIR = os.environ.get("SEMANTIC_ONNX_CACHE_DIR") or os.path.join(
+    os.path.expanduser("~"), ".cache", "huggingface", "onnx"
+)
+SEMANTIC_ONNX_OPSET = 17
+# Encodage multi-processus (--semantic-workers) : tranches contigues par worker,
+# et pas de pool en dessous de quelques lots de textes par worker.
+SEMANTIC_SHARDS_PER_WORKER = 4
+SEMANTIC_MIN_TEXTS_PER_WORKER = 128
 SEMANTIC_MODEL_ESTIMATED_DOWNLOAD_MB = 120
 SEMANTIC_VECTOR_SCALE = 127
 SEMANTIC_MULTI_VECTOR_MODEL_ID = "multilingual-e5-small-multi-vector"
@@ -77,12 +122,27 @@ REMOTE_EMBEDDING_BATCH_SIZE = 96
 REMOTE_EMBEDDING_QUERY_PREFIX = os.environ.get("EMBEDDING_QUERY_PREFIX", "")
 REMOTE_EMBEDDING_DOCUMENT_PREFIX = os.environ.get("EMBEDDING_DOCUMENT_PREFIX", "")
 REMOTE_EMBEDDING_RPM = 15
+# Lots en vol simultanement : la latence d'un appel (plusieurs secondes pour
+# 96 textes) depasse l'intervalle RPM, le debit reste borne par le seau a jetons.
+REMOTE_EMBEDDING_CONCURRENCY = 4
+# Au-dela, un Retry-After signale un quota epuise (journalier) : inutile d'attendre.
+REMOTE_EMBEDDING_MAX_RETRY_AFTER_S = 120
 FICHIER_SEMANTIC_REMOTE_INDEX = "./public/data/rag/semantic_index_remote.json"
+# Point de reprise des embeddings distants (JSONL append-only, hors publication,
+# conserve entre executions CI par actions/cache).
+FICHIER_SEMANTIC_REMOTE_CHECKPOINT = "./.cache/semantic_index_remote_checkpoint.jsonl"
 SEMANTIC_REMOTE_INDEX_SCHEMA_VERSION = 1
 # Le mode n'est expose dans le manifest qu'a partir de cette couverture,
 # pour masquer un remplissage initial etale sur plusieurs nuits.
 REMOTE_COVERAGE_THRESHOLD = 0.98
 
+# Enrichissement BGE-M3 des mots-cles : 3 termes candidats au plus par titre,
+# au-dessus d'un seuil de pertinence arbitraire (à ajuster).
+BGE_ENRICHMENT_TOP_K = 3
+BGE_ENRICHMENT_MIN_SCORE = 0.4
+BGE_ENCODE_BATCH_SIZE = 64
+BGE_ENCODE_MAX_LENGTH = 512
+
 # Catégories thématiques pour classification
 CATEGORIES = {
     "fiscal": ["impôt", "taxe", "budget", "finance", "fiscal", "cotisation", "prélèvement", "TVA", "ISF"],
@@ -114,6 +174,34 @@ SYNONYMES = {
 }
 
 
+def index_category_terms(categories: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """Terme (minuscules) -> categories qui le listent."""
+    index = {}
+    for category, terms in categories.items():
+        for term in terms:
+            index.setdefault(term.lower(), []).append(category)
+    return index
+
+
+def index_base_word_substrings(base_words: Iterable[str]) -> Dict[str, Set[str]]:
+    """Sous-chaine -> mots de base qui la contiennent (test `mot-cle in mot_de_base`)."""
+    index = {}
+    for base_word in base_words:
+        for start in range(len(base_word) + 1):
+            for end in range(start, len(base_word) + 1):
+                index.setdefault(base_word[start:end], set()).add(base_word)
+    return index
+
+
+# Automates construits une fois (scripts/term_matcher.py) : un seul parcours
+# du titre ou du mot-cle, quel que soit le nombre de termes.
+CATEGORY_MATCHER = build_term_matcher(term.lower() for terms in CATEGORIES.values() for term in terms)
+CATEGORY_TERM_INDEX = index_category_terms(CATEGORIES)
+SYNONYM_BASE_MATCHER = build_term_matcher(SYNONYMES)
+SYNONYM_BASE_ORDER = {base_word: rank for rank, base_word in enumerate(SYNONYMES)}
+SYNONYM_BASE_SUBSTRINGS = index_base_word_substrings(SYNONYMES)
+
+
 def normalize_text(text: str) -> str:
     """Normalise le texte pour la recherche."""
     text = text.lower()
@@ -137,42 +225,30 @@ def strip_stage_suffix(text: str) -> str:
 
 def extract_keywords_from_title(titre: str) -> List[str]:
     """Extrait les mots-clés significatifs d'un titre de scrutin."""
-    # Mots à ignorer (stopwords français)
-    stopwords = {
-        "le", "la", "les", "de", "du", "des", "un", "une", "et", "ou", "à", "au", "aux",
-        "en", "pour", "par", "sur", "dans", "ce", "cette", "ces", "son", "sa", "ses",
-        "qui", "que", "quoi", "dont", "où", "avec", "sans", "sous", "entre", "vers",
-        "chez", "est", "sont", "être", "avoir", "fait", "faire", "après", "avant",
-        "article", "premier", "deuxième", "première", "seconde", "lecture", "projet",
-        "proposition", "loi", "amendement", "texte", "commission", "mixte", "paritaire",
-        "relatif", "relative", "visant", "portant", "modifiant", "application", "alinéa"
-    }
-    
     normalized = normalize_text(titre)
     words = normalized.split()
     
     # Garder les mots significatifs (> 3 caractères, pas dans stopwords)
     keywords = []
     for word in words:
-        if len(word) > 3 and word not in stopwords:
+        if len(word) > 3 and word not in LEXICAL_STOPWORDS:
             keywords.append(word)
     
-    # Limiter à 10 mots-clés max
-    return list(set(keywords))[:10]
+    # Limiter à 10 mots-clés max (premiers distincts dans l'ordre du titre : sortie stable)
+    return list(dict.fromkeys(keywords))[:10]
 
 
 def classify_vote(titre: str) -> str:
     """Classifie un vote dans une catégorie thématique."""
-    titre_lower = titre.lower()
-    
+    # Score d'une categorie : nombre de ses termes presents dans le titre.
     scores = {}
-    for category, terms in CATEGORIES.items():
-        score = sum(1 for term in terms if term.lower() in titre_lower)
-        if score > 0:
-            scores[category] = score
+    for term in find_terms(CATEGORY_MATCHER, titre.lower()):
+        for category in CATEGORY_TERM_INDEX[term]:
+            scores[category] = scores.get(category, 0) + 1
     
     if scores:
-        return max(scores, key=scores.get)
+        # A egalite, la premiere categorie dans l'ordre de CATEGORIES.
+        return max((category for category in CATEGORIES if category in scores), key=scores.get)
     return "autre"
 
 
@@ -203,22 +279,21 @@ def generate_summary(titre: str, category: str) -> str:
     return summary
 
 
-def extract_subject(scrutin: Dict) -> str:
+def extract_subject(scrutin: Scrutin) -> str:
     """Extrait un sujet lisible et plus stable que le titre brut."""
-    objet = scrutin.get('objet') or {}
     candidate = (
-        objet.get('libelle')
-        or scrutin.get('titre')
+        scrutin.objet_libelle
+        or scrutin.titre
         or ''
     )
     subject = strip_stage_suffix(candidate)
-    return subject or clean_label(scrutin.get('titre', ''))
+    return subject or clean_label(scrutin.titre)
 
 
-def build_scrutin_source_url(scrutin: Dict) -> str:
+def build_scrutin_source_url(scrutin: Scrutin) -> str:
     """Construit l'URL officielle d'un scrutin sur le site de l'Assemblee nationale."""
-    legislature = clean_label(scrutin.get('legislature'))
-    numero = clean_label(scrutin.get('numero'))
+    legislature = clean_label(scrutin.legislature)
+    numero = clean_label(scrutin.numero)
 
     if not legislature or not numero:
         return ''
@@ -243,37 +318,69 @@ def is_vote_entry_complete(entry: Dict) -> bool:
 
 def get_synonyms(keywords: List[str]) -> List[str]:
     """Récupère les synonymes pour les mots-clés."""
-    all_synonyms = set()
+    all_synonyms = {}
     for kw in keywords:
-        for base_word, syns in SYNONYMES.items():
-            if base_word in kw or kw in base_word:
-                all_synonyms.update(syns)
+        # Mots de base contenus dans le mot-cle, ou le contenant.
+        base_words = find_terms(SYNONYM_BASE_MATCHER, kw) | SYNONYM_BASE_SUBSTRINGS.get(kw, set())
+        for base_word in sorted(base_words, key=SYNONYM_BASE_ORDER.get):
+            all_synonyms.update(dict.fromkeys(SYNONYMES[base_word]))
     return list(all_synonyms)
 
 
-def load_existing_index() -> Dict:
-    """Charge l'index existant en priorisant l'artefact RAG primaire."""
+def load_existing_index() -> Tuple[Dict, str | None]:
+    """Charge l'index existant en priorisant l'artefact RAG primaire.
+
+    Retourne (index, empreinte de l'index lexical RAG) ; l'empreinte est
+    calculee sur les octets deja lus, None si l'index vient du miroir legacy.
+    """
     for path in (FICHIER_LEXICAL_INDEX, FICHIER_LEGACY_SEARCH_INDEX):
         if not os.path.exists(path):
             continue
 
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(path, 'rb') as f:
+                data = f.read()
+            index = json_backend.loads(data)
         except Exception:
             continue
+        return index, hashlib.sha256(data).hexdigest() if path == FICHIER_LEXICAL_INDEX else None
+
+    return {"votes": {}, "inverted_index": {}, "lastUpdate": ""}, None
 
-    return {"votes": {}, "inverted_index": {}, "lastUpdate": ""}
+
+# Empreintes des JSON ecrits (ou laisses identiques) par cette execution,
+# calculees sur les octets en memoire.
+WRITTEN_SHA256: Dict[str, str] = {}
 
 
 def write_json(path: str, payload: Dict, compact: bool = False) -> None:
     """Ecrit un JSON UTF-8 (indente par defaut, compact pour les gros artefacts)."""
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, 'w', encoding='utf-8') as f:
-        if compact:
-            json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
-        else:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
+    data = json_backend.dumps(payload, compact=compact)
+    with open(path, 'wb') as f:
+        f.write(data)
+    WRITTEN_SHA256[os.path.normpath(path)] = hashlib.sha256(data).hexdigest()
+
+
+def write_bytes_if_changed(path: str, data: bytes, current_sha256: str | None = None) -> bool:
+    """Ecrit `data` sauf si le fichier en place a deja ce contenu ; True si (re)ecrit.
+
+    `current_sha256` : empreinte deja connue du fichier en place, qui n'est
+    alors pas relu. Dans les deux cas l'empreinte est enregistree dans
+    WRITTEN_SHA256, que describe_artifact_file reprend sans relire le fichier.
+    """
+    sha256 = hashlib.sha256(data).hexdigest()
+    WRITTEN_SHA256[os.path.normpath(path)] = sha256
+    if os.path.exists(path) and os.path.getsize(path) == len(data):
+        if (current_sha256 or compute_sha256(path)) == sha256:
+            return False
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return True
 
 
 def compute_sha256(path: str) -> str:
@@ -285,6 +392,24 @@ def compute_sha256(path: str) -> str:
     return digest.hexdigest()
 
 
+def describe_artifact_file(path: str, previous: Dict | None) -> Dict:
+    """{path, bytes, sha256, generation} d'un artefact du manifest.
+
+    Empreinte : celle des octets ecrits (ou laisses identiques) par cette
+    execution (WRITTEN_SHA256) ; sinon, fichier relu. Le client s'en sert de
+    jeton de version, l'empreinte du manifest precedent n'est donc jamais
+    reprise telle quelle. La generation n'augmente que si l'empreinte change.
+    """
+    previous = previous or {}
+    sha256 = WRITTEN_SHA256.get(os.path.normpath(path)) or compute_sha256(path)
+    return {
+        "path": os.path.basename(path),
+        "bytes": os.path.getsize(path),
+        "sha256": sha256,
+        "generation": next_generation(previous, previous.get("sha256") != sha256)
+    }
+
+
 def build_semantic_document_text(vote_id: str, entry: Dict) -> str:
     """Assemble un texte de reference pour un encodage semantique par scrutin."""
     parts = [
@@ -305,8 +430,7 @@ def load_dossier_links() -> Dict:
         return {}
 
     try:
-        with open(FICHIER_DOSSIERS_INDEX, 'r', encoding='utf-8') as f:
-            payload = json.load(f)
+        payload = json_backend.load_path(FICHIER_DOSSIERS_INDEX)
     except Exception:
         print(f"⚠️ Index dossiers illisible ({FICHIER_DOSSIERS_INDEX}), enrichissement saute")
         return {}
@@ -372,10 +496,31 @@ def apply_semantic_prefix(text: str, prefix: str) -> str:
     return f"{canonical_prefix}{cleaned}"
 
 
+def plan_length_buckets(lengths: Sequence[int], max_batch_size: int, token_budget: int) -> List[List[int]]:
+    """Regroupe des positions de textes en lots de longueurs voisines.
+
+    Les textes sont pris par longueur croissante ; un lot se ferme des que
+    (lignes + 1) x longueur la plus longue depasserait token_budget, ou a
+    max_batch_size lignes. Un texte seul plus long que le budget forme son
+    propre lot.
+    """
+    batches = []
+    current = []
+    for position in sorted(range(len(lengths)), key=lambda index: lengths[index]):
+        padded_length = max(int(lengths[position]), 1)
+        if current and (len(current) >= max_batch_size or (len(current) + 1) * padded_length > token_budget):
+            batches.append(current)
+            current = []
+        current.append(position)
+    if current:
+        batches.append(current)
+    return batches
+
+
 class E5MeanPoolingEncoder:
     """Encodeur E5 explicite via AutoTokenizer + AutoModel + mean pooling + L2."""
 
-    def __init__(self, model_name: str = SEMANTIC_PYTHON_MODEL_ID):
+    def __init__(self, model_name: str = SEMANTIC_PYTHON_MODEL_ID, num_threads: int | None = None):
         try:
             import torch
             from transformers import AutoModel, AutoTokenizer
@@ -385,6 +530,9 @@ class E5MeanPoolingEncoder:
         self.torch = torch
         self.model_name = model_name
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.backend = "torch"
+        if num_threads:
+            torch.set_num_threads(num_threads)
 
         print(f"🧭 Chargement du modele semantique {model_name} ({self.device})...")
         self.tokenizer = AutoTokenizer.from_pretrained(model_name)
@@ -404,55 +552,274 @@ class E5MeanPoolingEncoder:
         batch_size: int = 64,
         show_progress_bar: bool = True,
         normalize_embeddings: bool = True,
-        convert_to_numpy: bool = True
+        convert_to_numpy: bool = True,
+        token_budget: int = SEMANTIC_ENCODE_TOKEN_BUDGET
     ):
+        """Encode par lots de longueurs voisines ; la sortie suit l'ordre de texts.
+
+        batch_size borne le nombre de lignes par lot, token_budget le volume
+        paddé (lignes x longueur) d'un lot.
+        """
         if not texts:
             if convert_to_numpy:
                 return np.zeros((0, SEMANTIC_MODEL_EXPECTED_DIMENSION), dtype=np.float32)
             return self.torch.empty((0, SEMANTIC_MODEL_EXPECTED_DIMENSION))
 
+        # Tokenisation unique sans padding : les longueurs servent au tri,
+        # les tokens sont ensuite paddes lot par lot.
+        tokenized = self.tokenizer(
+            list(texts),
+            max_length=SEMANTIC_MODEL_MAX_LENGTH,
+            truncation=True
+        )
+        features = [
+            {key: values[position] for key, values in tokenized.items()}
+            for position in range(len(texts))
+        ]
+        batches = plan_length_buckets(
+            [len(feature["input_ids"]) for feature in features],
+            batch_size,
+            token_budget
+        )
+
         outputs = []
-        total_batches = (len(texts) + batch_size - 1) // batch_size
+        order = []
+        total_batches = len(batches)
+
+        for batch_index, positions in enumerate(batches, start=1):
+            outputs.append(self._embed_batch(
+                [features[position] for position in positions],
+                normalize_embeddings
+            ))
+            order.extend(positions)
+
+            if show_progress_bar:
+                print(f"  Encodage semantique {batch_index}/{total_batches}")
+
+        # Retour a l'ordre d'entree.
+        inverse = np.empty(len(order), dtype=np.int64)
+        inverse[np.asarray(order, dtype=np.int64)] = np.arange(len(order))
+        embeddings = np.concatenate(outputs, axis=0)[inverse]
+
+        if convert_to_numpy:
+            return embeddings
+
+        return self.torch.from_numpy(embeddings)
+
+    def _embed_batch(self, batch_features: List[Dict], normalize_embeddings: bool) -> np.ndarray:
+        """Passe avant PyTorch d'un lot tokenise : mean pooling (+ L2), float32."""
+        encoded_inputs = self.tokenizer.pad(batch_features, padding=True, return_tensors="pt")
+        encoded_inputs = {
+            key: value.to(self.device)
+            for key, value in encoded_inputs.items()
+        }
 
         with self.torch.no_grad():
-            for batch_index, start in enumerate(range(0, len(texts), batch_size), start=1):
-                batch_texts = list(texts[start:start + batch_size])
-                encoded_inputs = self.tokenizer(
-                    batch_texts,
-                    max_length=SEMANTIC_MODEL_MAX_LENGTH,
-                    padding=True,
-                    truncation=True,
-                    return_tensors="pt"
-                )
-                encoded_inputs = {
-                    key: value.to(self.device)
-                    for key, value in encoded_inputs.items()
-                }
+            model_output = self.model(**encoded_inputs)
+            embeddings = self._average_pool(model_output.last_hidden_state, encoded_inputs["attention_mask"])
+
+            if normalize_embeddings:
+                embeddings = self.torch.nn.functional.normalize(embeddings, p=2, dim=1)
+
+        return embeddings.cpu().numpy()
+
+
+def export_e5_onnx(model_name: str, output_path: str) -> None:
+    """Exporte l'encodeur E5 en ONNX (sortie last_hidden_state, axes dynamiques)."""
+    import inspect
+
+    import torch
+    from transformers import AutoModel
+
+    class LastHiddenState(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, input_ids, attention_mask):
+            return self.model(input_ids=input_ids, attention_mask=attention_mask).last_hidden_state
+
+    model = AutoModel.from_pretrained(model_name)
+    model.eval()
+    sample = torch.ones((1, 8), dtype=torch.long)
+    # Exporteur TorchScript : les versions recentes de torch basculent sinon sur dynamo.
+    extra_options = {"dynamo": False} if "dynamo" in inspect.signature(torch.onnx.export).parameters else {}
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    torch.onnx.export(
+        LastHiddenState(model),
+        (sample, sample),
+        output_path,
+        input_names=["input_ids", "attention_mask"],
+        output_names=["last_hidden_state"],
+        dynamic_axes={
+            name: {0: "batch", 1: "sequence"}
+            for name in ("input_ids", "attention_mask", "last_hidden_state")
+        },
+        opset_version=SEMANTIC_ONNX_OPSET,
+        **extra_options
+    )
 
-                model_output = self.model(**encoded_inputs)
-                embeddings = self._average_pool(model_output.last_hidden_state, encoded_inputs["attention_mask"])
 
-                if normalize_embeddings:
-                    embeddings = self.torch.nn.functional.normalize(embeddings, p=2, dim=1)
+def save_e5_onnx_tokenizer(model_name: str, model_dir: str) -> None:
+    """Copie le tokenizer rapide (tokenizer.json) a cote de l'export ONNX."""
+    from transformers import AutoTokenizer
 
-                if convert_to_numpy:
-                    outputs.append(embeddings.cpu().numpy())
-                else:
-                    outputs.append(embeddings.cpu())
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(model_dir)
 
-                if show_progress_bar:
-                    print(f"  Encodage semantique {batch_index}/{total_batches}")
 
-        if convert_to_numpy:
-            return np.concatenate(outputs, axis=0)
+def ensure_e5_onnx_model(model_name: str, quantize: bool = False, cache_dir: str = SEMANTIC_ONNX_CACHE_DIR) -> str:
+    """Chemin du modele ONNX (fp32 ou int8 dynamique), exporte au premier appel.
+
+    Le tokenizer est copie dans le meme dossier : une fois l'export en cache,
+    l'inference ONNX n'a plus besoin ni de torch ni de transformers.
+    """
+    model_dir = os.path.join(cache_dir, model_name.replace("/", "__"))
+    fp32_path = os.path.join(model_dir, "model.onnx")
+    if not os.path.exists(fp32_path):
+        print(f"📦 Export ONNX de {model_name}...")
+        try:
+            export_e5_onnx(model_name, fp32_path + ".tmp")
+        except ImportError as error:
+            raise RuntimeError(f"export ONNX impossible sans torch et transformers ({error}) : model.onnx absent de {model_dir}")
+        os.replace(fp32_path + ".tmp", fp32_path)
+
+    if not os.path.exists(os.path.join(model_dir, "tokenizer.json")):
+        try:
+            save_e5_onnx_tokenizer(model_name, model_dir)
+        except ImportError as error:
+            raise RuntimeError(f"tokenizer.json absent de {model_dir} et transformers indisponible ({error})")
+
+    if not quantize:
+        return fp32_path
 
-        return self.torch.cat(outputs, dim=0)
+    int8_path = os.path.join(model_dir, "model.int8.onnx")
+    if not os.path.exists(int8_path):
+        from onnxruntime.quantization import QuantType, quantize_dynamic
 
+        print(f"📦 Quantification int8 dynamique de {model_name}...")
+        quantize_dynamic(fp32_path, int8_path + ".tmp", weight_type=QuantType.QInt8)
+        os.replace(int8_path + ".tmp", int8_path)
+    return int8_path
+
+
+class OnnxE5Tokenizer:
+    """Tokenizer rapide (bibliotheque tokenizers) relu depuis tokenizer.json, sans transformers.
+
+    Expose le sous-ensemble d'AutoTokenizer utilise par E5MeanPoolingEncoder :
+    appel avec troncature, puis pad() a droite d'un lot de features.
+    """
+
+    def __init__(self, model_dir: str):
+        from tokenizers import Tokenizer
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.no_padding()
+        pad_token = "<pad>"
+        config_path = os.path.join(model_dir, "tokenizer_config.json")
+        if os.path.exists(config_path):
+            pad_token = json_backend.load_path(config_path).get("pad_token") or pad_token
+            if isinstance(pad_token, dict):
+                pad_token = pad_token.get("content", "<pad>")
+        self.pad_token_id = self.tokenizer.token_to_id(pad_token)
+        if self.pad_token_id is None:
+            raise RuntimeError(f"jeton de padding {pad_token!r} absent de {model_dir}/tokenizer.json")
+
+    def __call__(self, texts: Sequence[str], max_length: int, truncation: bool = True) -> Dict[str, List[List[int]]]:
+        if truncation:
+            self.tokenizer.enable_truncation(max_length)
+        else:
+            self.tokenizer.no_truncation()
+        encodings = self.tokenizer.encode_batch(list(texts))
+        return {
+            "input_ids": [encoding.ids for encoding in encodings],
+            "attention_mask": [encoding.attention_mask for encoding in encodings],
+        }
+
+    def pad(self, features: List[Dict], padding: bool = True, return_tensors: str = "np") -> Dict[str, np.ndarray]:
+        width = max(len(feature["input_ids"]) for feature in features)
+        input_ids = np.full((len(features), width), self.pad_token_id, dtype=np.int64)
+        attention_mask = np.zeros((len(features), width), dtype=np.int64)
+        for row, feature in enumerate(features):
+            input_ids[row, :len(feature["input_ids"])] = feature["input_ids"]
+            attention_mask[row, :len(feature["attention_mask"])] = feature["attention_mask"]
+        return {"input_ids": input_ids, "attention_mask": attention_mask}
+
+
+class OnnxE5MeanPoolingEncoder(E5MeanPoolingEncoder):
+    """Meme encodeur E5 (tokenisation, lots, mean pooling, L2) execute par ONNX Runtime sur CPU.
+
+    quantize=True charge la variante a poids int8 dynamiques : plus rapide,
+    au prix d'une legere derive (bornee par scripts/test_e5_onnx_parity.py).
+    Seuls onnxruntime et tokenizers sont requis une fois l'export en cache ;
+    torch et transformers ne servent qu'a l'export initial.
+    """
+
+    def __init__(
+        self,
+        model_name: str = SEMANTIC_PYTHON_MODEL_ID,
+        quantize: bool = False,
+        num_threads: int | None = None,
+        cache_dir: str = SEMANTIC_ONNX_CACHE_DIR
+    ):
+        try:
+            import onnxruntime
+            import tokenizers  # noqa: F401
+        except ImportError:
+            raise RuntimeError("onnxruntime et tokenizers sont requis pour le backend ONNX")
+
+        try:
+            import torch
+        except ImportError:
+            torch = None
+
+        self.torch = torch
+        self.model_name = model_name
+        self.device = "cpu"
+        self.backend = "onnx-int8" if quantize else "onnx"
+
+        print(f"🧭 Chargement du modele semantique {model_name} (ONNX Runtime{', int8' if quantize else ''})...")
+        model_path = ensure_e5_onnx_model(model_name, quantize=quantize, cache_dir=cache_dir)
+        self.tokenizer = OnnxE5Tokenizer(os.path.dirname(model_path))
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = onnxruntime.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+    def _embed_batch(self, batch_features: List[Dict], normalize_embeddings: bool) -> np.ndarray:
+        encoded_inputs = self.tokenizer.pad(batch_features, padding=True, return_tensors="np")
+        last_hidden_state = self.session.run(None, {
+            key: np.asarray(value, dtype=np.int64)
+            for key, value in encoded_inputs.items()
+            if key in self.input_names
+        })[0]
+
+        mask = np.asarray(encoded_inputs["attention_mask"], dtype=np.float32)[..., None]
+        embeddings = (last_hidden_state * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1, None)
+
+        if normalize_embeddings:
+            # Meme epsilon que torch.nn.functional.normalize.
+            embeddings = embeddings / np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+
+        return embeddings.astype(np.float32)
+
+
+def load_semantic_encoder(model_name: str = SEMANTIC_PYTHON_MODEL_ID, backend: str = "torch", num_threads: int | None = None):
+    """Charge le modele d'encodage semantique dedie.
+
+    backend : "torch" (defaut), "onnx" ou "onnx-int8" ; un backend ONNX
+    indisponible retombe sur PyTorch. num_threads borne les threads intra-op.
+    """
+    if backend in ("onnx", "onnx-int8"):
+        try:
+            return OnnxE5MeanPoolingEncoder(model_name, quantize=backend == "onnx-int8", num_threads=num_threads)
+        except Exception as error:
+            print(f"⚠️ Backend {backend} indisponible ({error}), repli sur PyTorch (backend torch)")
 
-def load_semantic_encoder(model_name: str = SEMANTIC_PYTHON_MODEL_ID):
-    """Charge le modele d'encodage semantique dedie."""
     try:
-        return E5MeanPoolingEncoder(model_name)
+        return E5MeanPoolingEncoder(model_name, num_threads=num_threads)
     except Exception as error:
         print(f"⚠️ Modele semantique indisponible ({error}), artefacts semantiques ignores")
         return None
@@ -466,11 +833,73 @@ class RemoteEmbeddingAuthError(RemoteEmbeddingError):
     """Cle refusee (401/403) : inutile de reessayer."""
 
 
+class TokenBucketRateLimiter:
+    """Seau a jetons partage entre threads : `rpm` requetes par minute, rafale `burst`.
+
+    defer(secondes) suspend toutes les acquisitions, quel que soit le thread
+    (Retry-After d'un 429 : le quota est commun a tous les lots en vol).
+    """
+
+    def __init__(self, rpm: int, burst: int = 1, clock=time.monotonic, sleep=time.sleep):
+        self.rate = max(1, rpm) / 60.0
+        self.capacity = float(max(1, burst))
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated_at = clock()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._refill(now)
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self.paused_until - now, (1 - self.tokens) / self.rate)
+            self.sleep(wait)
+
+    def defer(self, seconds: float) -> None:
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            self.paused_until = max(self.paused_until, now + seconds)
+            self.tokens = 0.0
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Delai Retry-After en secondes (entier, decimal ou date HTTP), None si absent."""
+    value = (value or "").strip()
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    from email.utils import parsedate_to_datetime
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
 class RemoteEmbeddingEncoder:
     """Encodeur distant via une API OpenAI-compatible POST /embeddings.
 
     Meme contrat de sortie que l'encodeur E5 local : matrice float32 de
     vecteurs L2-normalises, apres troncature Matryoshka a la dimension cible.
+    embed_batch peut etre appele depuis plusieurs threads (une session HTTP
+    par thread, seau a jetons commun).
     """
 
     MAX_RETRIES = 5
@@ -483,31 +912,40 @@ class RemoteEmbeddingEncoder:
         dimension: int = REMOTE_EMBEDDING_DIMENSION,
         rpm: int = REMOTE_EMBEDDING_RPM,
         timeout: int = 120,
+        max_retry_after: float = REMOTE_EMBEDDING_MAX_RETRY_AFTER_S,
     ):
         import requests
 
-        self.session = requests.Session()
+        self._requests = requests
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
         self.model = model
         self.dimension = dimension
-        self.min_interval = 60.0 / max(1, rpm)
+        self.rate_limiter = TokenBucketRateLimiter(rpm)
         self.timeout = timeout
-        self._last_call = 0.0
+        self.max_retry_after = max_retry_after
+        self._local = threading.local()
+        self._calls_lock = threading.Lock()
         self.calls = 0
 
-    def _respect_rate_limit(self):
-        elapsed = time.monotonic() - self._last_call
-        if elapsed < self.min_interval:
-            time.sleep(self.min_interval - elapsed)
-        self._last_call = time.monotonic()
+    @property
+    def session(self):
+        # requests.Session n'est pas garanti thread-safe : une par thread.
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._requests.Session()
+        return session
+
+    def _count_call(self):
+        with self._calls_lock:
+            self.calls += 1
 
     def embed_batch(self, texts: Sequence[str]) -> np.ndarray:
         payload = {"model": self.model, "input": list(texts)}
         last_error = "erreur inconnue"
 
         for attempt in range(self.MAX_RETRIES):
-            self._respect_rate_limit()
+            self.rate_limiter.acquire()
             try:
                 response = self.session.post(
                     f"{self.base_url}/embeddings",
@@ -520,16 +958,21 @@ class RemoteEmbeddingEncoder:
                 time.sleep(min(60, 2 ** attempt) + random.random())
                 continue
 
-            self.calls += 1
+            self._count_call()
 
             if response.status_code in (401, 403):
                 raise RemoteEmbeddingAuthError(f"HTTP {response.status_code}: cle API refusee")
 
             if response.status_code == 429 or response.status_code >= 500:
                 last_error = f"HTTP {response.status_code}"
-                retry_after = response.headers.get("Retry-After", "")
-                delay = float(retry_after) if retry_after.isdigit() else min(60, 2 ** attempt) + random.random()
-                time.sleep(delay)
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if retry_after is not None and retry_after > self.max_retry_after:
+                    raise RemoteEmbeddingError(f"{last_error}: Retry-After {retry_after:.0f}s, quota epuise")
+                if retry_after is not None:
+                    # Le quota est partage : tous les lots en vol attendent.
+                    self.rate_limiter.defer(retry_after)
+                else:
+                    time.sleep(min(60, 2 ** attempt) + random.random())
                 continue
 
             if response.status_code >= 400:
@@ -564,6 +1007,66 @@ class RemoteEmbeddingEncoder:
         raise RemoteEmbeddingError(f"tentatives epuisees ({last_error})")
 
 
+def embed_remote_batches(
+    encoder: RemoteEmbeddingEncoder,
+    batches: List[List[str]],
+    on_batch,
+    max_calls: int,
+    deadline: float,
+    concurrency: int = REMOTE_EMBEDDING_CONCURRENCY,
+) -> int:
+    """Envoie les lots a l'API en gardant jusqu'a `concurrency` requetes en vol.
+
+    on_batch(position, matrix) est appele dans le thread appelant des qu'un
+    lot aboutit (ordre d'arrivee, pas d'envoi) : c'est le point de reprise,
+    les lots termines sont acquis meme si la suite echoue. Plus aucun lot
+    n'est envoye apres un budget atteint ou une erreur systemique ; ceux deja
+    en vol sont attendus. Retourne le nombre de lots aboutis.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    concurrency = max(1, concurrency)
+    in_flight = {}
+    next_position = 0
+    completed = 0
+    stop_reason = None
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        while True:
+            while stop_reason is None and next_position < len(batches) and len(in_flight) < concurrency:
+                if encoder.calls + len(in_flight) >= max_calls:
+                    stop_reason = f"⏸️ Budget d'appels atteint ({max_calls}), reprise a la prochaine execution"
+                elif time.monotonic() > deadline:
+                    stop_reason = "⏸️ Budget temps atteint, reprise a la prochaine execution"
+                else:
+                    future = executor.submit(encoder.embed_batch, batches[next_position])
+                    in_flight[future] = next_position
+                    next_position += 1
+
+            if not in_flight:
+                break
+
+            done, _pending = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                position = in_flight.pop(future)
+                try:
+                    matrix = future.result()
+                except RemoteEmbeddingAuthError as error:
+                    stop_reason = stop_reason or f"⚠️ Authentification distante refusee ({error}), generation interrompue"
+                    continue
+                except RemoteEmbeddingError as error:
+                    stop_reason = stop_reason or (
+                        f"⚠️ API d'embeddings distante en echec ({error}), reprise a la prochaine execution"
+                    )
+                    continue
+                on_batch(position, matrix)
+                completed += 1
+
+    if stop_reason:
+        print(stop_reason)
+    return completed
+
+
 def compute_remote_content_hash(vote_id: str, entry: Dict) -> str:
     """Empreinte du contenu embedde : texte + modele + dimension + prefixe.
 
@@ -621,20 +1124,68 @@ def load_previous_remote_index() -> Dict | None:
         return None
 
     try:
-        with open(FICHIER_SEMANTIC_REMOTE_INDEX, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return json_backend.load_path(FICHIER_SEMANTIC_REMOTE_INDEX)
     except Exception:
         print(f"⚠️ Index semantique distant illisible ({FICHIER_SEMANTIC_REMOTE_INDEX}), cache ignore")
         return None
 
 
+def load_remote_checkpoint(path: str = FICHIER_SEMANTIC_REMOTE_CHECKPOINT) -> Dict[str, List[int]]:
+    """Relit le point de reprise distant : {contentHash: embedding int8}.
+
+    Une ligne JSON par document embedde. Une ligne tronquee (job tue en
+    pleine ecriture) est ignoree ; la derniere occurrence d'un hash l'emporte.
+    """
+    embeddings = {}
+    if not os.path.exists(path):
+        return embeddings
+
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                row = json_backend.loads(line)
+                content_hash, embedding = row["contentHash"], row["embedding"]
+            except Exception:
+                continue
+            if isinstance(content_hash, str) and isinstance(embedding, list) and embedding:
+                embeddings[content_hash] = embedding
+    return embeddings
+
+
+def append_remote_checkpoint(handle, rows: List[Tuple[str, List[int]]]) -> None:
+    """Ajoute un lot au point de reprise et le force sur disque avant de rendre la main."""
+    handle.write(b"".join(
+        json_backend.dumps({"contentHash": content_hash, "embedding": embedding}, compact=True) + b"\n"
+        for content_hash, embedding in rows
+    ))
+    handle.flush()
+    os.fsync(handle.fileno())
+
+
+def compact_remote_checkpoint(path: str, rows: List[Tuple[str, List[int]]]) -> None:
+    """Reecrit le point de reprise avec les seules entrees vivantes (tmp + os.replace)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        append_remote_checkpoint(f, rows)
+    os.replace(tmp, path)
+
+
 def generate_semantic_remote_index(
     index: Dict,
     max_calls: int = 40,
     time_budget_min: float = 10.0,
     dry_run: bool = False,
+    concurrency: int = REMOTE_EMBEDDING_CONCURRENCY,
+    checkpoint_path: str = FICHIER_SEMANTIC_REMOTE_CHECKPOINT,
+    rpm: int = REMOTE_EMBEDDING_RPM,
 ) -> Tuple[Dict | None, bool]:
-    """Genere l'artefact d'embeddings distants de facon incrementale.
+    """Genere l'artefact d'embeddings distants de facon incrementale et reprenable.
+
+    Chaque lot abouti est ajoute au point de reprise JSONL (cle contentHash)
+    avant d'etre compte : un job tue ne perd que les lots en vol, la prochaine
+    execution les reprend sans rappeler l'API. L'artefact est reconstruit a
+    partir de ce point de reprise (amorce par l'artefact precedent).
 
     Retourne (payload, changed). payload=None signifie « conserver l'artefact
     precedent tel quel » (cle absente, dry-run, ou rien a produire).
@@ -648,79 +1199,110 @@ def generate_semantic_remote_index(
 
     previous = load_previous_remote_index() or {}
     previous_votes = previous.get("votes") or {}
+    checkpoint = load_remote_checkpoint(checkpoint_path)
+    checkpoint_hashes = set(checkpoint)
 
-    votes = {}
+    # Vecteurs connus par contentHash : point de reprise, puis artefact publie.
+    embeddings_by_hash = dict(checkpoint)
+    for cached in previous_votes.values():
+        if cached.get("contentHash") and cached.get("embedding"):
+            embeddings_by_hash.setdefault(cached["contentHash"], cached["embedding"])
+
+    content_hashes = {}
     pending = []
+    cached_count = 0
+    restored_count = 0
     for vote_id, entry in vote_items:
         content_hash = compute_remote_content_hash(vote_id, entry)
-        cached = previous_votes.get(vote_id)
-        if cached and cached.get("contentHash") == content_hash and cached.get("embedding"):
-            votes[vote_id] = {"embedding": cached["embedding"], "contentHash": content_hash}
-        else:
+        content_hashes[vote_id] = content_hash
+        if content_hash not in embeddings_by_hash:
             pending.append((vote_id, entry, content_hash))
+        elif (previous_votes.get(vote_id) or {}).get("contentHash") == content_hash:
+            cached_count += 1
+        else:
+            restored_count += 1
 
     removed_count = len(previous_votes) - sum(1 for vote_id, _ in vote_items if vote_id in previous_votes)
     planned_batches = (len(pending) + REMOTE_EMBEDDING_BATCH_SIZE - 1) // REMOTE_EMBEDDING_BATCH_SIZE
     print(
-        f"🌐 Index semantique distant: {len(votes)} en cache, {len(pending)} a embedder "
-        f"({planned_batches} lots de {REMOTE_EMBEDDING_BATCH_SIZE} max), {removed_count} retires"
+        f"🌐 Index semantique distant: {cached_count} en cache, {restored_count} repris du point de reprise, "
+        f"{len(pending)} a embedder ({planned_batches} lots de {REMOTE_EMBEDDING_BATCH_SIZE} max), "
+        f"{removed_count} retires"
     )
 
     if dry_run:
         print("ℹ️ Dry-run distant: aucun appel reseau, aucune ecriture")
         return None, False
 
-    if not REMOTE_EMBEDDING_API_KEY:
-        if pending:
-            print("ℹ️ EMBEDDING_API_KEY absente: generation distante sautee, artefact precedent conserve")
+    if not REMOTE_EMBEDDING_API_KEY and pending:
+        print("ℹ️ EMBEDDING_API_KEY absente: aucun nouvel embedding distant")
+        pending = []
+    if not pending and not restored_count and not removed_count and not REMOTE_EMBEDDING_API_KEY:
         return None, False
 
     embedded_count = 0
     if pending:
-        encoder = RemoteEmbeddingEncoder()
+        encoder = RemoteEmbeddingEncoder(rpm=rpm)
         deadline = time.monotonic() + time_budget_min * 60
-        print(f"🌐 Encodage distant via {encoder.base_url} ({encoder.model})...")
-
-        for start in range(0, len(pending), REMOTE_EMBEDDING_BATCH_SIZE):
-            if encoder.calls >= max_calls:
-                print(f"⏸️ Budget d'appels atteint ({max_calls}), reprise a la prochaine execution")
-                break
-            if time.monotonic() > deadline:
-                print(f"⏸️ Budget temps atteint ({time_budget_min} min), reprise a la prochaine execution")
-                break
-
-            batch = pending[start:start + REMOTE_EMBEDDING_BATCH_SIZE]
-            texts = [
+        print(f"🌐 Encodage distant via {encoder.base_url} ({encoder.model}), {concurrency} lots en vol...")
+
+        batches = [
+            pending[start:start + REMOTE_EMBEDDING_BATCH_SIZE]
+            for start in range(0, len(pending), REMOTE_EMBEDDING_BATCH_SIZE)
+        ]
+        batch_texts = [
+            [
                 apply_semantic_prefix(
                     build_semantic_document_text(vote_id, entry),
                     REMOTE_EMBEDDING_DOCUMENT_PREFIX
                 )
                 for vote_id, entry, _ in batch
             ]
+            for batch in batches
+        ]
+
+        os.makedirs(os.path.dirname(checkpoint_path) or ".", exist_ok=True)
+        with open(checkpoint_path, "ab") as checkpoint_file:
+            def store_batch(position: int, matrix: np.ndarray) -> None:
+                nonlocal embedded_count
+                rows = [
+                    (content_hash, quantize_normalized_embedding(vector))
+                    for (_vote_id, _entry, content_hash), vector in zip(batches[position], matrix)
+                ]
+                append_remote_checkpoint(checkpoint_file, rows)
+                for content_hash, embedding in rows:
+                    embeddings_by_hash[content_hash] = embedding
+                    checkpoint_hashes.add(content_hash)
+                embedded_count += len(rows)
+                print(f"  Encodage distant {embedded_count}/{len(pending)}")
+
+            embed_remote_batches(
+                encoder,
+                batch_texts,
+                store_batch,
+                max_calls=max_calls,
+                deadline=deadline,
+                concurrency=concurrency
+            )
 
-            try:
-                matrix = encoder.embed_batch(texts)
-            except RemoteEmbeddingAuthError as error:
-                print(f"⚠️ Authentification distante refusee ({error}), generation interrompue")
-                break
-            except RemoteEmbeddingError as error:
-                print(f"⚠️ API d'embeddings distante en echec ({error}), reprise a la prochaine execution")
-                break
-
-            for (vote_id, _entry, content_hash), vector in zip(batch, matrix):
-                votes[vote_id] = {
-                    "embedding": quantize_normalized_embedding(vector),
-                    "contentHash": content_hash
-                }
-                embedded_count += 1
+    # Artefact reconstruit depuis les vecteurs par hash, dans l'ordre des scrutins.
+    votes = {
+        vote_id: {"embedding": embeddings_by_hash[content_hashes[vote_id]], "contentHash": content_hashes[vote_id]}
+        for vote_id, _entry in vote_items
+        if content_hashes[vote_id] in embeddings_by_hash
+    }
 
-            print(f"  Encodage distant {min(start + len(batch), len(pending))}/{len(pending)}")
+    # Compaction : le point de reprise ne garde que les documents vivants et
+    # couvre tout l'artefact (reconstructible meme si celui-ci est perdu).
+    live_rows = [(entry["contentHash"], entry["embedding"]) for entry in votes.values()]
+    if checkpoint_hashes != {content_hash for content_hash, _ in live_rows}:
+        compact_remote_checkpoint(checkpoint_path, live_rows)
 
     if not votes:
         return None, False
 
     coverage = len(votes) / len(vote_items)
-    changed = embedded_count > 0 or removed_count > 0
+    changed = embedded_count > 0 or restored_count > 0 or removed_count > 0
     payload = {
         "schemaVersion": SEMANTIC_REMOTE_INDEX_SCHEMA_VERSION,
         "generatedAt": datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z"),
@@ -729,32 +1311,166 @@ def generate_semantic_remote_index(
         "stats": {
             "embeddedDocuments": len(votes),
             "totalDocuments": len(vote_items),
-            "newlyEmbedded": embedded_count
+            "newlyEmbedded": embedded_count + restored_count
         },
         "votes": votes
     }
 
-    print(f"🌐 Couverture distante: {len(votes)}/{len(vote_items)} ({coverage:.1%}), {embedded_count} nouveaux")
+    print(
+        f"🌐 Couverture distante: {len(votes)}/{len(vote_items)} ({coverage:.1%}), "
+        f"{embedded_count} nouveaux, {restored_count} repris"
+    )
     return payload, changed
 
 
-def encode_semantic_texts(model, texts: List[str], prefix: str = SEMANTIC_DOCUMENT_PREFIX) -> np.ndarray:
-    """Encode une liste de textes en embeddings normalises."""
-    prepared_texts = [apply_semantic_prefix(text, prefix) for text in texts]
-    embeddings = model.encode(
+# Encodeur du processus worker (charge une fois par _init_encoding_worker).
+_WORKER_ENCODER = None
+
+
+def _init_encoding_worker(model_name: str, backend: str, num_threads: int) -> None:
+    global _WORKER_ENCODER
+    _WORKER_ENCODER = load_semantic_encoder(model_name, backend=backend, num_threads=num_threads)
+    if _WORKER_ENCODER is None:
+        raise RuntimeError(f"Encodeur {model_name} indisponible dans le worker")
+
+
+def _encode_shard(prepared_texts: List[str]) -> np.ndarray:
+    return _WORKER_ENCODER.encode(
         prepared_texts,
         batch_size=64,
-        show_progress_bar=True,
+        show_progress_bar=False,
         normalize_embeddings=SEMANTIC_MODEL_NORMALIZE,
         convert_to_numpy=True
     )
 
+
+def encode_texts_with_workers(model, prepared_texts: List[str], workers: int) -> np.ndarray:
+    """Repartit l'encodage sur `workers` processus CPU, sortie dans l'ordre d'entree.
+
+    Chaque worker charge le modele une fois (meme identifiant et backend que
+    `model`) avec cpu_count // workers threads intra-op ; les textes sont
+    decoupes en tranches contigues comme dans scrutins_corpus.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    threads_per_worker = max(1, (os.cpu_count() or 1) // workers)
+    shard_count = workers * SEMANTIC_SHARDS_PER_WORKER
+    shard_size = (len(prepared_texts) + shard_count - 1) // shard_count
+    shards = [prepared_texts[start:start + shard_size] for start in range(0, len(prepared_texts), shard_size)]
+
+    print(f"  Encodage semantique sur {workers} processus ({threads_per_worker} threads chacun, {len(shards)} tranches)")
+    # spawn : un fork apres initialisation des threads torch peut se bloquer.
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_encoding_worker,
+        initargs=(model.model_name, getattr(model, "backend", "torch"), threads_per_worker)
+    ) as executor:
+        return np.concatenate(list(executor.map(_encode_shard, shards)), axis=0)
+
+
+def encode_semantic_texts(model, texts: List[str], prefix: str = SEMANTIC_DOCUMENT_PREFIX, workers: int = 1) -> np.ndarray:
+    """Encode une liste de textes en embeddings normalises.
+
+    workers > 1 repartit l'encodage sur plusieurs processus CPU (repli sur
+    l'encodeur courant en cas d'echec).
+    """
+    prepared_texts = [apply_semantic_prefix(text, prefix) for text in texts]
+    embeddings = None
+    if workers > 1 and len(prepared_texts) >= workers * SEMANTIC_MIN_TEXTS_PER_WORKER and hasattr(model, "model_name"):
+        try:
+            embeddings = encode_texts_with_workers(model, prepared_texts, workers)
+        except Exception as error:
+            print(f"⚠️ Encodage multi-processus en echec ({error}), repli sur un seul processus")
+
+    if embeddings is None:
+        embeddings = model.encode(
+            prepared_texts,
+            batch_size=64,
+            show_progress_bar=True,
+            normalize_embeddings=SEMANTIC_MODEL_NORMALIZE,
+            convert_to_numpy=True
+        )
+
     if len(embeddings.shape) != 2 or embeddings.shape[0] != len(texts):
         raise RuntimeError("Encodage semantique invalide: dimensions inattendues")
 
     return embeddings
 
 
+def compute_semantic_content_hash(text: str, model_name: str = SEMANTIC_PYTHON_MODEL_ID, backend: str = "torch") -> str:
+    """Empreinte d'un texte encode localement : texte prefixe + modele + troncature + echelle.
+
+    Meme principe que compute_remote_content_hash : changer l'un de ces
+    parametres invalide le cache et re-encode proprement. Seul le backend
+    quantifie (onnx-int8) produit des vecteurs differents : les backends fp32
+    partagent la meme empreinte.
+    """
+    parts = [
+        apply_semantic_prefix(text, SEMANTIC_DOCUMENT_PREFIX),
+        model_name,
+        str(SEMANTIC_MODEL_MAX_LENGTH),
+        str(SEMANTIC_VECTOR_SCALE),
+    ]
+    if backend == "onnx-int8":
+        parts.append(backend)
+    fingerprint = "\x1f".join(parts)
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()[:16]
+
+
+def load_previous_semantic_vectors(path: str) -> Dict[str, List[int]]:
+    """Vecteurs quantifies de l'artefact E5 precedent, indexes par contentHash."""
+    if not os.path.exists(path):
+        return {}
+
+    try:
+        payload = json_backend.load_path(path)
+    except Exception:
+        print(f"⚠️ Index semantique illisible ({path}), cache ignore")
+        return {}
+
+    cached = {}
+    for entry in (payload.get("votes") or {}).values():
+        for vector in entry.get("vectors") or [entry]:
+            content_hash = vector.get("contentHash")
+            if content_hash and vector.get("embedding"):
+                cached[content_hash] = vector["embedding"]
+    return cached
+
+
+def encode_semantic_texts_cached(
+    model,
+    texts: List[str],
+    content_hashes: List[str],
+    cached_vectors: Dict[str, List[int]],
+    workers: int = 1,
+) -> Tuple[List[List[int]], int]:
+    """Vecteurs quantifies des textes, en n'encodant que ceux absents du cache.
+
+    Retourne (vecteurs dans l'ordre de texts, dimension).
+    """
+    # Textes identiques => meme contentHash : chacun n'est encode qu'une fois.
+    pending = {}
+    for position, content_hash in enumerate(content_hashes):
+        if content_hash not in cached_vectors and content_hash not in pending:
+            pending[content_hash] = texts[position]
+    print(
+        f"🧮 Encodage E5: {len(texts)} textes, {len(set(content_hashes))} distincts, "
+        f"{len(pending)} a encoder"
+    )
+
+    vectors_by_hash = dict(cached_vectors)
+    if pending:
+        embeddings = encode_semantic_texts(model, list(pending.values()), workers=workers)
+        for content_hash, vector in zip(pending, embeddings):
+            vectors_by_hash[content_hash] = quantize_normalized_embedding(vector)
+
+    vectors = [vectors_by_hash[content_hash] for content_hash in content_hashes]
+    dimension = len(vectors[0]) if vectors else SEMANTIC_MODEL_EXPECTED_DIMENSION
+    return vectors, dimension
+
+
 def build_multivector_sections(vote_id: str, entry: Dict) -> List[Dict]:
     """Construit une representation multi-vector legere par sections de scrutin."""
     theme_label = entry.get("theme", "") or entry.get("category", "")
@@ -851,74 +1567,65 @@ def build_manifest_model_payload(model_payload: Dict | None, default_model_id: s
     return projected
 
 
-def generate_semantic_index(index: Dict, model=None, model_name: str = SEMANTIC_PYTHON_MODEL_ID) -> Dict | None:
-    """Genere un artefact single-vector quantifie pour le reranking local."""
-    encoder = model or load_semantic_encoder(model_name)
-    if encoder is None:
-        return None
-
-    vote_items = sorted(
+def sort_semantic_vote_items(index: Dict) -> List[Tuple[str, Dict]]:
+    """Scrutins de l'index dans l'ordre des artefacts semantiques (numero croissant)."""
+    return sorted(
         index.get("votes", {}).items(),
         key=lambda item: int(item[0]) if str(item[0]).isdigit() else str(item[0])
     )
 
-    if not vote_items:
-        return None
 
-    texts = [build_semantic_document_text(vote_id, entry) for vote_id, entry in vote_items]
-    embeddings = encode_semantic_texts(encoder, texts)
+def collect_single_vector_texts(vote_items: List[Tuple[str, Dict]]) -> List[Tuple[str, str]]:
+    """(vote_id, texte) du document de reference de chaque scrutin."""
+    return [(vote_id, build_semantic_document_text(vote_id, entry)) for vote_id, entry in vote_items]
+
 
+def collect_multivector_texts(vote_items: List[Tuple[str, Dict]]) -> List[Tuple[Dict, str]]:
+    """({vote_id, slot}, texte) de chaque section non vide."""
+    sections = []
+    for vote_id, entry in vote_items:
+        for section in build_multivector_sections(vote_id, entry):
+            if not section.get("text"):
+                continue
+            sections.append(({"vote_id": vote_id, "slot": section["slot"]}, section["text"]))
+    return sections
+
+
+def build_single_vector_payload(
+    documents: List[Tuple[str, str]],
+    vectors: List[List[int]],
+    content_hashes: List[str],
+    dimension: int,
+    model_name: str,
+) -> Dict:
     votes = {}
-    for (vote_id, _entry), vector in zip(vote_items, embeddings):
+    for (vote_id, _text), vector, content_hash in zip(documents, vectors, content_hashes):
         votes[vote_id] = {
-            "embedding": quantize_normalized_embedding(vector)
+            "embedding": vector,
+            "contentHash": content_hash
         }
 
     return {
         "schemaVersion": SEMANTIC_INDEX_SCHEMA_VERSION,
         "generatedAt": datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z"),
-        "model": build_semantic_model_descriptor(SEMANTIC_MODEL_ID, model_name, int(embeddings.shape[1]), "single_vector"),
+        "model": build_semantic_model_descriptor(SEMANTIC_MODEL_ID, model_name, dimension, "single_vector"),
         "votes": votes
     }
 
 
-def generate_semantic_multivector_index(index: Dict, model=None, model_name: str = SEMANTIC_PYTHON_MODEL_ID) -> Dict | None:
-    """Genere un artefact multi-vector leger par sections de scrutin."""
-    encoder = model or load_semantic_encoder(model_name)
-    if encoder is None:
-        return None
-
-    vote_items = sorted(
-        index.get("votes", {}).items(),
-        key=lambda item: int(item[0]) if str(item[0]).isdigit() else str(item[0])
-    )
-
-    if not vote_items:
-        return None
-
-    section_mappings = []
-    texts = []
-
-    for vote_id, entry in vote_items:
-        for section in build_multivector_sections(vote_id, entry):
-            if not section.get("text"):
-                continue
-            section_mappings.append({
-                "vote_id": vote_id,
-                "slot": section["slot"]
-            })
-            texts.append(section["text"])
-
-    if not texts:
-        return None
-
-    embeddings = encode_semantic_texts(encoder, texts)
+def build_multivector_payload(
+    sections: List[Tuple[Dict, str]],
+    vectors: List[List[int]],
+    content_hashes: List[str],
+    dimension: int,
+    model_name: str,
+) -> Dict:
     votes = defaultdict(lambda: {"vectors": []})
-
-    for mapping, vector in zip(section_mappings, embeddings):
+    for (mapping, _text), vector, content_hash in zip(sections, vectors, content_hashes):
         votes[mapping["vote_id"]]["vectors"].append({
             "slot": mapping["slot"],
-            "embedding": quantize_normalized_embedding(vector)
+            "embedding": vector,
+            "contentHash": content_hash
         })
 
     return {
@@ -928,7 +1635,7 @@ def generate_semantic_multivector_index(index: Dict, model=None, model_name: str
             **build_semantic_model_descriptor(
                 SEMANTIC_MULTI_VECTOR_MODEL_ID,
                 model_name,
-                int(embeddings.shape[1]),
+                dimension,
                 "multi_vector_sections"
             ),
             "vector_count_per_document": len(SEMANTIC_MULTI_VECTOR_SLOT_WEIGHTS)
@@ -937,56 +1644,283 @@ def generate_semantic_multivector_index(index: Dict, model=None, model_name: str
     }
 
 
-def build_rag_manifest(index: Dict) -> Dict:
-    """Construit le manifest RAG public."""
-    lexical_size = os.path.getsize(FICHIER_LEXICAL_INDEX) if os.path.exists(FICHIER_LEXICAL_INDEX) else 0
-    lexical_sha256 = compute_sha256(FICHIER_LEXICAL_INDEX) if os.path.exists(FICHIER_LEXICAL_INDEX) else ""
-    semantic_size = os.path.getsize(FICHIER_SEMANTIC_INDEX) if os.path.exists(FICHIER_SEMANTIC_INDEX) else 0
-    semantic_sha256 = compute_sha256(FICHIER_SEMANTIC_INDEX) if os.path.exists(FICHIER_SEMANTIC_INDEX) else ""
-    semantic_multivector_size = os.path.getsize(FICHIER_SEMANTIC_MULTIVECTOR_INDEX) if os.path.exists(FICHIER_SEMANTIC_MULTIVECTOR_INDEX) else 0
-    semantic_multivector_sha256 = compute_sha256(FICHIER_SEMANTIC_MULTIVECTOR_INDEX) if os.path.exists(FICHIER_SEMANTIC_MULTIVECTOR_INDEX) else ""
+def generate_semantic_artifacts(
+    index: Dict,
+    model=None,
+    model_name: str = SEMANTIC_PYTHON_MODEL_ID,
+    workers: int = 1,
+) -> Tuple[Dict | None, Dict | None]:
+    """Genere les artefacts single-vector et multi-vector en un seul passage d'encodage.
+
+    Les textes des deux artefacts (document de reference et sections) sont
+    reunis et dedupliques par contentHash, encodes une seule fois, puis
+    redistribues : un meme texte a le meme vecteur dans les deux artefacts.
+    """
+    encoder = model or load_semantic_encoder(model_name)
+    if encoder is None:
+        return None, None
+
+    vote_items = sort_semantic_vote_items(index)
+    if not vote_items:
+        return None, None
+
+    documents = collect_single_vector_texts(vote_items)
+    sections = collect_multivector_texts(vote_items)
+    texts = [text for _vote_id, text in documents] + [text for _mapping, text in sections]
+
+    backend = getattr(encoder, "backend", "torch")
+    content_hashes = [compute_semantic_content_hash(text, model_name, backend) for text in texts]
+    cached_vectors = {
+        **load_previous_semantic_vectors(FICHIER_SEMANTIC_MULTIVECTOR_INDEX),
+        **load_previous_semantic_vectors(FICHIER_SEMANTIC_INDEX)
+    }
+    vectors, dimension = encode_semantic_texts_cached(encoder, texts, content_hashes, cached_vectors, workers=workers)
+
+    split = len(documents)
+    single_payload = build_single_vector_payload(
+        documents, vectors[:split], content_hashes[:split], dimension, model_name
+    )
+    multi_payload = build_multivector_payload(
+        sections, vectors[split:], content_hashes[split:], dimension, model_name
+    ) if sections else None
+    return single_payload, multi_payload
+
+
+def get_packed_data_path(header_path: str) -> str:
+    """Chemin de la matrice int8 associee a un entete d'index packe."""
+    return os.path.splitext(header_path)[0] + PACKED_SEMANTIC_DATA_EXTENSION
+
+
+def pack_semantic_index(payload: Dict) -> Tuple[Dict, bytes]:
+    """Convertit un index semantique JSON (single ou multi-vector) en entete + matrice int8.
+
+    Les lignes suivent l'ordre des scrutins de l'artefact JSON ; en
+    multi-vector, chaque vecteur occupe une ligne et son slot est publie
+    dans `slots`.
+    """
+    model = payload.get("model", {})
+    is_multivector = model.get("strategy") == "multi_vector_sections"
+    vote_ids = []
+    slots = []
+    rows = []
+
+    for vote_id, entry in payload.get("votes", {}).items():
+        if is_multivector:
+            for vector in entry.get("vectors", []):
+                vote_ids.append(vote_id)
+                slots.append(vector.get("slot", ""))
+                rows.append(vector.get("embedding", []))
+        else:
+            vote_ids.append(vote_id)
+            rows.append(entry.get("embedding", []))
+
+    dimension = int(model.get("dimension") or (len(rows[0]) if rows else 0))
+    matrix = np.asarray(rows, dtype=np.int8).reshape(len(rows), dimension)
+    data = matrix.tobytes(order="C")
+
+    header = {
+        "schemaVersion": PACKED_SEMANTIC_INDEX_SCHEMA_VERSION,
+        "generatedAt": payload.get("generatedAt"),
+        "format": PACKED_SEMANTIC_INDEX_FORMAT,
+        "dtype": "int8",
+        "shape": [len(rows), dimension],
+        "valueScale": model.get("vector_scale", SEMANTIC_VECTOR_SCALE),
+        "dataBytes": len(data),
+        "dataSha256": hashlib.sha256(data).hexdigest(),
+        "model": model,
+        "voteIds": vote_ids
+    }
+    if is_multivector:
+        header["slots"] = slots
+
+    return header, data
+
+
+def write_packed_semantic_index(header_path: str, payload: Dict) -> None:
+    """Ecrit la matrice int8 puis son entete (reference par le manifest), s'ils changent."""
+    header, data = pack_semantic_index(payload)
+    data_path = get_packed_data_path(header_path)
+    header["dataPath"] = os.path.basename(data_path)
+
+    write_bytes_if_changed(data_path, data)
+    write_bytes_if_changed(header_path, json_backend.dumps(header))
 
-    semantic_payload = None
-    if os.path.exists(FICHIER_SEMANTIC_INDEX):
+
+def read_packed_semantic_index(header_path: str) -> Tuple[Dict, np.ndarray]:
+    """Relit un index packe : (entete, matrice int8 de forme header['shape'])."""
+    header = json_backend.load_path(header_path)
+    data_path = os.path.join(os.path.dirname(header_path), header.get("dataPath") or os.path.basename(get_packed_data_path(header_path)))
+
+    matrix = np.fromfile(data_path, dtype=np.int8)
+    rows, dimension = header.get("shape", [0, 0])
+    if matrix.size != rows * dimension:
+        raise ValueError(f"Index packe incoherent ({data_path}): {matrix.size} octets pour une forme {rows}x{dimension}")
+
+    return header, matrix.reshape(rows, dimension)
+
+
+def unpack_semantic_index(header: Dict, matrix: np.ndarray) -> Dict:
+    """Reconstruit la disposition JSON (`votes`) depuis un index packe."""
+    slots = header.get("slots")
+    votes = {}
+    for row, vote_id in enumerate(header.get("voteIds", [])):
+        embedding = matrix[row].astype(np.int16).tolist()
+        if slots is None:
+            votes[vote_id] = {"embedding": embedding}
+        else:
+            votes.setdefault(vote_id, {"vectors": []})["vectors"].append({
+                "slot": slots[row],
+                "embedding": embedding
+            })
+
+    return {
+        "schemaVersion": header.get("schemaVersion"),
+        "generatedAt": header.get("generatedAt"),
+        "model": header.get("model", {}),
+        "votes": votes
+    }
+
+
+def describe_packed_artifact(header_path: str, payload: Dict | None) -> Dict | None:
+    """Projection manifest d'un index packe, si present et synchrone avec l'artefact JSON."""
+    if not payload or not os.path.exists(header_path):
+        return None
+
+    try:
+        header = json_backend.load_path(header_path)
+    except Exception:
+        return None
+
+    data_path = os.path.join(os.path.dirname(header_path), header.get("dataPath") or "")
+    if header.get("generatedAt") != payload.get("generatedAt") or not os.path.isfile(data_path):
+        return None
+
+    return {
+        "path": os.path.basename(header_path),
+        "bytes": os.path.getsize(header_path),
+        "sha256": compute_sha256(header_path),
+        "format": header.get("format", PACKED_SEMANTIC_INDEX_FORMAT),
+        "dataPath": header.get("dataPath"),
+        "dataBytes": os.path.getsize(data_path),
+        "dataSha256": header.get("dataSha256") or compute_sha256(data_path),
+        "shape": header.get("shape")
+    }
+
+
+def write_semantic_search_indexes(binary: bool = True) -> None:
+    """Construit les structures de recherche de chaque index packe : IVF et codes binaires.
+
+    Non bloquant : sans elles, le client retombe sur l'exhaustif int8.
+    """
+    for packed_path, ivf_path, binary_path in (
+        (FICHIER_SEMANTIC_INDEX_PACKED, FICHIER_SEMANTIC_INDEX_IVF, FICHIER_SEMANTIC_INDEX_BINARY),
+        (FICHIER_SEMANTIC_MULTIVECTOR_INDEX_PACKED, FICHIER_SEMANTIC_MULTIVECTOR_INDEX_IVF, FICHIER_SEMANTIC_MULTIVECTOR_INDEX_BINARY),
+    ):
         try:
-            with open(FICHIER_SEMANTIC_INDEX, 'r', encoding='utf-8') as f:
-                semantic_payload = json.load(f)
+            packed_header, matrix = read_packed_semantic_index(packed_path)
+        except Exception as error:
+            print(f"⚠️ Index packe {os.path.basename(packed_path)} illisible ({error}), structures de recherche ignorees")
+            continue
+        if len(matrix) == 0:
+            continue
+
+        try:
+            header = write_ivf_index(ivf_path, packed_path, packed_header, matrix)
+            measured = next(entry for entry in header["evaluation"]["probes"] if entry["nprobe"] == header["defaultProbes"])
+            print(
+                f"💾 Index ANN {os.path.basename(ivf_path)} : {header['lists']} listes, "
+                f"nprobe={header['defaultProbes']}, rappel@{header['evaluation']['k']} {measured['recall']:.3f}"
+            )
+        except Exception as error:
+            print(f"⚠️ Index ANN {os.path.basename(ivf_path)} non genere ({error})")
+
+        if not binary:
+            continue
+        try:
+            header = write_binary_index(binary_path, packed_path, packed_header, matrix)
+            measured = next(entry for entry in header["evaluation"]["shortlists"] if entry["shortlist"] == header["defaultShortlist"])
+            print(
+                f"💾 Codes binaires {os.path.basename(binary_path)} : {header['dataBytes'] / 1024:.1f} Ko "
+                f"({header['bytesPerVector']} octets/vecteur), shortlist={header['defaultShortlist']}, "
+                f"rappel@{header['evaluation']['k']} {measured['recall']:.3f} apres re-classement int8"
+            )
+        except Exception as error:
+            print(f"⚠️ Codes binaires {os.path.basename(binary_path)} non generes ({error})")
+
+
+def load_previous_manifest() -> Dict:
+    """Manifest de l'execution precedente (vide s'il est absent ou illisible)."""
+    if not os.path.exists(FICHIER_RAG_MANIFEST):
+        return {}
+    try:
+        return json_backend.load_path(FICHIER_RAG_MANIFEST)
+    except Exception:
+        return {}
+
+
+def build_rag_manifest(
+    index: Dict,
+    semantic_payload: Dict | None = None,
+    semantic_multivector_payload: Dict | None = None,
+    semantic_remote_payload: Dict | None = None,
+) -> Dict:
+    """Construit le manifest RAG public.
+
+    Les artefacts inchanges gardent la generation du manifest precedent
+    (cf. describe_artifact_file). Les index
+    semantiques produits par cette execution sont passes en memoire ; seuls
+    les autres sont relus sur disque.
+    """
+    previous_artifacts = load_previous_manifest().get("artifacts") or {}
+
+    def describe_path(path: str, key: str) -> Dict:
+        if not os.path.exists(path):
+            return {"path": os.path.basename(path), "bytes": 0, "sha256": "", "generation": 0}
+        return describe_artifact_file(path, previous_artifacts.get(key))
+
+    lexical_file = describe_path(FICHIER_LEXICAL_INDEX, "lexicalIndex")
+    semantic_file = describe_path(FICHIER_SEMANTIC_INDEX, "semanticIndex")
+    semantic_multivector_file = describe_path(FICHIER_SEMANTIC_MULTIVECTOR_INDEX, "semanticMultivectorIndex")
+
+    if semantic_payload is None and os.path.exists(FICHIER_SEMANTIC_INDEX):
+        try:
+            semantic_payload = json_backend.load_path(FICHIER_SEMANTIC_INDEX)
         except Exception:
             semantic_payload = None
 
-    semantic_multivector_payload = None
-    if os.path.exists(FICHIER_SEMANTIC_MULTIVECTOR_INDEX):
+    if semantic_multivector_payload is None and os.path.exists(FICHIER_SEMANTIC_MULTIVECTOR_INDEX):
         try:
-            with open(FICHIER_SEMANTIC_MULTIVECTOR_INDEX, 'r', encoding='utf-8') as f:
-                semantic_multivector_payload = json.load(f)
+            semantic_multivector_payload = json_backend.load_path(FICHIER_SEMANTIC_MULTIVECTOR_INDEX)
         except Exception:
             semantic_multivector_payload = None
 
-    semantic_remote_payload = load_previous_remote_index()
-    semantic_remote_size = os.path.getsize(FICHIER_SEMANTIC_REMOTE_INDEX) if os.path.exists(FICHIER_SEMANTIC_REMOTE_INDEX) else 0
-    semantic_remote_sha256 = compute_sha256(FICHIER_SEMANTIC_REMOTE_INDEX) if os.path.exists(FICHIER_SEMANTIC_REMOTE_INDEX) else ""
+    if semantic_remote_payload is None:
+        semantic_remote_payload = load_previous_remote_index()
+    semantic_remote_file = describe_path(FICHIER_SEMANTIC_REMOTE_INDEX, "semanticRemoteIndex")
 
     semantic_artifact = None
     if semantic_payload:
         semantic_artifact = {
-            "path": "semantic_index.json",
-            "bytes": semantic_size,
-            "sha256": semantic_sha256,
+            **semantic_file,
             "quantization": "int8",
             "vectorDimension": semantic_payload.get("model", {}).get("dimension"),
-            "valueScale": semantic_payload.get("model", {}).get("vector_scale", SEMANTIC_VECTOR_SCALE)
+            "valueScale": semantic_payload.get("model", {}).get("vector_scale", SEMANTIC_VECTOR_SCALE),
+            "packed": describe_packed_artifact(FICHIER_SEMANTIC_INDEX_PACKED, semantic_payload),
+            "ann": describe_ivf_artifact(FICHIER_SEMANTIC_INDEX_IVF, FICHIER_SEMANTIC_INDEX_PACKED),
+            "binary": describe_binary_artifact(FICHIER_SEMANTIC_INDEX_BINARY, FICHIER_SEMANTIC_INDEX_PACKED)
         }
 
     semantic_multivector_artifact = None
     if semantic_multivector_payload:
         semantic_multivector_artifact = {
-            "path": "semantic_multivector_index.json",
-            "bytes": semantic_multivector_size,
-            "sha256": semantic_multivector_sha256,
+            **semantic_multivector_file,
             "quantization": "int8",
             "vectorDimension": semantic_multivector_payload.get("model", {}).get("dimension"),
             "valueScale": semantic_multivector_payload.get("model", {}).get("vector_scale", SEMANTIC_VECTOR_SCALE),
-            "vectorsPerDocument": semantic_multivector_payload.get("model", {}).get("vector_count_per_document")
+            "vectorsPerDocument": semantic_multivector_payload.get("model", {}).get("vector_count_per_document"),
+            "packed": describe_packed_artifact(FICHIER_SEMANTIC_MULTIVECTOR_INDEX_PACKED, semantic_multivector_payload),
+            "ann": describe_ivf_artifact(FICHIER_SEMANTIC_MULTIVECTOR_INDEX_IVF, FICHIER_SEMANTIC_MULTIVECTOR_INDEX_PACKED),
+            "binary": describe_binary_artifact(FICHIER_SEMANTIC_MULTIVECTOR_INDEX_BINARY, FICHIER_SEMANTIC_MULTIVECTOR_INDEX_PACKED)
         }
 
     single_vector_mode = None
@@ -1009,9 +1943,7 @@ def build_rag_manifest(index: Dict) -> Dict:
     semantic_remote_artifact = None
     if semantic_remote_payload:
         semantic_remote_artifact = {
-            "path": "semantic_index_remote.json",
-            "bytes": semantic_remote_size,
-            "sha256": semantic_remote_sha256,
+            **semantic_remote_file,
             "quantization": "int8",
             "vectorDimension": semantic_remote_payload.get("model", {}).get("dimension"),
             "valueScale": semantic_remote_payload.get("model", {}).get("vector_scale", SEMANTIC_VECTOR_SCALE),
@@ -1084,9 +2016,9 @@ def build_rag_manifest(index: Dict) -> Dict:
         },
         "artifacts": {
             "lexicalIndex": {
-                "path": "lexical_index.json",
-                "bytes": lexical_size,
-                "sha256": lexical_sha256
+                **lexical_file,
+                "bm25": describe_bm25_artifact(FICHIER_LEXICAL_BM25, FICHIER_LEXICAL_INDEX, lexical_file["sha256"]),
+                "shards": describe_lexical_shards(DOSSIER_LEXICAL_SHARDS, FICHIER_LEXICAL_INDEX, lexical_file["sha256"])
             },
             "semanticIndex": semantic_artifact,
             "semanticMultivectorIndex": semantic_multivector_artifact,
@@ -1095,13 +2027,59 @@ def build_rag_manifest(index: Dict) -> Dict:
     }
 
 
-def process_scrutins_with_bge(use_bge: bool = True) -> Dict:
-    """Traite tous les scrutins et génère l'index."""
+def enrich_titles_with_bge(
+    embedder,
+    titles: List[str],
+    candidate_terms: List[str],
+    candidate_embeddings: np.ndarray,
+    top_k: int = BGE_ENRICHMENT_TOP_K,
+    min_score: float = BGE_ENRICHMENT_MIN_SCORE,
+) -> List[List[str]]:
+    """Termes candidats les plus proches de chaque titre (meilleur score d'abord).
+
+    Tous les titres sont encodes en lots, puis scores par un unique produit
+    matriciel et un top-k vectorise (argpartition) sur l'ensemble du lot.
+    """
+    try:
+        output = embedder.encode(titles, batch_size=BGE_ENCODE_BATCH_SIZE, max_length=BGE_ENCODE_MAX_LENGTH)
+        title_embeddings = np.asarray(output['dense_vecs'], dtype=np.float32)
+    except Exception as e:
+        print(f"⚠️ Erreur vectorisation des titres BGE-M3: {e}")
+        return [[] for _ in titles]
+
+    # Produit scalaire (BGE-M3 dense vecs ne sont pas toujours normalisés,
+    # mais pour le ranking ça suffit)
+    scores = title_embeddings @ np.asarray(candidate_embeddings, dtype=np.float32).T
+    k = min(top_k, scores.shape[1])
+    if k == 0:
+        return [[] for _ in titles]
+
+    top_indices = np.argpartition(scores, -k, axis=1)[:, -k:]
+    top_scores = np.take_along_axis(scores, top_indices, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind='stable')
+    top_indices = np.take_along_axis(top_indices, order, axis=1)
+    top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+    return [
+        [candidate_terms[idx] for idx, score in zip(row_indices, row_scores) if score > min_score]
+        for row_indices, row_scores in zip(top_indices.tolist(), top_scores.tolist())
+    ]
+
+
+def process_scrutins_with_bge(use_bge: bool = True) -> Tuple[Dict, Dict]:
+    """Traite tous les scrutins et génère l'index.
+
+    Retourne (index, ecart a l'index lexical precedent) ; l'ecart
+    (lexical_bm25.build_lexical_delta) permet de ne mettre a jour que les
+    scrutins ajoutes ou modifies dans l'index BM25 et ses fragments.
+    """
     print("🔍 Analyse des scrutins...")
     
     # Charger l'index existant
-    existing_index = load_existing_index()
+    existing_index, previous_lexical_sha256 = load_existing_index()
     existing_votes = existing_index.get("votes", {})
+    # Copie des entrees avant mise a jour (l'enrichissement modifie les entrees en place).
+    previous_votes = {numero: dict(entry) for numero, entry in existing_votes.items()}
     
     votes = {}
     inverted_index = defaultdict(set)
@@ -1115,11 +2093,10 @@ def process_scrutins_with_bge(use_bge: bool = True) -> Dict:
         for kw in data.get("keywords", []):
             inverted_index[kw].add(numero)
     
-    # Trouver les fichiers de scrutins
-    fichiers_scrutins = glob.glob(os.path.join(DOSSIER_SCRUTINS, "VTAN*.json"))
-    fichiers_scrutins.sort()
+    # Corpus partage (relu depuis le cache si process_votes.py l'a deja construit)
+    scrutins = load_scrutins_corpus()
     
-    print(f"📁 {len(fichiers_scrutins)} fichiers de scrutins trouvés")
+    print(f"📁 {len(scrutins)} scrutins dans le corpus")
     
     # Optionnel: charger BGE-M3 pour enrichissement sémantique
     embedder = None
@@ -1162,31 +2139,20 @@ def process_scrutins_with_bge(use_bge: bool = True) -> Dict:
             print(f"⚠️ Erreur vectorisation candidats: {e}")
             embedder = None
 
-    new_count = 0
-    for i, chemin in enumerate(fichiers_scrutins):
-        if (i + 1) % 500 == 0:
-            print(f"  Traitement... {i+1}/{len(fichiers_scrutins)}")
-        
-        try:
-            with open(chemin, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                scrutin = data.get('scrutin', {})
-        except:
-            continue
-        
-        numero = str(scrutin.get('numero', ''))
-        if not numero:
-            continue
+    # 1. Entrees des nouveaux scrutins (mots-cles, classification, resume)
+    pending = []
+    for scrutin in scrutins:
+        numero = scrutin.numero
         
         # Skip si déjà indexé
         existing_entry = existing_votes.get(numero)
         if is_vote_entry_complete(existing_entry):
             continue
         
-        titre = scrutin.get('titre', '')
-        date = scrutin.get('dateScrutin', '')
-        sort = scrutin.get('sort', {}).get('code', '')
-        uid = scrutin.get('uid', '')
+        titre = scrutin.titre
+        date = scrutin.date
+        sort = scrutin.sort
+        uid = scrutin.uid
         subject = extract_subject(scrutin)
         source_url = build_scrutin_source_url(scrutin)
         
@@ -1202,38 +2168,10 @@ def process_scrutins_with_bge(use_bge: bool = True) -> Dict:
         # Synonymes
         synonyms = get_synonyms(keywords)
         
-        # Enrichissement BGE-M3 (si disponible)
-        if embedder is not None and candidate_embeddings is not None:
-            try:
-                # Encodage du titre
-                output = embedder.encode([titre])
-                titre_vec = output['dense_vecs'][0]
-                
-                # Similarité Cosine (produit scalaire si normalisé, ici simple dot product)
-                # Note: BGE-M3 dense vecs ne sont pas toujours normalisés, mais pour ranking ça suffit
-                scores = np.dot(candidate_embeddings, titre_vec)
-                
-                # Prendre les 3 meilleurs
-                top_k_indices = np.argsort(scores)[-3:][::-1]
-                
-                for idx in top_k_indices:
-                    score = scores[idx]
-                    term = candidate_terms[idx]
-                    
-                    # Seuil arbitraire de pertinence (à ajuster)
-                    if score > 0.4:
-                        # Éviter les doublons
-                        if term not in keywords and term not in synonyms:
-                            synonyms.append(term)
-            except Exception as e:
-                # En cas d'erreur ponctuelle, on continue sans planter
-                pass
-        
-        # Ajouter au dictionnaire
-        votes[numero] = {
+        pending.append((numero, keywords, synonyms, {
             "uid": uid,
             "titre": titre,
-            "keywords": keywords + synonyms,
+            "keywords": [],
             "category": category,
             "theme": category,
             "summary": summary,
@@ -1241,33 +2179,61 @@ def process_scrutins_with_bge(use_bge: bool = True) -> Dict:
             "source_url": source_url,
             "date": date,
             "sort": sort
-        }
-        
-        # Index inversé
+        }))
+
+    # 2. Enrichissement BGE-M3 (si disponible) : un seul passage par lots
+    if embedder is not None and candidate_embeddings is not None and pending:
+        enriched_terms = enrich_titles_with_bge(
+            embedder,
+            [entry["titre"] for _numero, _keywords, _synonyms, entry in pending],
+            candidate_terms,
+            candidate_embeddings
+        )
+        for (_numero, keywords, synonyms, _entry), terms in zip(pending, enriched_terms):
+            for term in terms:
+                # Éviter les doublons
+                if term not in keywords and term not in synonyms:
+                    synonyms.append(term)
+
+    # 3. Ajout au dictionnaire et à l'index inversé
+    for numero, keywords, synonyms, entry in pending:
+        entry["keywords"] = keywords + synonyms
+        votes[numero] = entry
         for kw in keywords + synonyms:
             inverted_index[kw.lower()].add(numero)
-        
-        new_count += 1
-    
+
+    new_count = len(pending)
     print(f"✅ {new_count} nouveaux scrutins indexés")
     print(f"📊 Total: {len(votes)} scrutins dans l'index")
 
     # Superposer le chainage dossiers (law_title, dossier_id) sur toutes les entrees.
     apply_dossier_enrichment(votes)
 
-    # Convertir les sets en listes pour JSON
-    inverted_index_json = {k: list(v) for k, v in inverted_index.items()}
+    # Convertir les sets en listes pour JSON ; scrutins, mots-cles et numeros
+    # tries pour que le diff nocturne ne reflete que les changements reels.
+    votes = dict(sorted(votes.items(), key=lambda item: int(item[0])))
+    inverted_index_json = {k: sorted(inverted_index[k], key=int) for k in sorted(inverted_index)}
+    lexical_delta = build_lexical_delta(previous_lexical_sha256, previous_votes, votes)
+    print(
+        f"🧮 Ecart lexical: {len(lexical_delta['added'])} ajoutes, "
+        f"{len(lexical_delta['changed'])} a re-indexer, {len(lexical_delta['updated'])} modifies"
+    )
+    # Aucun scrutin ajoute, modifie ou retire : la date est conservee, l'index
+    # serialise reste identique et n'est pas reecrit.
+    unchanged = existing_index.get("lastUpdate") and not (
+        lexical_delta["added"] or lexical_delta["updated"] or lexical_delta["removed"]
+    )
     
     return {
         "schemaVersion": INDEX_SCHEMA_VERSION,
         "votes": votes,
         "inverted_index": inverted_index_json,
-        "lastUpdate": __import__('datetime').datetime.now().isoformat()[:10],
+        "lastUpdate": existing_index["lastUpdate"] if unchanged else __import__('datetime').datetime.now().isoformat()[:10],
         "stats": {
             "totalVotes": len(votes),
             "totalKeywords": len(inverted_index_json)
         }
-    }
+    }, lexical_delta
 
 
 def main():
@@ -1278,11 +2244,28 @@ def main():
     parser.add_argument('--no-bge', action='store_true', help="Désactiver BGE-M3")
     parser.add_argument('--no-semantic', action='store_true', help="Desactiver l'artefact semantique")
     parser.add_argument('--test', action='store_true', help="Mode test (10 scrutins)")
+    parser.add_argument(
+        '--semantic-workers',
+        type=int,
+        default=1,
+        help="Processus d'encodage E5 sur CPU (defaut 1 ; cf. scripts/benchmark_semantic_encoding.py)"
+    )
+    parser.add_argument(
+        '--semantic-backend',
+        choices=SEMANTIC_ENCODER_BACKENDS,
+        default="torch",
+        help="Backend d'inference E5 local : torch (defaut), onnx, onnx-int8 (ONNX Runtime CPU)"
+    )
     parser.add_argument(
         '--no-legacy-mirror',
         action='store_true',
         help="Ne pas ecrire le miroir legacy public/data/search_index.json"
     )
+    parser.add_argument(
+        '--no-semantic-binary',
+        action='store_true',
+        help="Ne pas generer les codes binaires (1 bit/composante) des index semantiques"
+    )
     parser.add_argument(
         '--no-remote-semantic',
         action='store_true',
@@ -1300,6 +2283,18 @@ def main():
         default=10.0,
         help="Budget temps en minutes pour l'index distant (defaut 10)"
     )
+    parser.add_argument(
+        '--remote-concurrency',
+        type=int,
+        default=REMOTE_EMBEDDING_CONCURRENCY,
+        help=f"Lots d'embeddings distants en vol simultanement (defaut {REMOTE_EMBEDDING_CONCURRENCY}, debit borne par le RPM)"
+    )
+    parser.add_argument(
+        '--remote-rpm',
+        type=int,
+        default=REMOTE_EMBEDDING_RPM,
+        help=f"Requetes par minute vers l'API d'embeddings distante (defaut {REMOTE_EMBEDDING_RPM})"
+    )
     parser.add_argument(
         '--remote-dry-run',
         action='store_true',
@@ -1307,17 +2302,18 @@ def main():
     )
     args = parser.parse_args()
     
-    # Vérifier que le dossier existe
-    if not os.path.exists(DOSSIER_SCRUTINS):
-        print(f"❌ Dossier {DOSSIER_SCRUTINS} introuvable")
+    # Vérifier que l'archive (ou le dossier extrait) existe
+    if not scrutins_available():
+        print(f"❌ Ni {ARCHIVE_SCRUTINS} ni {DOSSIER_SCRUTINS} introuvables")
         print("   Exécutez d'abord le téléchargement des scrutins")
         return
     
     # Générer l'index
-    index = process_scrutins_with_bge(use_bge=not args.no_bge)
+    index, lexical_delta = process_scrutins_with_bge(use_bge=not args.no_bge)
 
     semantic_index = None
     semantic_multivector_index = None
+    semantic_remote_index = None
     if args.no_semantic:
         print("ℹ️ Artefact semantique desactive pour cette execution")
     else:
@@ -1325,15 +2321,18 @@ def main():
         # indisponible ou que la generation est incomplete, on NE plante PAS le
         # pipeline. Les index semantiques de la veille (deja commites) sont
         # conserves tels quels et le reste de la mise a jour continue.
-        semantic_encoder = load_semantic_encoder()
+        semantic_encoder = load_semantic_encoder(backend=args.semantic_backend)
         if semantic_encoder is None:
             print(
                 "⚠️ Encodeur semantique multilingual-e5-small indisponible : "
                 "artefacts semantiques NON regeneres, conservation des index existants."
             )
         else:
-            semantic_index = generate_semantic_index(index, model=semantic_encoder)
-            semantic_multivector_index = generate_semantic_multivector_index(index, model=semantic_encoder)
+            semantic_index, semantic_multivector_index = generate_semantic_artifacts(
+                index,
+                model=semantic_encoder,
+                workers=args.semantic_workers
+            )
             if semantic_index is None or semantic_multivector_index is None:
                 print(
                     "⚠️ Generation incomplete des artefacts semantiques E5 : "
@@ -1346,6 +2345,10 @@ def main():
                 print(f"💾 Index semantique RAG sauvegarde dans {FICHIER_SEMANTIC_INDEX}")
                 write_json(FICHIER_SEMANTIC_MULTIVECTOR_INDEX, semantic_multivector_index)
                 print(f"💾 Index semantique multi-vector sauvegarde dans {FICHIER_SEMANTIC_MULTIVECTOR_INDEX}")
+                write_packed_semantic_index(FICHIER_SEMANTIC_INDEX_PACKED, semantic_index)
+                write_packed_semantic_index(FICHIER_SEMANTIC_MULTIVECTOR_INDEX_PACKED, semantic_multivector_index)
+                print("💾 Index semantiques packes (int8 binaire) sauvegardes")
+                write_semantic_search_indexes(binary=not args.no_semantic_binary)
 
     # Index semantique distant (Nemotron via API OpenAI-compatible) : optionnel,
     # incremental et strictement non bloquant. L'index e5 ci-dessus reste la
@@ -1359,32 +2362,81 @@ def main():
                 max_calls=args.remote_max_calls,
                 time_budget_min=args.remote_time_budget_min,
                 dry_run=args.remote_dry_run,
+                concurrency=args.remote_concurrency,
+                rpm=args.remote_rpm,
             )
             if remote_payload is not None and remote_changed:
                 write_json(FICHIER_SEMANTIC_REMOTE_INDEX, remote_payload, compact=True)
+                semantic_remote_index = remote_payload
                 print(f"💾 Index semantique distant sauvegarde dans {FICHIER_SEMANTIC_REMOTE_INDEX}")
             elif remote_payload is not None:
                 print("ℹ️ Index semantique distant inchange (aucune reecriture, zero churn git)")
         except Exception as error:
             print(f"⚠️ Generation de l'index semantique distant echouee ({error}) : artefact precedent conserve")
 
-    # Sauvegarder l'artefact RAG primaire puis le manifest public.
-    write_json(FICHIER_LEXICAL_INDEX, index)
-    write_json(FICHIER_RAG_MANIFEST, build_rag_manifest(index))
+    # Sauvegarder l'artefact RAG primaire puis le manifest public. Une seule
+    # serialisation pour l'index et son miroir legacy, ecrits s'ils changent.
+    lexical_data = json_backend.dumps(index)
+    if write_bytes_if_changed(FICHIER_LEXICAL_INDEX, lexical_data, lexical_delta["previousSha256"]):
+        print(f"💾 Index lexical RAG sauvegarde dans {FICHIER_LEXICAL_INDEX}")
+    else:
+        print(f"ℹ️ Index lexical RAG inchange ({FICHIER_LEXICAL_INDEX} non reecrit)")
+    lexical_sha256 = WRITTEN_SHA256[os.path.normpath(FICHIER_LEXICAL_INDEX)]
+    bm25 = None
+    try:
+        # Mise a jour depuis l'index BM25 precedent : seuls les scrutins de l'ecart sont tokenises.
+        bm25 = build_incremental_bm25_index(FICHIER_LEXICAL_BM25, index["votes"], lexical_delta)
+        bm25_header = write_bm25_index(FICHIER_LEXICAL_BM25, FICHIER_LEXICAL_INDEX, index, bm25=bm25, lexical_sha256=lexical_sha256)
+        update = bm25["update"]
+        print(
+            f"💾 Index BM25 sauvegarde dans {FICHIER_LEXICAL_BM25} "
+            f"({bm25_header['vocabularySize']} termes, {bm25_header['postingsCount']} postings, "
+            f"generation {bm25_header['generation']}, "
+            + (f"{update['added']} ajoutes et {update['changed']} re-indexes)" if update else "reconstruction complete)")
+        )
+    except Exception as error:
+        print(f"⚠️ Index BM25 non genere ({error})")
+    try:
+        shards_listing = write_lexical_shards(
+            DOSSIER_LEXICAL_SHARDS, FICHIER_LEXICAL_INDEX, index, bm25=bm25, delta=lexical_delta, lexical_sha256=lexical_sha256
+        )
+        print(
+            f"💾 Fragments lexicaux sauvegardes dans {DOSSIER_LEXICAL_SHARDS} "
+            f"({len(shards_listing['segments'])} segment(s), {len(shards_listing['documentShards'])} fragments de metadonnees, "
+            f"generation {shards_listing['generation']}, {len(shards_listing['written'])} fichier(s) reecrit(s))"
+        )
+    except Exception as error:
+        print(f"⚠️ Fragments lexicaux non generes ({error})")
+    write_json(FICHIER_RAG_MANIFEST, build_rag_manifest(
+        index,
+        semantic_payload=semantic_index,
+        semantic_multivector_payload=semantic_multivector_index,
+        semantic_remote_payload=semantic_remote_index,
+    ))
 
-    print(f"💾 Index lexical RAG sauvegarde dans {FICHIER_LEXICAL_INDEX}")
     print(f"💾 Manifest RAG sauvegarde dans {FICHIER_RAG_MANIFEST}")
 
     if args.no_legacy_mirror:
         print("ℹ️ Miroir legacy public/data/search_index.json desactive pour cette execution")
     else:
-        write_json(FICHIER_LEGACY_SEARCH_INDEX, index)
-        print(f"💾 Miroir legacy sauvegarde dans {FICHIER_LEGACY_SEARCH_INDEX}")
+        if write_bytes_if_changed(FICHIER_LEGACY_SEARCH_INDEX, lexical_data):
+            print(f"💾 Miroir legacy sauvegarde dans {FICHIER_LEGACY_SEARCH_INDEX}")
+        else:
+            print(f"ℹ️ Miroir legacy inchange ({FICHIER_LEGACY_SEARCH_INDEX} non reecrit)")
 
     # Stats
     lexical_size_kb = os.path.getsize(FICHIER_LEXICAL_INDEX) / 1024
     print(f"📏 Taille index lexical RAG: {lexical_size_kb:.1f} Ko")
 
+    bm25_data_path = os.path.splitext(FICHIER_LEXICAL_BM25)[0] + ".pst"
+    if os.path.exists(FICHIER_LEXICAL_BM25) and os.path.exists(bm25_data_path):
+        bm25_size_kb = (os.path.getsize(FICHIER_LEXICAL_BM25) + os.path.getsize(bm25_data_path)) / 1024
+        print(f"📏 Taille index BM25: {bm25_size_kb:.1f} Ko")
+
+    if os.path.isdir(DOSSIER_LEXICAL_SHARDS):
+        shard_sizes = [entry.stat().st_size for entry in os.scandir(DOSSIER_LEXICAL_SHARDS) if entry.is_file()]
+        print(f"📏 Fragments lexicaux: {len(shard_sizes)} fichiers, {sum(shard_sizes) / 1024:.1f} Ko")
+
     if semantic_index and os.path.exists(FICHIER_SEMANTIC_INDEX):
         semantic_size_kb = os.path.getsize(FICHIER_SEMANTIC_INDEX) / 1024
         print(f"📏 Taille index semantique RAG: {semantic_size_kb:.1f} Ko")
@@ -1393,6 +2445,23 @@ def main():
         semantic_multivector_size_kb = os.path.getsize(FICHIER_SEMANTIC_MULTIVECTOR_INDEX) / 1024
         print(f"📏 Taille index semantique multi-vector: {semantic_multivector_size_kb:.1f} Ko")
 
+    for packed_header_path in (FICHIER_SEMANTIC_INDEX_PACKED, FICHIER_SEMANTIC_MULTIVECTOR_INDEX_PACKED):
+        packed_data_path = get_packed_data_path(packed_header_path)
+        if os.path.exists(packed_header_path) and os.path.exists(packed_data_path):
+            packed_size_kb = (os.path.getsize(packed_header_path) + os.path.getsize(packed_data_path)) / 1024
+            print(f"📏 Taille index packe {os.path.basename(packed_data_path)}: {packed_size_kb:.1f} Ko")
+
+    for search_header_path, search_extension in (
+        (FICHIER_SEMANTIC_INDEX_IVF, ".ivf"),
+        (FICHIER_SEMANTIC_MULTIVECTOR_INDEX_IVF, ".ivf"),
+        (FICHIER_SEMANTIC_INDEX_BINARY, ".b1"),
+        (FICHIER_SEMANTIC_MULTIVECTOR_INDEX_BINARY, ".b1"),
+    ):
+        search_data_path = os.path.splitext(search_header_path)[0] + search_extension
+        if os.path.exists(search_header_path) and os.path.exists(search_data_path):
+            search_size_kb = (os.path.getsize(search_header_path) + os.path.getsize(search_data_path)) / 1024
+            print(f"📏 Taille {os.path.basename(search_data_path)}: {search_size_kb:.1f} Ko")
+
     if os.path.exists(FICHIER_SEMANTIC_REMOTE_INDEX):
         semantic_remote_size_kb = os.path.getsize(FICHIER_SEMANTIC_REMOTE_INDEX) / 1024
         print(f"📏 Taille index semantique distant: {semantic_remote_size_kb:.1f} Ko")
@@ -0,0 +1,98 @@
+"""Serialisation JSON du pipeline : orjson si disponible, json (stdlib) sinon.
+
+Les artefacts publies doivent rester identiques octet pour octet quel que
+soit le backend : dumps() ne confie a orjson que les charges qu'il ecrit
+exactement comme json.dumps(..., ensure_ascii=False) et retombe sur la
+stdlib pour le reste (flottants en notation exponentielle ou non finis,
+cles non textuelles, indentation autre que 2, entiers hors 64 bits...).
+loads() retombe de meme sur la stdlib en cas d'echec, ce qui conserve les
+messages et types d'erreur historiques (json.JSONDecodeError).
+
+JSON_BACKEND=json force la stdlib (comparaison, debogage).
+"""
+
+import json
+import math
+import os
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if os.environ.get("JSON_BACKEND", "").strip().lower() == "json":
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+_SCALAR_TYPES = frozenset((str, int, bool, type(None)))
+
+
+def _float_is_portable(value: float) -> bool:
+    """orjson et json ecrivent ce flottant de la meme facon (pas d'exposant)."""
+    return math.isfinite(value) and "e" not in repr(value)
+
+
+def _values_are_portable(values) -> bool:
+    values = values if isinstance(values, (list, tuple)) else list(values)
+    # issuperset(map(type, ...)) reste en C : les longues listes d'entiers
+    # (vecteurs quantifies, paires de votes) sont validees sans boucle Python.
+    if _SCALAR_TYPES.issuperset(map(type, values)):
+        return True
+    return all(_is_portable(value) for value in values)
+
+
+def _is_portable(value: Any) -> bool:
+    kind = type(value)
+    if kind in _SCALAR_TYPES:
+        return True
+    if kind is float:
+        return _float_is_portable(value)
+    if kind is dict:
+        return all(type(key) is str for key in value) and _values_are_portable(value.values())
+    if kind is list or kind is tuple:
+        return _values_are_portable(value)
+    return False
+
+
+def loads(data: bytes | str) -> Any:
+    """Decode un document JSON (bytes UTF-8 ou str).
+
+    Seule difference connue avec json.loads : orjson lit les entiers au-dela
+    de 64 bits comme des flottants. Les sources du pipeline n'en contiennent
+    pas (l'open data AN met ses nombres entre guillemets) ; un controle
+    prealable coutait autant que le decodage lui-meme.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode("utf-8")
+    return json.loads(data)
+
+
+def load_path(path: str) -> Any:
+    """Lit et decode un fichier JSON UTF-8."""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def dumps(payload: Any, compact: bool = False, indent: int = 2) -> bytes:
+    """Encode en UTF-8 comme json.dumps(ensure_ascii=False).
+
+    compact=True : separateurs (',', ':') ; sinon indentation `indent`.
+    """
+    if orjson is not None and (compact or indent == 2) and _is_portable(payload):
+        try:
+            return orjson.dumps(payload, option=0 if compact else orjson.OPT_INDENT_2)
+        except (TypeError, orjson.JSONEncodeError):
+            pass
+
+    if compact:
+        text = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    else:
+        text = json.dumps(payload, ensure_ascii=False, indent=indent)
+    return text.encode("utf-8")
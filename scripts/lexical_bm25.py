@@ -0,0 +1,916 @@
+# -*- coding: utf-8 -*-
+"""Index plein texte BM25 precalcule sur les scrutins de l'index lexical.
+
+L'index lexical historique (lexical_index.json) ne porte qu'une table
+{mot-cle: [numero, ...]} sans frequences ni longueurs : le client doit tout
+re-tokeniser au chargement pour pouvoir classer. Cet artefact fournit
+directement les statistiques BM25 : vocabulaire trie (recherche par
+dichotomie), IDF precalcule, longueurs de documents et listes de postings
+positionnelles triees par ordinal de document, compressees par
+differences + varint.
+
+Analyseur (a reproduire cote client, decrit dans l'entete) : minuscules,
+accents et ligatures replies (é -> e, œ -> oe), mots \w+ d'au moins 2
+caracteres hors mots vides, racinisation legere du francais
+(stem_french_light). Chaque mot, vide ou non, occupe une position ; les
+champs sont separes de LEXICAL_FIELD_POSITION_GAP positions, de sorte qu'une
+requete de phrase (search_phrase) ne chevauche jamais deux champs.
+
+Les documents sont numerotes par ordinal stable : a la premiere
+construction, ordre numerique des numeros de scrutin ; ensuite, un scrutin
+garde son ordinal et les nouveaux sont ajoutes a la suite
+(update_bm25_index), de sorte que leurs postings s'ajoutent en fin de liste
+sans toucher au reste. Artefact : un entete JSON (lexical_bm25.json :
+parametres, analyseur, vocabulaire, IDF, sections, generation) et un binaire
+.pst contenant, a la suite, des entiers varint (LEB128 non signe) :
+    documents        numeros de scrutin par ordinal, difference au precedent
+                     en zigzag (un numero ajoute tardivement peut etre
+                     inferieur a son predecesseur)
+    documentLengths  nombre de termes par document
+    postingsLengths  octets de postings par terme (ordre du vocabulaire)
+    postings         par terme, paires (ecart d'ordinal, tf)
+    positionsLengths octets de positions par terme
+    positions        par terme et par document de ses postings, les tf
+                     positions (premiere absolue, suivantes par ecart)
+
+Les positions, lues par les seules requetes de phrase, sont separees des
+postings pour ne rien couter au classement BM25.
+
+La generation de l'entete n'augmente que si le contenu indexe change : le
+client sait ainsi s'il doit recharger l'artefact.
+
+Usage (benchmark sur un jeu de requetes fixe, contre la re-tokenisation
+complete qu'impose l'index historique) :
+    python scripts/lexical_bm25.py public/data/rag/lexical_index.json
+"""
+
+import argparse
+import bisect
+import hashlib
+import math
+import os
+import re
+import time
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+import json_backend
+
+LEXICAL_BM25_SCHEMA_VERSION = 3
+LEXICAL_BM25_FORMAT = "bm25-positional-delta-varint"
+LEXICAL_BM25_DATA_EXTENSION = ".pst"
+# Parametres BM25 usuels (Robertson / Lucene).
+BM25_K1 = 1.2
+BM25_B = 0.75
+IDF_DECIMALS = 4
+LEXICAL_BM25_EVAL_K = 10
+# Champs indexes ; les mots-cles (et synonymes) y sont ajoutes tels quels.
+LEXICAL_BM25_FIELDS = ("titre", "subject", "summary", "law_title")
+LEXICAL_TOKEN_PATTERN = r"\w+"
+LEXICAL_MIN_TOKEN_LENGTH = 2
+LEXICAL_FIELD_POSITION_GAP = 100
+LEXICAL_STEMMER = "french-light-1"
+LEXICAL_LIGATURES = {"œ": "oe", "æ": "ae"}
+LEXICAL_BM25_SECTIONS = ("documents", "documentLengths", "postingsLengths", "postings", "positionsLengths", "positions")
+# Octets de continuation d'un varint (bit de poids fort a 1).
+_CONTINUATION_BYTES = bytes(range(0x80, 0x100))
+
+# Mots vides francais et termes de procedure presents dans presque tous les titres.
+LEXICAL_STOPWORDS = frozenset({
+    "le", "la", "les", "de", "du", "des", "un", "une", "et", "ou", "à", "au", "aux",
+    "en", "pour", "par", "sur", "dans", "ce", "cette", "ces", "son", "sa", "ses",
+    "qui", "que", "quoi", "dont", "où", "avec", "sans", "sous", "entre", "vers",
+    "chez", "est", "sont", "être", "avoir", "fait", "faire", "après", "avant",
+    "article", "premier", "deuxième", "première", "seconde", "lecture", "projet",
+    "proposition", "loi", "amendement", "texte", "commission", "mixte", "paritaire",
+    "relatif", "relative", "visant", "portant", "modifiant", "application", "alinéa"
+})
+
+# Jeu de requetes fixe du benchmark (questions types du chat).
+LEXICAL_BENCHMARK_QUERIES = (
+    "logement social loyers",
+    "immigration asile",
+    "retraite age de depart",
+    "réforme des retraites",
+    "budget de la sécurité sociale",
+    "assurance chômage",
+    "énergie nucléaire",
+    "police municipale",
+    "agriculture pesticides",
+    "fin de vie aide à mourir",
+    "intelligence artificielle",
+    "Nouvelle-Calédonie",
+    "motion de censure",
+    "taxe sur les superprofits",
+    "hôpital médecins",
+    "école enseignement",
+)
+
+
+def fold_accents(text: str) -> str:
+    """Minuscules sans diacritiques ni ligatures (« Sécurité » -> « securite »)."""
+    text = str(text or "").lower()
+    for ligature, replacement in LEXICAL_LIGATURES.items():
+        text = text.replace(ligature, replacement)
+    return "".join(char for char in unicodedata.normalize("NFD", text) if not unicodedata.combining(char))
+
+
+FOLDED_STOPWORDS = frozenset(fold_accents(word) for word in LEXICAL_STOPWORDS)
+
+
+def stem_french_light(token: str) -> str:
+    """Racinisation legere d'un terme replie : pluriel, feminin, infinitif en -er.
+
+    Regles appliquees dans l'ordre, chacune seulement si la racine garde au
+    moins 3 caracteres : -aux -> -al, sinon -s / -x final retire ; puis -ee ou
+    -e final retire ; puis -er final retire ; enfin consonne finale doublee
+    simplifiee (sociaux, sociales -> social ; protegees, proteger -> proteg).
+    """
+    if token.endswith("aux") and len(token) > 5:
+        token = token[:-3] + "al"
+    elif token[-1:] in ("s", "x") and len(token) > 3:
+        token = token[:-1]
+
+    if token.endswith("ee") and len(token) > 4:
+        token = token[:-2]
+    elif token.endswith("e") and len(token) > 3:
+        token = token[:-1]
+
+    if token.endswith("er") and len(token) > 4:
+        token = token[:-2]
+
+    if len(token) > 3 and token[-1] == token[-2] and token[-1].isalpha() and token[-1] not in "aeiouy":
+        token = token[:-1]
+    return token
+
+
+def analyze_lexical_text(text: str, start: int = 0) -> Tuple[List[Tuple[str, int]], int]:
+    """(terme, position) des mots d'un texte, et position suivant le dernier mot.
+
+    Les mots vides et trop courts consomment leur position sans etre indexes.
+    """
+    tokens = re.findall(LEXICAL_TOKEN_PATTERN, fold_accents(text))
+    terms = [
+        (stem_french_light(token), start + offset)
+        for offset, token in enumerate(tokens)
+        if len(token) >= LEXICAL_MIN_TOKEN_LENGTH and token not in FOLDED_STOPWORDS
+    ]
+    return terms, start + len(tokens)
+
+
+def tokenize_lexical_text(text: str) -> List[str]:
+    """Termes indexes d'un texte (requete ou champ), dans l'ordre."""
+    return [term for term, _position in analyze_lexical_text(text)[0]]
+
+
+def build_lexical_document_postings(entry: Dict) -> List[Tuple[str, int]]:
+    """(terme, position) d'un scrutin : champs textuels puis chaque mot-cle, separes d'un ecart."""
+    segments = [entry.get(field) for field in LEXICAL_BM25_FIELDS] + list(entry.get("keywords") or [])
+    postings = []
+    position = 0
+    for segment in segments:
+        terms, position = analyze_lexical_text(segment, position)
+        postings.extend(terms)
+        position += LEXICAL_FIELD_POSITION_GAP
+    return postings
+
+
+def build_lexical_document_terms(entry: Dict) -> List[str]:
+    """Termes indexes d'un scrutin : champs textuels puis mots-cles."""
+    return [term for term, _position in build_lexical_document_postings(entry)]
+
+
+def encode_varints(values: Iterable[int]) -> bytes:
+    """Entiers positifs en LEB128 non signe (7 bits par octet, bit de poids fort = suite)."""
+    encoded = bytearray()
+    for value in values:
+        if value < 0:
+            raise ValueError(f"Entier negatif non encodable en varint : {value}")
+        while value >= 0x80:
+            encoded.append((value & 0x7F) | 0x80)
+            value >>= 7
+        encoded.append(value)
+    return bytes(encoded)
+
+
+def decode_varints(data: bytes, start: int = 0, end: int | None = None) -> List[int]:
+    values = []
+    value = 0
+    shift = 0
+    for byte in memoryview(data)[start:len(data) if end is None else end]:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = 0
+            shift = 0
+    return values
+
+
+def compute_idf(document_frequency: int, document_count: int) -> float:
+    """IDF BM25 lisse (variante Lucene, toujours positive)."""
+    return round(
+        math.log(1 + (document_count - document_frequency + 0.5) / (document_frequency + 0.5)),
+        IDF_DECIMALS
+    )
+
+
+def order_documents(numeros: Iterable[str]) -> List[str]:
+    """Ordinaux des documents : numeros de scrutin par ordre numerique."""
+    numeros = list(numeros)
+    invalid = [numero for numero in numeros if not str(numero).isdigit()]
+    if invalid:
+        raise ValueError(f"Numeros de scrutin non numeriques : {invalid[:5]}")
+    return sorted(numeros, key=int)
+
+
+def group_term_positions(postings: List[Tuple[str, int]]) -> Dict[str, List[int]]:
+    """{terme: positions croissantes} d'un document."""
+    positions_by_term: Dict[str, List[int]] = {}
+    for term, position in postings:
+        positions_by_term.setdefault(term, []).append(position)
+    return {term: sorted(positions) for term, positions in positions_by_term.items()}
+
+
+def encode_postings(postings: List[Tuple[int, List[int]]], previous: int = 0) -> Tuple[bytes, bytes]:
+    """Blocs (postings, positions) d'un terme ; `previous` : dernier ordinal deja encode."""
+    values = []
+    position_values = []
+    for ordinal, positions in postings:
+        values.append(ordinal - previous)
+        values.append(len(positions))
+        position_values.extend(position - earlier for position, earlier in zip(positions, [0] + positions[:-1]))
+        previous = ordinal
+    return encode_varints(values), encode_varints(position_values)
+
+
+def decode_postings_block(postings: bytes, positions: bytes) -> List[Tuple[int, List[int]]]:
+    """Inverse d'encode_postings : [(ordinal, positions)]."""
+    values = decode_varints(postings)
+    gaps = decode_varints(positions)
+    decoded = []
+    ordinal = 0
+    index = 0
+    for value_index in range(0, len(values), 2):
+        ordinal += values[value_index]
+        document_positions = []
+        current = 0
+        for gap in gaps[index:index + values[value_index + 1]]:
+            current += gap
+            document_positions.append(current)
+        index += values[value_index + 1]
+        decoded.append((ordinal, document_positions))
+    return decoded
+
+
+def count_postings(postings: bytes) -> int:
+    """Frequence documentaire d'un bloc de postings : deux varints par document."""
+    return len(postings.translate(None, _CONTINUATION_BYTES)) // 2
+
+
+def build_bm25_index(document_postings: Dict[str, List[Tuple[str, int]]]) -> Dict:
+    """Index BM25 encode d'un corpus {numero: [(terme, position)]}.
+
+    {documents, lengths, vocabulary, documentFrequencies, postings, positions} :
+    un bloc de postings et un bloc de positions par terme du vocabulaire trie.
+    """
+    documents = order_documents(document_postings)
+    postings: Dict[str, List[Tuple[int, List[int]]]] = {}
+    lengths = []
+    for ordinal, numero in enumerate(documents):
+        lengths.append(len(document_postings[numero]))
+        for term, positions in group_term_positions(document_postings[numero]).items():
+            postings.setdefault(term, []).append((ordinal, positions))
+
+    vocabulary = sorted(postings)
+    # Ordinaux croissants par construction (documents parcourus dans l'ordre).
+    blocks = [encode_postings(postings[term]) for term in vocabulary]
+    return {
+        "documents": documents,
+        "lengths": lengths,
+        "vocabulary": vocabulary,
+        "documentFrequencies": [len(postings[term]) for term in vocabulary],
+        "postings": [block for block, _positions in blocks],
+        "positions": [positions for _block, positions in blocks],
+    }
+
+
+def collect_term_changes(
+    ordinals: Dict[str, int],
+    document_postings: Dict[str, List[Tuple[str, int]]],
+    previous_postings: Dict[str, List[Tuple[str, int]]] | None = None,
+) -> Dict[str, Dict[int, List[int] | None]]:
+    """Modifications par terme {terme: {ordinal: positions, ou None pour retirer}}.
+
+    Les anciens termes des documents de `previous_postings` sont retires, puis
+    les termes de `document_postings` (re)poses.
+    """
+    changes: Dict[str, Dict[int, List[int] | None]] = {}
+    for numero, postings in (previous_postings or {}).items():
+        for term in group_term_positions(postings):
+            changes.setdefault(term, {})[ordinals[numero]] = None
+    for numero, postings in document_postings.items():
+        for term, positions in group_term_positions(postings).items():
+            changes.setdefault(term, {})[ordinals[numero]] = positions
+    return changes
+
+
+def merge_term_postings(terms: Dict, changes: Dict[str, Dict[int, List[int] | None]]) -> Dict:
+    """Blocs {vocabulary, documentFrequencies, postings, positions} apres `changes`.
+
+    Un terme qui ne recoit que des ordinaux posterieurs a son dernier voit ses
+    blocs prolonges (seuls ses ecarts sont decodes pour retrouver ce dernier
+    ordinal) ; un terme qui perd ou remplace un document est decode puis
+    re-encode. Les autres blocs sont repris tels quels, les termes vides retires.
+    """
+    positions_in_vocabulary = {term: position for position, term in enumerate(terms["vocabulary"])}
+    merged = {"vocabulary": [], "documentFrequencies": [], "postings": [], "positions": []}
+    for term in sorted(positions_in_vocabulary.keys() | changes.keys()):
+        position = positions_in_vocabulary.get(term)
+        if position is None:
+            block = (b"", b"")
+            frequency = 0
+        else:
+            block = (terms["postings"][position], terms["positions"][position])
+            frequency = terms["documentFrequencies"][position]
+
+        term_changes = changes.get(term)
+        if term_changes:
+            last_ordinal = sum(decode_varints(block[0])[0::2]) if frequency else -1
+            if all(positions is not None and ordinal > last_ordinal for ordinal, positions in term_changes.items()):
+                added = sorted(term_changes.items())
+                postings, positions = encode_postings(added, previous=max(last_ordinal, 0))
+                block = (block[0] + postings, block[1] + positions)
+                frequency += len(added)
+            else:
+                entries = dict(decode_postings_block(*block))
+                for ordinal, positions in term_changes.items():
+                    if positions is None:
+                        entries.pop(ordinal, None)
+                    else:
+                        entries[ordinal] = positions
+                if not entries:
+                    continue
+                block = encode_postings(sorted(entries.items()))
+                frequency = len(entries)
+
+        merged["vocabulary"].append(term)
+        merged["documentFrequencies"].append(frequency)
+        merged["postings"].append(block[0])
+        merged["positions"].append(block[1])
+    return merged
+
+
+def update_bm25_index(
+    bm25: Dict,
+    document_postings: Dict[str, List[Tuple[str, int]]],
+    previous_postings: Dict[str, List[Tuple[str, int]]] | None = None,
+) -> Dict:
+    """Index encode mis a jour, sans re-tokeniser ni re-encoder le reste du corpus.
+
+    `document_postings` : postings des documents nouveaux ou modifies ;
+    `previous_postings` : anciens postings des documents modifies. Un document
+    modifie garde son ordinal ; les nouveaux prennent les ordinaux suivants
+    (par ordre numerique), leurs postings s'ajoutent en fin de bloc.
+    """
+    previous_postings = previous_postings or {}
+    ordinals = {numero: ordinal for ordinal, numero in enumerate(bm25["documents"])}
+    unknown = [numero for numero in previous_postings if numero not in ordinals]
+    if unknown:
+        raise ValueError(f"Documents modifies absents de l'index BM25 : {unknown[:5]}")
+    unexpected = [numero for numero in document_postings if numero in ordinals and numero not in previous_postings]
+    if unexpected:
+        raise ValueError(f"Documents deja indexes sans anciens postings : {unexpected[:5]}")
+
+    documents = list(bm25["documents"])
+    lengths = list(bm25["lengths"])
+    for numero in order_documents(numero for numero in document_postings if numero not in ordinals):
+        ordinals[numero] = len(documents)
+        documents.append(numero)
+        lengths.append(0)
+    for numero, postings in document_postings.items():
+        lengths[ordinals[numero]] = len(postings)
+
+    return {
+        "documents": documents,
+        "lengths": lengths,
+        **merge_term_postings(bm25, collect_term_changes(ordinals, document_postings, previous_postings)),
+    }
+
+
+def compute_bm25_idf(bm25: Dict) -> List[float]:
+    return [compute_idf(frequency, len(bm25["documents"])) for frequency in bm25["documentFrequencies"]]
+
+
+def encode_zigzag(value: int) -> int:
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def decode_zigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+def encode_document_sections(bm25: Dict) -> Dict[str, bytes]:
+    """Sections documents (numeros par difference zigzag) et documentLengths."""
+    numeros = [int(numero) for numero in bm25["documents"]]
+    return {
+        "documents": encode_varints(
+            encode_zigzag(numero - previous) for numero, previous in zip(numeros, [0] + numeros[:-1])
+        ),
+        "documentLengths": encode_varints(bm25["lengths"]),
+    }
+
+
+def layout_sections(sections: Dict[str, bytes], names: Iterable[str]) -> Tuple[bytes, Dict]:
+    """Concatene des sections : (octets, {nom: {offset, bytes}})."""
+    layout = {}
+    offset = 0
+    for name in names:
+        layout[name] = {"offset": offset, "bytes": len(sections[name])}
+        offset += len(sections[name])
+    return b"".join(sections[name] for name in names), layout
+
+
+def decode_document_sections(data: bytes, layout: Dict, params: Dict, average_length: float) -> Tuple[List[str], List[float]]:
+    """(numeros par ordinal, normalisations de longueur k1 * (1 - b + b * dl / avgdl))."""
+    def section(name: str) -> List[int]:
+        return decode_varints(data, layout[name]["offset"], layout[name]["offset"] + layout[name]["bytes"])
+
+    numeros = []
+    previous = 0
+    for delta in section("documents"):
+        previous += decode_zigzag(delta)
+        numeros.append(str(previous))
+
+    k1 = params["k1"]
+    b = params["b"]
+    average_length = average_length or 1.0
+    return numeros, [k1 * (1 - b + b * length / average_length) for length in section("documentLengths")]
+
+
+def encode_bm25_data(bm25: Dict) -> Tuple[bytes, Dict]:
+    """Binaire .pst et position de ses sections ({nom: {offset, bytes}})."""
+    sections = {
+        **encode_document_sections(bm25),
+        "postingsLengths": encode_varints(len(block) for block in bm25["postings"]),
+        "postings": b"".join(bm25["postings"]),
+        "positionsLengths": encode_varints(len(block) for block in bm25["positions"]),
+        "positions": b"".join(bm25["positions"]),
+    }
+    return layout_sections(sections, LEXICAL_BM25_SECTIONS)
+
+
+def get_bm25_data_path(header_path: str) -> str:
+    return os.path.splitext(header_path)[0] + LEXICAL_BM25_DATA_EXTENSION
+
+
+def describe_lexical_analyzer() -> Dict:
+    """Analyseur a reproduire a l'identique cote client sur la requete."""
+    return {
+        "lowercase": True,
+        "foldAccents": True,
+        "ligatures": LEXICAL_LIGATURES,
+        "tokenPattern": LEXICAL_TOKEN_PATTERN,
+        "minLength": LEXICAL_MIN_TOKEN_LENGTH,
+        "stopwords": sorted(FOLDED_STOPWORDS),
+        "stemmer": LEXICAL_STEMMER,
+        "fields": list(LEXICAL_BM25_FIELDS) + ["keywords"],
+        "fieldPositionGap": LEXICAL_FIELD_POSITION_GAP
+    }
+
+
+def build_votes_bm25_index(votes: Dict[str, Dict]) -> Dict:
+    return build_bm25_index({numero: build_lexical_document_postings(entry) for numero, entry in votes.items()})
+
+
+def build_lexical_document_view(entry: Dict) -> Dict:
+    """Contenu indexe d'un scrutin : deux vues egales donnent les memes postings."""
+    view = {field: str(entry.get(field) or "") for field in LEXICAL_BM25_FIELDS}
+    view["keywords"] = list(entry.get("keywords") or [])
+    return view
+
+
+def build_lexical_delta(previous_sha256: str | None, previous_votes: Dict[str, Dict], votes: Dict[str, Dict]) -> Dict:
+    """Ecart entre l'index lexical precedent (empreinte, copies de ses entrees) et les votes courants.
+
+    {previousSha256, added: [numero], changed: {numero: ancienne vue indexee},
+    updated: [numero dont l'entree a change], removed: [numero]}
+    """
+    return {
+        "previousSha256": previous_sha256,
+        "added": [numero for numero in votes if numero not in previous_votes],
+        "changed": {
+            numero: build_lexical_document_view(entry)
+            for numero, entry in previous_votes.items()
+            if numero in votes and build_lexical_document_view(votes[numero]) != build_lexical_document_view(entry)
+        },
+        "updated": [numero for numero, entry in previous_votes.items() if numero in votes and votes[numero] != entry],
+        "removed": [numero for numero in previous_votes if numero not in votes],
+    }
+
+
+def next_generation(previous: Dict | None, changed: bool) -> int:
+    """Generation d'un artefact : celle du precedent, plus un si son contenu a change."""
+    generation = int((previous or {}).get("generation") or 0)
+    return generation + 1 if changed or not generation else generation
+
+
+def read_bm25_state(header_path: str) -> Tuple[Dict, Dict]:
+    """Relit un index BM25 sous sa forme encodee (entete, index pour update_bm25_index)."""
+    header = json_backend.load_path(header_path)
+    with open(os.path.join(os.path.dirname(header_path), header["dataPath"]), "rb") as f:
+        data = f.read()
+    if hashlib.sha256(data).hexdigest() != header.get("dataSha256"):
+        raise ValueError(f"Index BM25 corrompu ({header_path}) : empreinte differente")
+
+    def blocks(name: str) -> List[bytes]:
+        offset = header["sections"][name]["offset"]
+        lengths_layout = header["sections"][name + "Lengths"]
+        sliced = []
+        for length in decode_varints(data, lengths_layout["offset"], lengths_layout["offset"] + lengths_layout["bytes"]):
+            sliced.append(data[offset:offset + length])
+            offset += length
+        return sliced
+
+    numeros, _norms = decode_document_sections(data, header["sections"], header["params"], header["averageDocumentLength"])
+    lengths_layout = header["sections"]["documentLengths"]
+    postings = blocks("postings")
+    return header, {
+        "documents": numeros,
+        "lengths": decode_varints(data, lengths_layout["offset"], lengths_layout["offset"] + lengths_layout["bytes"]),
+        "vocabulary": header["vocabulary"],
+        "documentFrequencies": [count_postings(block) for block in postings],
+        "postings": postings,
+        "positions": blocks("positions"),
+    }
+
+
+def build_incremental_bm25_index(header_path: str, votes: Dict[str, Dict], delta: Dict | None) -> Dict:
+    """Index BM25 encode des votes, mis a jour depuis l'artefact precedent quand c'est sur.
+
+    L'artefact precedent n'est repris que s'il a ete construit sur l'index
+    lexical dont `delta` est l'ecart (lexicalSha256), avec le meme format et
+    le meme analyseur, et qu'aucun scrutin n'a disparu ; sinon reconstruction
+    complete. "update" decrit la mise a jour ({added, changed}), None si
+    reconstruction.
+    """
+    try:
+        if delta is None or delta["removed"]:
+            raise ValueError("ecart indisponible")
+        header, bm25 = read_bm25_state(header_path)
+        if (
+            header.get("schemaVersion") != LEXICAL_BM25_SCHEMA_VERSION
+            or header.get("analyzer") != describe_lexical_analyzer()
+            or header.get("lexicalSha256") != delta["previousSha256"]
+            or len(bm25["documents"]) + len(delta["added"]) != len(votes)
+        ):
+            raise ValueError("artefact precedent incompatible")
+        bm25 = update_bm25_index(
+            bm25,
+            {numero: build_lexical_document_postings(votes[numero]) for numero in [*delta["added"], *delta["changed"]]},
+            {numero: build_lexical_document_postings(view) for numero, view in delta["changed"].items()},
+        )
+    except (OSError, KeyError, ValueError):
+        bm25 = build_votes_bm25_index(votes)
+        bm25["update"] = None
+        return bm25
+    bm25["update"] = {"added": len(delta["added"]), "changed": len(delta["changed"])}
+    return bm25
+
+
+def write_bm25_index(
+    header_path: str,
+    lexical_index_path: str,
+    index: Dict,
+    bm25: Dict | None = None,
+    lexical_sha256: str | None = None,
+) -> Dict:
+    """Ecrit l'index BM25 des votes d'un index lexical. Retourne l'entete ecrit.
+
+    `lexical_index_path` doit deja contenir `index` : son empreinte sert de
+    controle de synchronisation (cf. describe_bm25_artifact). `bm25` : index
+    encode deja calcule (build_incremental_bm25_index), construit sinon. Le
+    binaire n'est reecrit que si son contenu change.
+    """
+    if bm25 is None:
+        bm25 = build_votes_bm25_index(index.get("votes", {}))
+    data, sections = encode_bm25_data(bm25)
+    data_path = get_bm25_data_path(header_path)
+    if lexical_sha256 is None:
+        with open(lexical_index_path, "rb") as f:
+            lexical_sha256 = hashlib.sha256(f.read()).hexdigest()
+
+    previous = None
+    if os.path.exists(header_path):
+        try:
+            previous = json_backend.load_path(header_path)
+        except Exception:
+            previous = None
+
+    data_sha256 = hashlib.sha256(data).hexdigest()
+    unchanged = (
+        previous is not None
+        and previous.get("dataSha256") == data_sha256
+        and previous.get("vocabulary") == bm25["vocabulary"]
+        and os.path.isfile(data_path)
+    )
+    document_count = len(bm25["documents"])
+    header = {
+        "schemaVersion": LEXICAL_BM25_SCHEMA_VERSION,
+        "generatedAt": index.get("lastUpdate"),
+        "format": LEXICAL_BM25_FORMAT,
+        "generation": next_generation(previous, not unchanged),
+        "lexicalPath": os.path.basename(lexical_index_path),
+        "lexicalSha256": lexical_sha256,
+        "params": {"k1": BM25_K1, "b": BM25_B},
+        "analyzer": describe_lexical_analyzer(),
+        "documentCount": document_count,
+        "averageDocumentLength": round(sum(bm25["lengths"]) / max(1, document_count), 4),
+        "vocabularySize": len(bm25["vocabulary"]),
+        "postingsCount": sum(bm25["documentFrequencies"]),
+        "vocabulary": bm25["vocabulary"],
+        "idf": compute_bm25_idf(bm25),
+        "sections": sections,
+        "dataPath": os.path.basename(data_path),
+        "dataBytes": len(data),
+        "dataSha256": data_sha256
+    }
+
+    os.makedirs(os.path.dirname(data_path) or ".", exist_ok=True)
+    if not unchanged:
+        with open(data_path, "wb") as f:
+            f.write(data)
+    with open(header_path, "wb") as f:
+        f.write(json_backend.dumps(header, compact=True))
+    return header
+
+
+def read_bm25_index(header_path: str) -> Tuple[Dict, Dict]:
+    """Relit un index BM25 : (entete, index pret pour score_bm25)."""
+    header = json_backend.load_path(header_path)
+    with open(os.path.join(os.path.dirname(header_path), header["dataPath"]), "rb") as f:
+        data = f.read()
+    if hashlib.sha256(data).hexdigest() != header.get("dataSha256"):
+        raise ValueError(f"Index BM25 corrompu ({header_path}) : empreinte differente")
+
+    def section(name: str) -> List[int]:
+        layout = header["sections"][name]
+        return decode_varints(data, layout["offset"], layout["offset"] + layout["bytes"])
+
+    # Normalisation de longueur precalculee une fois par document.
+    numeros, norms = decode_document_sections(data, header["sections"], header["params"], header["averageDocumentLength"])
+
+    def block_offsets(name: str) -> List[int]:
+        offsets = [header["sections"][name]["offset"]]
+        for length in section(name + "Lengths"):
+            offsets.append(offsets[-1] + length)
+        return offsets
+
+    return header, {
+        "vocabulary": header["vocabulary"],
+        "idf": header["idf"],
+        "k1": header["params"]["k1"],
+        "documents": numeros,
+        "norms": norms,
+        "postingsOffsets": block_offsets("postings"),
+        "positionsOffsets": block_offsets("positions"),
+        "data": data,
+    }
+
+
+def lookup_term(bm25_index: Dict, term: str) -> int | None:
+    """Position du terme dans le vocabulaire trie (dichotomie), None si absent."""
+    vocabulary = bm25_index["vocabulary"]
+    position = bisect.bisect_left(vocabulary, term)
+    if position < len(vocabulary) and vocabulary[position] == term:
+        return position
+    return None
+
+
+def decode_term_postings(bm25_index: Dict, position: int) -> List[Tuple[int, int]]:
+    """Postings d'un terme : [(ordinal, tf)]."""
+    offsets = bm25_index["postingsOffsets"]
+    values = decode_varints(bm25_index["data"], offsets[position], offsets[position + 1])
+    postings = []
+    ordinal = 0
+    for index in range(0, len(values), 2):
+        ordinal += values[index]
+        postings.append((ordinal, values[index + 1]))
+    return postings
+
+
+def decode_term_positions(bm25_index: Dict, position: int) -> Dict[int, List[int]]:
+    """Positions d'un terme par document : {ordinal: positions}."""
+    offsets = bm25_index["positionsOffsets"]
+    gaps = decode_varints(bm25_index["data"], offsets[position], offsets[position + 1])
+    positions_by_document = {}
+    index = 0
+    for ordinal, tf in decode_term_postings(bm25_index, position):
+        positions = []
+        current = 0
+        for gap in gaps[index:index + tf]:
+            current += gap
+            positions.append(current)
+        positions_by_document[ordinal] = positions
+        index += tf
+    return positions_by_document
+
+
+def rank_scores(bm25_index: Dict, scores: Dict[int, float], k: int) -> List[Tuple[str, float]]:
+    """k meilleurs (numero, score) ; a score egal, par numero (les ordinaux ne le suivent pas toujours)."""
+    documents = bm25_index["documents"]
+    best = sorted(scores.items(), key=lambda item: (-item[1], int(documents[item[0]])))[:k]
+    return [(documents[ordinal], round(score, 6)) for ordinal, score in best]
+
+
+def score_bm25(bm25_index: Dict, query: str, k: int = LEXICAL_BM25_EVAL_K) -> List[Tuple[str, float]]:
+    """Scoreur de reference : k meilleurs (numero, score) par score decroissant.
+
+    Seules les listes des termes de la requete sont decodees.
+    """
+    k1 = bm25_index["k1"]
+    norms = bm25_index["norms"]
+    scores: Dict[int, float] = {}
+    for term in dict.fromkeys(tokenize_lexical_text(query)):
+        position = lookup_term(bm25_index, term)
+        if position is None:
+            continue
+        idf = bm25_index["idf"][position]
+        for ordinal, tf in decode_term_postings(bm25_index, position):
+            scores[ordinal] = scores.get(ordinal, 0.0) + idf * tf * (k1 + 1) / (tf + norms[ordinal])
+    return rank_scores(bm25_index, scores, k)
+
+
+def search_phrase(bm25_index: Dict, phrase: str, k: int = LEXICAL_BM25_EVAL_K) -> List[Tuple[str, float]]:
+    """Requete de phrase : documents contenant les termes aux memes ecarts que dans la phrase.
+
+    Les mots vides de la phrase gardent leur place (« fin de vie » exige
+    « fin » deux positions avant « vie »). Classement BM25 des documents retenus.
+    """
+    terms = analyze_lexical_text(phrase)[0]
+    if not terms:
+        return []
+
+    postings = {}
+    for term, _offset in terms:
+        position = lookup_term(bm25_index, term)
+        if position is None:
+            return []
+        if term not in postings:
+            postings[term] = (bm25_index["idf"][position], decode_term_positions(bm25_index, position))
+
+    first_term, first_offset = terms[0]
+    candidates = set(postings[first_term][1])
+    for term in postings:
+        candidates.intersection_update(postings[term][1])
+
+    k1 = bm25_index["k1"]
+    norms = bm25_index["norms"]
+    scores: Dict[int, float] = {}
+    for ordinal in candidates:
+        positions = {term: set(documents[ordinal]) for term, (_idf, documents) in postings.items()}
+        if not any(
+            all(start + offset - first_offset in positions[term] for term, offset in terms[1:])
+            for start in postings[first_term][1][ordinal]
+        ):
+            continue
+        scores[ordinal] = sum(
+            idf * len(documents[ordinal]) * (k1 + 1) / (len(documents[ordinal]) + norms[ordinal])
+            for idf, documents in postings.values()
+        )
+    return rank_scores(bm25_index, scores, k)
+
+
+def describe_bm25_artifact(header_path: str, lexical_index_path: str, lexical_sha256: str | None = None) -> Dict | None:
+    """Projection manifest de l'index BM25, si present et synchrone avec l'index lexical.
+
+    `lexical_sha256` : empreinte de l'index lexical si l'appelant la connait deja.
+    """
+    if not os.path.exists(header_path) or not os.path.exists(lexical_index_path):
+        return None
+
+    try:
+        header = json_backend.load_path(header_path)
+    except Exception:
+        return None
+
+    data_path = os.path.join(os.path.dirname(header_path), header.get("dataPath") or "")
+    if lexical_sha256 is None:
+        with open(lexical_index_path, "rb") as f:
+            lexical_sha256 = hashlib.sha256(f.read()).hexdigest()
+    if header.get("lexicalSha256") != lexical_sha256 or not os.path.isfile(data_path):
+        return None
+
+    with open(header_path, "rb") as f:
+        header_sha256 = hashlib.sha256(f.read()).hexdigest()
+
+    return {
+        "path": os.path.basename(header_path),
+        "bytes": os.path.getsize(header_path),
+        "sha256": header_sha256,
+        "format": header.get("format", LEXICAL_BM25_FORMAT),
+        "generation": header.get("generation"),
+        "dataPath": header.get("dataPath"),
+        "dataBytes": os.path.getsize(data_path),
+        "dataSha256": header.get("dataSha256"),
+        "params": header.get("params"),
+        "stemmer": header.get("analyzer", {}).get("stemmer"),
+        "positional": True,
+        "documentCount": header.get("documentCount"),
+        "vocabularySize": header.get("vocabularySize")
+    }
+
+
+def build_memory_index(votes: Dict[str, Dict]) -> Tuple[Dict[str, Dict[str, int]], Dict[str, int]]:
+    """Ce que doit refaire le client avec l'index historique : tout re-tokeniser au chargement."""
+    postings: Dict[str, Dict[str, int]] = {}
+    lengths = {}
+    for numero, entry in votes.items():
+        terms = build_lexical_document_terms(entry)
+        lengths[numero] = len(terms)
+        for term, tf in Counter(terms).items():
+            postings.setdefault(term, {})[numero] = tf
+    return postings, lengths
+
+
+def score_memory_index(
+    postings: Dict[str, Dict[str, int]],
+    lengths: Dict[str, int],
+    query: str,
+    k: int = LEXICAL_BM25_EVAL_K,
+) -> List[Tuple[str, float]]:
+    """BM25 direct sur l'index re-derive (reference exacte du scoreur)."""
+    document_count = len(lengths)
+    average_length = round(sum(lengths.values()) / max(1, document_count), 4) or 1.0
+    scores: Dict[str, float] = {}
+    for term in dict.fromkeys(tokenize_lexical_text(query)):
+        documents = postings.get(term)
+        if not documents:
+            continue
+        idf = compute_idf(len(documents), document_count)
+        for numero, tf in documents.items():
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[numero] / average_length)
+            scores[numero] = scores.get(numero, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+    best = sorted(scores.items(), key=lambda item: (-item[1], int(item[0])))[:k]
+    return [(numero, round(score, 6)) for numero, score in best]
+
+
+def main():
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Taille et cout de scoring : index BM25 contre index lexical historique")
+    parser.add_argument("lexical_index", help="Index lexical (ex. public/data/rag/lexical_index.json)")
+    parser.add_argument("--k", type=int, default=LEXICAL_BM25_EVAL_K)
+    parser.add_argument("--repeat", type=int, default=20, help="Passes du jeu de requetes")
+    args = parser.parse_args()
+
+    queries = LEXICAL_BENCHMARK_QUERIES
+    with open(args.lexical_index, "rb") as f:
+        lexical_bytes = f.read()
+
+    # Historique : parser tout l'index puis re-tokeniser tous les scrutins.
+    started = time.perf_counter()
+    index = json_backend.loads(lexical_bytes)
+    postings, lengths = build_memory_index(index.get("votes", {}))
+    legacy_load_ms = (time.perf_counter() - started) * 1000
+    # Memes postings au format historique {terme: [numero, ...]} (indente, sans tf).
+    legacy_bytes = len(json_backend.dumps({term: list(documents) for term, documents in postings.items()}))
+    inverted_bytes = len(json_backend.dumps(index.get("inverted_index", {})))
+
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        expected = [score_memory_index(postings, lengths, query, k=args.k) for query in queries]
+    legacy_query_ms = (time.perf_counter() - started) * 1000 / (args.repeat * len(queries))
+
+    with tempfile.TemporaryDirectory() as directory:
+        header_path = os.path.join(directory, "lexical_bm25.json")
+        header = write_bm25_index(header_path, args.lexical_index, index)
+        bm25_bytes = os.path.getsize(header_path) + header["dataBytes"]
+
+        started = time.perf_counter()
+        _header, bm25_index = read_bm25_index(header_path)
+        bm25_load_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        results = [score_bm25(bm25_index, query, k=args.k) for query in queries]
+    bm25_query_ms = (time.perf_counter() - started) * 1000 / (args.repeat * len(queries))
+
+    identical = sum(1 for left, right in zip(results, expected) if left == right)
+    print(f"\n📊 {header['documentCount']} scrutins, {header['vocabularySize']} termes, {header['postingsCount']} postings")
+    print(f"   {len(queries)} requetes x {args.repeat} passes, top-{args.k} identique a la reference : {identical}/{len(queries)}")
+    print("\n              | octets index | chargement ms | ms/requete")
+    print(f"historique    | {legacy_bytes:>12} | {legacy_load_ms:>13.1f} | {legacy_query_ms:>10.3f}")
+    print(f"bm25          | {bm25_bytes:>12} | {bm25_load_ms:>13.1f} | {bm25_query_ms:>10.3f}")
+    print(
+        "\n(historique : memes postings au format inverted_index, sans tf ni longueurs ; "
+        "chargement = parsing + re-tokenisation de tous les scrutins)"
+    )
+    print(f"(inverted_index actuel, mots-cles seuls : {inverted_bytes} octets)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,633 @@
+# -*- coding: utf-8 -*-
+"""Index lexical decoupe en fragments pour un chargement paresseux cote client.
+
+lexical_index.json (et son miroir search_index.json) portent en un seul
+document indente les metadonnees de tous les scrutins : le client telecharge
+et parse tout au demarrage. Ici, le meme contenu est reparti en fragments
+recuperables a l'unite, sous public/data/rag/lexical_shards/ :
+
+    directory.json      repertoire : parametres BM25, analyseur, generation,
+                        segments et fragments (premier/dernier terme ou
+                        premier ordinal, empreinte, generation)
+    documents.pst       numeros et longueurs de tous les documents (varints,
+                        sections documents / documentLengths de lexical_bm25)
+    terms-SSSS-NNN.pst  postings d'un segment pour une tranche contigue du
+                        vocabulaire trie
+    docs-NNN.json       metadonnees d'une tranche d'ordinaux de scrutins
+
+Les postings sont repartis en segments, tranches contigues d'ordinaux de
+documents (ordinaux stables, cf. lexical_bm25) : le segment de base couvre
+le corpus initial, chaque mise a jour ajoute un petit segment avec les
+postings des seuls nouveaux scrutins. Dans un segment, un terme appartient
+au fragment dont firstTerm est le plus grand <= terme (dichotomie sur le
+repertoire). Une requete charge, dans chaque segment, le fragment de chacun
+de ses termes, puis les fragments de metadonnees de ses resultats
+(ordinal // documentShardSize).
+
+Fragment de termes (varints LEB128, cf. lexical_bm25) :
+    nombre de termes
+    par terme : longueur UTF-8, octets du terme, frequence documentaire
+                dans le segment, octets de postings, octets de positions
+    postings des termes, a la suite (ecart d'ordinal, tf)
+    positions des termes, a la suite
+
+L'IDF est recalcule au chargement (somme des frequences des segments,
+documentCount du repertoire) : un fragment ne change que si les postings de
+ses termes changent. Un scrutin re-indexe (dossier lie) ne reecrit que les
+fragments de ses termes dans son segment. Au-dela de LEXICAL_MAX_SEGMENTS,
+les segments ajoutes sont fusionnes en un seul ; s'ils depassent alors
+LEXICAL_SEGMENT_MERGE_RATIO du segment de base, tout est refondu en un
+segment.
+
+Chaque fragment porte la generation du repertoire a laquelle il a change :
+un client qui a en cache la generation G ne recharge que les fragments de
+generation > G.
+
+Usage (taille et nombre de fragments touches par le jeu de requetes fixe) :
+    python scripts/lexical_shards.py public/data/rag/lexical_index.json
+"""
+
+import argparse
+import bisect
+import glob
+import hashlib
+import os
+from typing import Callable, Dict, List, Tuple
+
+import json_backend
+from lexical_bm25 import (
+    BM25_B,
+    BM25_K1,
+    LEXICAL_BENCHMARK_QUERIES,
+    LEXICAL_BM25_EVAL_K,
+    build_lexical_document_postings,
+    build_votes_bm25_index,
+    collect_term_changes,
+    compute_idf,
+    decode_document_sections,
+    decode_term_postings,
+    describe_lexical_analyzer,
+    encode_document_sections,
+    encode_varints,
+    layout_sections,
+    lookup_term,
+    merge_term_postings,
+    next_generation,
+    rank_scores,
+    tokenize_lexical_text,
+)
+
+LEXICAL_SHARDS_SCHEMA_VERSION = 2
+LEXICAL_SHARDS_FORMAT = "lexical-shards-bm25-segmented"
+LEXICAL_SHARDS_DIRECTORY_NAME = "directory.json"
+LEXICAL_SHARDS_DOCUMENTS_NAME = "documents.pst"
+# Taille visee d'un fragment de termes (postings + positions) et nombre de
+# scrutins par fragment de metadonnees : quelques dizaines de Ko chacun.
+LEXICAL_TERM_SHARD_TARGET_BYTES = 32 * 1024
+LEXICAL_DOCUMENT_SHARD_SIZE = 100
+# Segments au-dela desquels les segments ajoutes sont fusionnes, et part du
+# segment de base au-dela de laquelle tout est refondu en un segment.
+LEXICAL_MAX_SEGMENTS = 8
+LEXICAL_SEGMENT_MERGE_RATIO = 0.25
+# Fragments ecrits par write_lexical_shards (les anciens sont retires).
+LEXICAL_SHARD_PATTERNS = ("terms-*.pst", "docs-*.json")
+
+
+def partition_terms(encoded: List[Tuple[bytes, bytes]], target_bytes: int = LEXICAL_TERM_SHARD_TARGET_BYTES) -> List[Tuple[int, int]]:
+    """Tranches [debut, fin) du vocabulaire trie d'environ `target_bytes` chacune."""
+    ranges = []
+    start = 0
+    size = 0
+    for position, (postings, positions) in enumerate(encoded):
+        size += len(postings) + len(positions)
+        if size >= target_bytes:
+            ranges.append((start, position + 1))
+            start = position + 1
+            size = 0
+    if start < len(encoded) or not ranges:
+        ranges.append((start, len(encoded)))
+    return ranges
+
+
+def repartition_terms(
+    vocabulary: List[str],
+    encoded: List[Tuple[bytes, bytes]],
+    first_terms: List[str],
+    target_bytes: int = LEXICAL_TERM_SHARD_TARGET_BYTES,
+) -> List[Tuple[int, int]]:
+    """Tranches reprenant les bornes precedentes (`first_terms`), pour ne pas decaler les fragments.
+
+    Un terme rejoint la tranche dont firstTerm est le plus grand <= terme (la
+    premiere s'il precede tout) ; une tranche videe disparait, une tranche
+    devenue plus de deux fois trop grosse est redecoupee.
+    """
+    if not first_terms:
+        return partition_terms(encoded, target_bytes)
+
+    starts = [0] + [bisect.bisect_left(vocabulary, term) for term in first_terms[1:]]
+    ranges = []
+    for start, end in zip(starts, starts[1:] + [len(vocabulary)]):
+        if end <= start:
+            continue
+        if sum(len(postings) + len(positions) for postings, positions in encoded[start:end]) > 2 * target_bytes:
+            ranges.extend((start + left, start + right) for left, right in partition_terms(encoded[start:end], target_bytes))
+        else:
+            ranges.append((start, end))
+    return ranges or [(0, 0)]
+
+
+def encode_term_shard(terms: List[str], frequencies: List[int], encoded: List[Tuple[bytes, bytes]]) -> bytes:
+    entries = []
+    for term, frequency, (postings, positions) in zip(terms, frequencies, encoded):
+        term_bytes = term.encode("utf-8")
+        entries.append(encode_varints([len(term_bytes)]) + term_bytes + encode_varints([
+            frequency, len(postings), len(positions)
+        ]))
+    return b"".join(
+        [encode_varints([len(terms)])]
+        + entries
+        + [postings for postings, _positions in encoded]
+        + [positions for _postings, positions in encoded]
+    )
+
+
+def read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    """(valeur, position suivante) du varint lu a `offset`."""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        value |= (byte & 0x7F) << shift
+        offset += 1
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
+
+
+def decode_term_shard(data: bytes) -> Dict:
+    """Fragment de termes relu, au format attendu par lookup_term / decode_term_postings."""
+    count, offset = read_varint(data, 0)
+    vocabulary = []
+    frequencies = []
+    postings_lengths = []
+    positions_lengths = []
+    for _ in range(count):
+        length, offset = read_varint(data, offset)
+        vocabulary.append(data[offset:offset + length].decode("utf-8"))
+        offset += length
+        frequency, offset = read_varint(data, offset)
+        postings_length, offset = read_varint(data, offset)
+        positions_length, offset = read_varint(data, offset)
+        frequencies.append(frequency)
+        postings_lengths.append(postings_length)
+        positions_lengths.append(positions_length)
+
+    postings_offsets = [offset]
+    for length in postings_lengths:
+        postings_offsets.append(postings_offsets[-1] + length)
+    positions_offsets = [postings_offsets[-1]]
+    for length in positions_lengths:
+        positions_offsets.append(positions_offsets[-1] + length)
+
+    return {
+        "vocabulary": vocabulary,
+        "documentFrequencies": frequencies,
+        "postingsOffsets": postings_offsets,
+        "positionsOffsets": positions_offsets,
+        "data": data,
+    }
+
+
+def term_shard_blocks(shard: Dict) -> Dict:
+    """Fragment relu au format de lexical_bm25.merge_term_postings (blocs par terme)."""
+    data = shard["data"]
+    postings_offsets = shard["postingsOffsets"]
+    positions_offsets = shard["positionsOffsets"]
+    return {
+        "vocabulary": shard["vocabulary"],
+        "documentFrequencies": shard["documentFrequencies"],
+        "postings": [data[postings_offsets[i]:postings_offsets[i + 1]] for i in range(len(shard["vocabulary"]))],
+        "positions": [data[positions_offsets[i]:positions_offsets[i + 1]] for i in range(len(shard["vocabulary"]))],
+    }
+
+
+def describe_file(name: str, data: bytes) -> Dict:
+    return {"path": name, "bytes": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+
+
+def list_shard_entries(listing: Dict) -> List[Dict]:
+    """Entrees de tous les fichiers du repertoire (documents, fragments de termes et de metadonnees)."""
+    return (
+        [listing["documents"]]
+        + [shard for segment in listing["segments"] for shard in segment["termShards"]]
+        + listing["documentShards"]
+    )
+
+
+def load_previous_listing(directory: str) -> Dict | None:
+    """Repertoire en place, s'il est lisible, au format courant et complet sur disque."""
+    try:
+        listing = json_backend.load_path(os.path.join(directory, LEXICAL_SHARDS_DIRECTORY_NAME))
+        if listing.get("schemaVersion") != LEXICAL_SHARDS_SCHEMA_VERSION:
+            return None
+        entries = list_shard_entries(listing)
+    except Exception:
+        return None
+    if not all(os.path.isfile(os.path.join(directory, entry.get("path") or "")) for entry in entries):
+        return None
+    return listing
+
+
+def read_listing_documents(directory: str, listing: Dict) -> List[str] | None:
+    """Numeros par ordinal du documents.pst d'un repertoire en place, None s'il est illisible."""
+    try:
+        with open(os.path.join(directory, listing["documents"]["path"]), "rb") as f:
+            data = f.read()
+        if hashlib.sha256(data).hexdigest() != listing["documents"]["sha256"]:
+            return None
+        numeros, _norms = decode_document_sections(
+            data, listing["documents"]["sections"], listing["params"], listing["averageDocumentLength"]
+        )
+    except (OSError, KeyError, ValueError, IndexError):
+        return None
+    return numeros
+
+
+def write_lexical_shards(
+    directory: str,
+    lexical_index_path: str,
+    index: Dict,
+    bm25: Dict | None = None,
+    delta: Dict | None = None,
+    lexical_sha256: str | None = None,
+) -> Dict:
+    """Construit et ecrit les fragments d'un index lexical.
+
+    Retourne le repertoire ecrit, plus "written" : fichiers effectivement reecrits.
+    `lexical_index_path` doit deja contenir `index` (controle de synchronisation).
+    `bm25` : index encode deja calcule (lexical_bm25.build_incremental_bm25_index).
+    `delta` : ecart a l'index lexical precedent (lexical_bm25.build_lexical_delta) ;
+    s'il part de l'index dont le repertoire en place est issu et que `bm25`
+    en est une mise a jour (bm25["update"], memes ordinaux), les segments
+    sont repris (segment ajoute pour les nouveaux scrutins, fragments des
+    scrutins re-indexes reconstruits) et seuls les fragments de metadonnees
+    des scrutins ajoutes ou modifies sont re-serialises. Seuls les fichiers
+    dont le contenu change sont reecrits.
+    """
+    votes = index.get("votes", {})
+    if bm25 is None:
+        bm25 = build_votes_bm25_index(votes)
+    if lexical_sha256 is None:
+        with open(lexical_index_path, "rb") as f:
+            lexical_sha256 = hashlib.sha256(f.read()).hexdigest()
+
+    documents = bm25["documents"]
+    ordinals = {numero: ordinal for ordinal, numero in enumerate(documents)}
+    previous = load_previous_listing(directory)
+    previous_entries = {entry["path"]: entry for entry in (list_shard_entries(previous) if previous else [])}
+    generation = next_generation(previous, True)
+    files: Dict[str, bytes] = {}
+
+    def describe(name: str, data: bytes) -> Dict:
+        """Entree du repertoire ; le fichier n'est a ecrire que si son contenu change."""
+        entry = describe_file(name, data)
+        earlier = previous_entries.get(name)
+        if earlier and earlier.get("sha256") == entry["sha256"]:
+            entry["generation"] = earlier.get("generation", generation)
+        else:
+            entry["generation"] = generation
+            files[name] = data
+        return entry
+
+    def read_shard(entry: Dict) -> bytes:
+        with open(os.path.join(directory, entry["path"]), "rb") as f:
+            return f.read()
+
+    def tokenize_segment(start: int, end: int) -> Dict:
+        """Blocs des ordinaux [start, end), depuis les seuls scrutins de la tranche."""
+        postings = {numero: build_lexical_document_postings(votes[numero]) for numero in documents[start:end]}
+        return merge_term_postings(
+            {"vocabulary": [], "documentFrequencies": [], "postings": [], "positions": []},
+            collect_term_changes(ordinals, postings),
+        )
+
+    def build_segment(segment_id: int, terms: Dict, start: int, end: int, first_terms: List[str] = ()) -> Dict:
+        vocabulary = terms["vocabulary"]
+        frequencies = terms["documentFrequencies"]
+        encoded = list(zip(terms["postings"], terms["positions"]))
+        term_shards = []
+        for shard_number, (left, right) in enumerate(repartition_terms(vocabulary, encoded, list(first_terms))):
+            name = f"terms-{segment_id:04d}-{shard_number:03d}.pst"
+            term_shards.append({
+                **describe(name, encode_term_shard(vocabulary[left:right], frequencies[left:right], encoded[left:right])),
+                "firstTerm": vocabulary[left] if right > left else "",
+                "lastTerm": vocabulary[right - 1] if right > left else "",
+                "terms": right - left
+            })
+        return {"id": segment_id, "firstOrdinal": start, "documents": end - start, "termShards": term_shards}
+
+    documents_data, document_sections = layout_sections(encode_document_sections(bm25), ("documents", "documentLengths"))
+    documents_entry = {**describe(LEXICAL_SHARDS_DOCUMENTS_NAME, documents_data), "sections": document_sections}
+
+    # Segments repris seulement si l'index encode a ete mis a jour (et non
+    # reconstruit) depuis l'index lexical dont le repertoire est issu : meme
+    # analyseur, memes ordinaux pour les documents deja indexes, les nouveaux
+    # a la suite. Sinon les postings des anciens segments designeraient
+    # d'autres documents.
+    incremental = (
+        previous is not None
+        and delta is not None
+        and bm25.get("update") is not None
+        and not delta["removed"]
+        and previous.get("lexicalSha256") == delta.get("previousSha256")
+        and previous.get("analyzer") == describe_lexical_analyzer()
+        and previous.get("documentCount") == len(documents) - len(delta["added"])
+        and previous.get("documentShardSize") == LEXICAL_DOCUMENT_SHARD_SIZE
+        and set(documents[previous["documentCount"]:]) == set(delta["added"])
+        and read_listing_documents(directory, previous) == documents[:previous["documentCount"]]
+    )
+    merge = False
+    if incremental and delta["added"] and len(previous["segments"]) >= LEXICAL_MAX_SEGMENTS:
+        # Fusion des segments ajoutes, ou refonte complete s'ils pesent trop face a la base.
+        start = previous["segments"][1]["firstOrdinal"]
+        merge = len(documents) - start <= LEXICAL_SEGMENT_MERGE_RATIO * start
+        incremental = merge
+
+    if incremental:
+        segments = [dict(segment) for segment in previous["segments"]]
+        # Scrutins re-indexes : seuls les blocs de leurs anciens et nouveaux termes, dans leur segment.
+        first_ordinals = [segment["firstOrdinal"] for segment in segments]
+        changed_by_segment: Dict[int, List[str]] = {}
+        for numero in delta["changed"]:
+            changed_by_segment.setdefault(bisect.bisect_right(first_ordinals, ordinals[numero]) - 1, []).append(numero)
+        for segment_number, numeros in changed_by_segment.items():
+            changes = collect_term_changes(
+                ordinals,
+                {numero: build_lexical_document_postings(votes[numero]) for numero in numeros},
+                {numero: build_lexical_document_postings(delta["changed"][numero]) for numero in numeros},
+            )
+            segment = segments[segment_number]
+            keys = [shard["firstTerm"] for shard in segment["termShards"]]
+            changes_by_shard: Dict[int, Dict] = {}
+            for term, term_changes in changes.items():
+                changes_by_shard.setdefault(max(0, bisect.bisect_right(keys, term) - 1), {})[term] = term_changes
+            term_shards = list(segment["termShards"])
+            for shard_number, shard_changes in changes_by_shard.items():
+                entry = term_shards[shard_number]
+                terms = merge_term_postings(term_shard_blocks(decode_term_shard(read_shard(entry))), shard_changes)
+                vocabulary = terms["vocabulary"]
+                term_shards[shard_number] = {
+                    **describe(entry["path"], encode_term_shard(
+                        vocabulary, terms["documentFrequencies"], list(zip(terms["postings"], terms["positions"]))
+                    )),
+                    "firstTerm": min([entry["firstTerm"]] + vocabulary[:1]) if shard_number == 0 else entry["firstTerm"],
+                    "lastTerm": vocabulary[-1] if vocabulary else "",
+                    "terms": len(vocabulary)
+                }
+            segment["termShards"] = term_shards
+
+        # Scrutins ajoutes : un segment de plus, tokenise depuis ses seuls scrutins.
+        if delta["added"]:
+            start = previous["documentCount"]
+            if merge:
+                start = segments[1]["firstOrdinal"]
+                segments = segments[:1]
+            segments.append(build_segment(generation, tokenize_segment(start, len(documents)), start, len(documents)))
+    else:
+        # Segment unique ; identifiant et bornes des tranches repris d'un segment unique equivalent.
+        earlier = previous["segments"] if previous else []
+        same = len(earlier) == 1 and earlier[0]["documents"] == len(documents)
+        segments = [build_segment(
+            earlier[0]["id"] if same else generation,
+            bm25,
+            0,
+            len(documents),
+            [shard["firstTerm"] for shard in earlier[0]["termShards"]] if same else [],
+        )]
+
+    touched = None
+    if incremental:
+        touched = {ordinals[numero] // LEXICAL_DOCUMENT_SHARD_SIZE for numero in [*delta["added"], *delta["updated"]] if numero in ordinals}
+
+    document_shards = []
+    for shard_number, start in enumerate(range(0, len(documents), LEXICAL_DOCUMENT_SHARD_SIZE)):
+        numeros = documents[start:start + LEXICAL_DOCUMENT_SHARD_SIZE]
+        name = f"docs-{shard_number:03d}.json"
+        earlier = previous_entries.get(name)
+        if (
+            touched is not None
+            and shard_number not in touched
+            and earlier
+            and earlier.get("firstOrdinal") == start
+            and earlier.get("documents") == len(numeros)
+        ):
+            # Tranche intacte : ni re-serialisee ni re-hachee.
+            document_shards.append(earlier)
+            continue
+        data = json_backend.dumps({"votes": {numero: votes[numero] for numero in numeros}}, compact=True)
+        document_shards.append({**describe(name, data), "firstOrdinal": start, "documents": len(numeros)})
+
+    listing = {
+        "schemaVersion": LEXICAL_SHARDS_SCHEMA_VERSION,
+        "generatedAt": index.get("lastUpdate"),
+        "format": LEXICAL_SHARDS_FORMAT,
+        "generation": generation,
+        "lexicalPath": os.path.basename(lexical_index_path),
+        "lexicalSha256": lexical_sha256,
+        "params": {"k1": BM25_K1, "b": BM25_B},
+        "analyzer": describe_lexical_analyzer(),
+        "documentCount": len(documents),
+        "averageDocumentLength": round(sum(bm25["lengths"]) / max(1, len(documents)), 4),
+        "vocabularySize": len(bm25["vocabulary"]),
+        "documentShardSize": LEXICAL_DOCUMENT_SHARD_SIZE,
+        "documents": documents_entry,
+        "segments": segments,
+        "documentShards": document_shards
+    }
+    names = {entry["path"] for entry in list_shard_entries(listing)}
+    # Seuls les contenus nouveaux sont ecrits.
+    written = {
+        name: data for name, data in files.items()
+        if name in names and (name not in previous_entries or previous_entries[name]["sha256"] != hashlib.sha256(data).hexdigest())
+    }
+    if not written and names == set(previous_entries):
+        listing["generation"] = next_generation(previous, False)
+
+    os.makedirs(directory, exist_ok=True)
+    for pattern in LEXICAL_SHARD_PATTERNS:
+        for stale_path in glob.glob(os.path.join(directory, pattern)):
+            if os.path.basename(stale_path) not in names:
+                os.remove(stale_path)
+    for name, data in written.items():
+        with open(os.path.join(directory, name), "wb") as f:
+            f.write(data)
+    with open(os.path.join(directory, LEXICAL_SHARDS_DIRECTORY_NAME), "wb") as f:
+        f.write(json_backend.dumps(listing, compact=True))
+    listing["written"] = sorted(written)
+    return listing
+
+
+def open_lexical_shards(directory: str, fetch: Callable[[str], bytes] | None = None) -> Dict:
+    """Charge repertoire et documents ; les fragments le seront a la demande.
+
+    `fetch(nom)` rend les octets d'un fichier du repertoire (lecture disque
+    par defaut ; cote client, une requete HTTP). Les noms recuperes sont
+    consignes dans "fetched".
+    """
+    if fetch is None:
+        def fetch(name: str) -> bytes:
+            with open(os.path.join(directory, name), "rb") as f:
+                return f.read()
+
+    sharded = {"fetch": fetch, "fetched": [], "termShards": {}, "documentShards": {}}
+    listing = json_backend.loads(fetch_verified(sharded, {"path": LEXICAL_SHARDS_DIRECTORY_NAME}))
+    documents_data = fetch_verified(sharded, listing["documents"])
+    numeros, norms = decode_document_sections(
+        documents_data, listing["documents"]["sections"], listing["params"], listing["averageDocumentLength"]
+    )
+    sharded.update({
+        "listing": listing,
+        "k1": listing["params"]["k1"],
+        "documents": numeros,
+        "ordinals": {numero: ordinal for ordinal, numero in enumerate(numeros)},
+        "norms": norms,
+        "termShardKeys": [[shard["firstTerm"] for shard in segment["termShards"]] for segment in listing["segments"]],
+    })
+    return sharded
+
+
+def fetch_verified(sharded: Dict, entry: Dict) -> bytes:
+    data = sharded["fetch"](entry["path"])
+    sharded["fetched"].append(entry["path"])
+    if "sha256" in entry and hashlib.sha256(data).hexdigest() != entry["sha256"]:
+        raise ValueError(f"Fragment lexical corrompu ({entry['path']}) : empreinte differente")
+    return data
+
+
+def load_term_shard(sharded: Dict, segment_number: int, term: str) -> Dict | None:
+    """Fragment d'un segment pouvant contenir `term` (charge une seule fois)."""
+    keys = sharded["termShardKeys"][segment_number]
+    if not keys:
+        return None
+    shard_number = max(0, bisect.bisect_right(keys, term) - 1)
+    if (segment_number, shard_number) not in sharded["termShards"]:
+        entry = sharded["listing"]["segments"][segment_number]["termShards"][shard_number]
+        sharded["termShards"][segment_number, shard_number] = decode_term_shard(fetch_verified(sharded, entry))
+    return sharded["termShards"][segment_number, shard_number]
+
+
+def score_sharded_bm25(sharded: Dict, query: str, k: int = LEXICAL_BM25_EVAL_K) -> List[Tuple[str, float]]:
+    """Meme classement que lexical_bm25.score_bm25, en ne chargeant que les fragments des termes."""
+    k1 = sharded["k1"]
+    norms = sharded["norms"]
+    scores: Dict[int, float] = {}
+    for term in dict.fromkeys(tokenize_lexical_text(query)):
+        frequency = 0
+        postings = []
+        for segment_number in range(len(sharded["termShardKeys"])):
+            shard = load_term_shard(sharded, segment_number, term)
+            position = lookup_term(shard, term) if shard is not None else None
+            if position is None:
+                continue
+            frequency += shard["documentFrequencies"][position]
+            postings.extend(decode_term_postings(shard, position))
+        if not postings:
+            continue
+        idf = compute_idf(frequency, len(sharded["documents"]))
+        for ordinal, tf in postings:
+            scores[ordinal] = scores.get(ordinal, 0.0) + idf * tf * (k1 + 1) / (tf + norms[ordinal])
+    return rank_scores(sharded, scores, k)
+
+
+def load_document_metadata(sharded: Dict, numeros: List[str]) -> Dict[str, Dict]:
+    """Metadonnees des scrutins demandes, depuis leurs seuls fragments."""
+    metadata = {}
+    for numero in numeros:
+        ordinal = sharded["ordinals"].get(numero)
+        if ordinal is None:
+            continue
+        shard_number = ordinal // sharded["listing"]["documentShardSize"]
+        if shard_number not in sharded["documentShards"]:
+            entry = sharded["listing"]["documentShards"][shard_number]
+            sharded["documentShards"][shard_number] = json_backend.loads(fetch_verified(sharded, entry))["votes"]
+        if numero in sharded["documentShards"][shard_number]:
+            metadata[numero] = sharded["documentShards"][shard_number][numero]
+    return metadata
+
+
+def describe_lexical_shards(directory: str, lexical_index_path: str, lexical_sha256: str | None = None) -> Dict | None:
+    """Projection manifest des fragments, si presents et synchrones avec l'index lexical.
+
+    Chemins relatifs au manifest (prefixes du nom du repertoire de fragments).
+    `lexical_sha256` : empreinte de l'index lexical si l'appelant la connait deja.
+    """
+    listing_path = os.path.join(directory, LEXICAL_SHARDS_DIRECTORY_NAME)
+    if not os.path.exists(listing_path) or not os.path.exists(lexical_index_path):
+        return None
+
+    listing = load_previous_listing(directory)
+    if listing is None:
+        return None
+
+    if lexical_sha256 is None:
+        with open(lexical_index_path, "rb") as f:
+            lexical_sha256 = hashlib.sha256(f.read()).hexdigest()
+    if listing.get("lexicalSha256") != lexical_sha256:
+        return None
+
+    prefix = os.path.basename(os.path.normpath(directory))
+    with open(listing_path, "rb") as f:
+        listing_sha256 = hashlib.sha256(f.read()).hexdigest()
+
+    def relocate(entry: Dict) -> Dict:
+        return {**entry, "path": f"{prefix}/{entry['path']}"}
+
+    return {
+        "path": f"{prefix}/{LEXICAL_SHARDS_DIRECTORY_NAME}",
+        "bytes": os.path.getsize(listing_path),
+        "sha256": listing_sha256,
+        "format": listing.get("format", LEXICAL_SHARDS_FORMAT),
+        "generation": listing.get("generation"),
+        "documentCount": listing.get("documentCount"),
+        "vocabularySize": listing.get("vocabularySize"),
+        "documents": relocate({key: value for key, value in listing["documents"].items() if key != "sections"}),
+        "segments": [
+            {**segment, "termShards": [relocate(entry) for entry in segment["termShards"]]}
+            for segment in listing["segments"]
+        ],
+        "documentShards": [relocate(entry) for entry in listing["documentShards"]]
+    }
+
+
+def main():
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Fragments lexicaux : taille et octets charges par requete")
+    parser.add_argument("lexical_index", help="Index lexical (ex. public/data/rag/lexical_index.json)")
+    parser.add_argument("--k", type=int, default=LEXICAL_BM25_EVAL_K)
+    args = parser.parse_args()
+
+    index = json_backend.load_path(args.lexical_index)
+    full_bytes = os.path.getsize(args.lexical_index)
+    with tempfile.TemporaryDirectory() as directory:
+        listing = write_lexical_shards(directory, args.lexical_index, index)
+        sizes = {name: os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)}
+        term_shards = sum(len(segment["termShards"]) for segment in listing["segments"])
+
+        print(f"\n📊 {listing['documentCount']} scrutins, {listing['vocabularySize']} termes")
+        print(f"   {term_shards} fragments de termes, {len(listing['documentShards'])} fragments de metadonnees")
+        print(f"   total {sum(sizes.values()) / 1024:.1f} Ko contre {full_bytes / 1024:.1f} Ko pour {os.path.basename(args.lexical_index)}")
+        print("\nrequete                          | termes | metadonnees | Ko charges")
+        for query in LEXICAL_BENCHMARK_QUERIES:
+            sharded = open_lexical_shards(directory)
+            results = score_sharded_bm25(sharded, query, k=args.k)
+            load_document_metadata(sharded, [numero for numero, _score in results])
+            fetched = sum(sizes[name] for name in sharded["fetched"])
+            print(
+                f"{query[:32]:<32} | {len(sharded['termShards']):>6} | {len(sharded['documentShards']):>11} "
+                f"| {fetched / 1024:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
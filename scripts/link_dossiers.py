@@ -8,8 +8,9 @@ scripts/generate_dossier_fiches.py et par le front (js/data/dossiers-repository.
 
 Stratégie de chaînage, dans l'ordre :
 1. overrides manuels (public/data/dossiers/overrides.json) ;
-2. champ direct scrutin.objet.dossierLegislatif si les fichiers bruts
-   Scrutins/json sont présents (contexte Global Update) ;
+2. champ direct scrutin.objet.dossierLegislatif si l'archive Scrutins.json.zip
+   (ou Scrutins/json) est présente (contexte Global Update), lu via le corpus
+   partagé scripts/scrutins_corpus.py ;
 3. rapprochement de titres : extraction de la « queue » du titre du scrutin
    (projet de loi..., proposition de loi...), normalisation, containment puis
    Jaccard de tokens, départagé par la fenêtre de dates du dossier.
@@ -31,6 +32,9 @@ from datetime import datetime, timedelta, timezone
 
 import requests
 
+import json_backend
+from scrutins_corpus import iter_scrutin_payloads, load_scrutins_corpus, scrutins_available
+
 LEGISLATURE = os.environ.get("AN_LEGISLATURE", "17")
 DOSSIERS_ZIP_URL = os.environ.get(
     "AN_DOSSIERS_ZIP_URL",
@@ -38,7 +42,6 @@ DOSSIERS_ZIP_URL = os.environ.get(
     "/loi/dossiers_legislatifs/Dossiers_Legislatifs.json.zip",
 )
 DOSSIERS_WORK_DIR = "./DossiersLegislatifs"
-DOSSIER_SCRUTINS = "./Scrutins/json"
 FICHIER_LEXICAL_INDEX = "./public/data/rag/lexical_index.json"
 FICHIER_INDEX_SORTIE = "./public/data/dossiers/index.json"
 FICHIER_OVERRIDES = "./public/data/dossiers/overrides.json"
@@ -173,8 +176,7 @@ def iter_export_records(extract_dir: str):
     json_files = glob.glob(os.path.join(extract_dir, "**", "*.json"), recursive=True)
     for path in sorted(json_files):
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = json_backend.load_path(path)
         except Exception:
             continue
 
@@ -288,8 +290,7 @@ def load_dossiers(extract_dir: str):
 
 
 def load_scrutins_from_lexical_index():
-    with open(FICHIER_LEXICAL_INDEX, "r", encoding="utf-8") as f:
-        index = json.load(f)
+    index = json_backend.load_path(FICHIER_LEXICAL_INDEX)
 
     scrutins = {}
     for numero, entry in (index.get("votes") or {}).items():
@@ -304,24 +305,12 @@ def load_scrutins_from_lexical_index():
 def load_direct_dossier_refs():
     """Lit scrutin.objet.dossierLegislatif dans les fichiers bruts si présents."""
     refs = {}
-    if not os.path.isdir(DOSSIER_SCRUTINS):
+    if not scrutins_available():
         return refs
 
-    for path in glob.glob(os.path.join(DOSSIER_SCRUTINS, "VTAN*.json")):
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                scrutin = (json.load(f) or {}).get("scrutin") or {}
-        except Exception:
-            continue
-
-        numero = str(scrutin.get("numero") or "").strip()
-        objet = scrutin.get("objet") or {}
-        direct_ref = objet.get("dossierLegislatif")
-        if isinstance(direct_ref, dict):
-            direct_ref = direct_ref.get("uid") or direct_ref.get("dossierRef")
-        direct_ref = str(direct_ref or "").strip()
-        if numero and direct_ref:
-            refs[numero] = direct_ref
+    for scrutin in load_scrutins_corpus():
+        if scrutin.dossier_ref:
+            refs[scrutin.numero] = scrutin.dossier_ref
 
     log(f"Références directes objet.dossierLegislatif trouvées : {len(refs)}")
     return refs
@@ -331,8 +320,7 @@ def load_overrides():
     if not os.path.exists(FICHIER_OVERRIDES):
         return {}
     try:
-        with open(FICHIER_OVERRIDES, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = json_backend.load_path(FICHIER_OVERRIDES)
         return {str(k): str(v) for k, v in (data or {}).items()}
     except Exception:
         log(f"⚠️ Overrides illisibles ({FICHIER_OVERRIDES}), ignorés.")
@@ -408,16 +396,15 @@ def match_scrutin_to_dossier(query: str, scrutin_date: str, dossiers: dict):
 
 def run_probe():
     """Imprime la structure d'un scrutin brut et d'un dossier pour lever les doutes de schéma."""
-    scrutin_files = sorted(glob.glob(os.path.join(DOSSIER_SCRUTINS, "VTAN*.json")))
-    if scrutin_files:
-        with open(scrutin_files[0], "r", encoding="utf-8") as f:
-            scrutin = (json.load(f) or {}).get("scrutin") or {}
-        log(f"--- Sonde scrutin ({os.path.basename(scrutin_files[0])}) ---")
+    source, payload = next(iter_scrutin_payloads(), (None, None))
+    if source:
+        scrutin = (payload or {}).get("scrutin") or {}
+        log(f"--- Sonde scrutin ({source}) ---")
         log(f"Clés scrutin : {sorted(scrutin.keys())}")
         log(f"Clés scrutin.objet : {sorted((scrutin.get('objet') or {}).keys())}")
         log(f"objet.dossierLegislatif = {json.dumps((scrutin.get('objet') or {}).get('dossierLegislatif'), ensure_ascii=False)[:400]}")
     else:
-        log("Sonde scrutin : aucun fichier Scrutins/json/VTAN*.json disponible localement.")
+        log("Sonde scrutin : ni Scrutins.json.zip ni Scrutins/json/VTAN*.json disponibles localement.")
 
     extract_dir = download_and_extract_dossiers(DOSSIERS_WORK_DIR, skip_download=True)
     for kind, payload in iter_export_records(extract_dir):
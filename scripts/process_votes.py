@@ -1,109 +1,406 @@
-import json
+import argparse
+import hashlib
 import os
 import glob
 import re
 
+import json_backend
+from scrutins_corpus import (
+    POSITION_LABELS,
+    POSITION_POUR,
+    POSITION_CONTRE,
+    POSITION_ABSTENTION,
+    compute_content_hash,
+    iter_scrutin_blobs,
+    iter_votes,
+    load_scrutins_corpus,
+    parse_scrutin_blob,
+    resolve_scrutins_source,
+)
+
 # --- CONFIGURATION ---
-DOSSIER_SCRUTINS = "./Scrutins/json"
 DOSSIER_DEPUTES = "./public/data/deputes_actifs"
 DIR_SORTIE_VOTES = "./public/data/votes"
 
+# Positions publiees dans les fichiers individuels (les non-votants n'y figurent pas).
+POSITIONS_PUBLIEES = (POSITION_POUR, POSITION_CONTRE, POSITION_ABSTENTION)
+
+# Disposition compacte : une table partagee des scrutins + des paires
+# (index dans la table, code de position) par depute. Les anciens fichiers
+# (tableau d'objets complets) restent lisibles par js/data/votes-repository.js.
+VOTES_SCHEMA_VERSION = 2
+FICHIER_TABLE_SCRUTINS = "scrutins.json"
+CHAMPS_TABLE_SCRUTINS = ("numero", "date", "titre", "sort")
+
+# Matrice dense deputes x scrutins (codes POSITION_*, int8) au format .npy,
+# chargeable telle quelle par np.load(..., mmap_mode='r'). Stockage par
+# colonnes (fortran_order) : les nouveaux scrutins s'ajoutent en fin de fichier.
+# Les colonnes suivent l'ordre de scrutins.json, les lignes celui de la liste
+# des deputes ; les deux index sont publies dans vote_matrix.json.
+FICHIER_MATRICE_VOTES = "vote_matrix.npy"
+FICHIER_INDEX_MATRICE_VOTES = "vote_matrix.json"
+MATRICE_VOTES_SCHEMA_VERSION = 1
+
+# Etat du mode --incremental : plus grand numero traite et empreinte du
+# contenu brut de chaque scrutin (par nom de fichier source). Cache de build
+# interne, hors de public/ (non servi) ; versionne par le workflow quotidien
+# pour survivre d'un run a l'autre. L'ancien emplacement public est retire.
+FICHIER_ETAT = "./.cache/process_votes_state.json"
+ANCIEN_FICHIER_ETAT = os.path.join(DIR_SORTIE_VOTES, "process_state.json")
+ETAT_SCHEMA_VERSION = 1
+
 # --- FONCTION HELPER POUR TROUVER LE DERNIER FICHIER ---
 def trouver_dernier_fichier_deputes(dossier):
     # On cherche tous les fichiers qui ressemblent à vYYYY-MM-DD.json
     pattern = os.path.join(dossier, "v*.json")
     fichiers = glob.glob(pattern)
-    
+
     if not fichiers:
         raise FileNotFoundError(f"Aucun fichier députés (v*.json) trouvé dans {dossier}")
 
     # On trie par ordre alphabétique inversé (le plus grand, donc la date la plus récente, en premier)
     # Ex: v2025-12-13.json > v2025-12-12.json
     fichiers.sort(reverse=True)
-    
+
     dernier = fichiers[0]
     print(f"Fichier députés le plus récent identifié : {dernier}")
     return dernier
 
-# --- 1. CHARGEMENT LISTE DEPUTES ---
-if not os.path.exists(DIR_SORTIE_VOTES):
-    os.makedirs(DIR_SORTIE_VOTES)
-
-FICHIER_DEPUTES_BASE = trouver_dernier_fichier_deputes(DOSSIER_DEPUTES)
-
-print(f"Chargement de la liste des députés depuis {FICHIER_DEPUTES_BASE}...")
-with open(FICHIER_DEPUTES_BASE, 'r', encoding='utf-8') as f:
-    liste_base = json.load(f)
-
-# On prépare un dictionnaire pour stocker les votes temporairement
-# Clé = ID acteur (PA1234), Valeur = liste de votes
-votes_par_depute = {d['id']: [] for d in liste_base}
-
-# --- 2. TRAITEMENT DES SCRUTINS ---
-print("Analyse des milliers de scrutins...")
-fichiers_scrutins = glob.glob(os.path.join(DOSSIER_SCRUTINS, "VTAN*.json"))
-
-# Pour trier par numéro de scrutin (facultatif mais plus propre)
-fichiers_scrutins.sort() 
-
-count = 0
-for chemin in fichiers_scrutins:
-    count += 1
-    if count % 500 == 0: print(f"Traitement... {count}/{len(fichiers_scrutins)}")
-    
-    with open(chemin, 'r', encoding='utf-8') as f:
-        try:
-            data = json.load(f)
-            scrutin = data['scrutin']
-        except:
-            continue # Fichier corrompu ou vide
-
-    # Infos du scrutin
-    info_vote = {
-        'date': scrutin['dateScrutin'],
-        'titre': scrutin['titre'],
-        'sort': scrutin['sort']['code'], # adopté / rejeté
-        'numero': scrutin['numero']
-    }
-
-    # Extraction des votants
-    ventilation = scrutin['ventilationVotes']['organe']['groupes']['groupe']
-    if isinstance(ventilation, dict): ventilation = [ventilation]
-
-    for groupe in ventilation:
-        nominatif = groupe['vote']['decompteNominatif']
-        
-        # Helper pour ajouter
-        def ajouter(source, position):
-            if not source: return
-            votants = source.get('votant')
-            if not votants: return
-            if isinstance(votants, dict): votants = [votants]
-            
-            for v in votants:
-                ref = v['acteurRef']
-                if ref in votes_par_depute:
-                    # On copie l'info du scrutin et on ajoute la position du député
-                    v_data = info_vote.copy()
-                    v_data['vote'] = position
-                    votes_par_depute[ref].append(v_data)
-
-        ajouter(nominatif.get('pours'), 'Pour')
-        ajouter(nominatif.get('contres'), 'Contre')
-        ajouter(nominatif.get('abstentions'), 'Abstention')
-
-# --- 3. SAUVEGARDE INDIVIDUELLE ---
-print("Génération des fichiers individuels...")
-
-for dep_id, votes in votes_par_depute.items():
-    # On trie les votes par date (récent en premier pour l'IA)
-    votes.sort(key=lambda x: x['date'], reverse=True)
-    
-    chemin_fichier = os.path.join(DIR_SORTIE_VOTES, f"{dep_id}.json")
-    with open(chemin_fichier, 'w', encoding='utf-8') as f:
-        json.dump(votes, f, ensure_ascii=False)
-
-# --- 4. SAUVEGARDE LISTE LEGERE (Optionnel) ---
-# Si vous voulez garder v2025-12-12.json tel quel, pas besoin de ça.
-# Mais c'est bien de s'assurer qu'il est propre.
-print("Terminé !")
+
+def cle_numero(numero):
+    return (0, int(numero), numero) if numero.isdigit() else (1, 0, numero)
+
+
+def construire_table_scrutins(scrutins):
+    """Table partagee triee par numero : les index restent stables quand de nouveaux scrutins s'ajoutent."""
+    ordonnes = sorted(scrutins, key=lambda scrutin: cle_numero(scrutin.numero))
+    lignes = [[scrutin.numero, scrutin.date, scrutin.titre, scrutin.sort] for scrutin in ordonnes]
+    index_par_numero = {scrutin.numero: index for index, scrutin in enumerate(ordonnes)}
+    return lignes, index_par_numero
+
+
+def collecter_votes_par_depute(scrutins, ids_deputes, index_par_numero):
+    """Repartit les positions nominatives par depute : paires [index scrutin, position].
+
+    Tri par date decroissante (récent en premier pour l'IA) ; a date egale,
+    l'ordre du corpus est conserve (tri stable), comme l'ancienne sortie.
+    """
+    # Clé = ID acteur (PA1234), Valeur = liste de (date, index, position)
+    votes_par_depute = {dep_id: [] for dep_id in ids_deputes}
+
+    for scrutin in scrutins:
+        index = index_par_numero[scrutin.numero]
+        for ref, position in iter_votes(scrutin):
+            if position in POSITIONS_PUBLIEES and ref in votes_par_depute:
+                votes_par_depute[ref].append((scrutin.date, index, position))
+
+    for dep_id, votes in votes_par_depute.items():
+        votes.sort(key=lambda vote: vote[0], reverse=True)
+        votes_par_depute[dep_id] = [[index, position] for _date, index, position in votes]
+
+    return votes_par_depute
+
+
+def construire_matrice_votes(scrutins, ids_deputes, index_par_numero):
+    """Codes de position de chaque depute pour chaque scrutin (absent par defaut).
+
+    Octets ranges colonne par colonne : cellule (ligne, colonne) a l'offset
+    colonne * nb_deputes + ligne.
+    """
+    ligne_par_depute = {dep_id: ligne for ligne, dep_id in enumerate(ids_deputes)}
+    nb_deputes = len(ids_deputes)
+    matrice = bytearray(nb_deputes * len(index_par_numero))
+
+    for scrutin in scrutins:
+        debut_colonne = index_par_numero[scrutin.numero] * nb_deputes
+        for ref, position in iter_votes(scrutin):
+            ligne = ligne_par_depute.get(ref)
+            if ligne is not None:
+                matrice[debut_colonne + ligne] = position
+
+    return matrice
+
+
+def ecrire_si_modifie(chemin, blob):
+    """Ecrit blob via fichier temporaire + os.replace, sauf si le disque a deja ce contenu.
+
+    Retourne True si le fichier a ete (re)ecrit. Les fichiers inchanges ne
+    sont pas touches : le commit quotidien ne voit que les vrais changements.
+    """
+    try:
+        if os.path.getsize(chemin) == len(blob):
+            with open(chemin, 'rb') as f:
+                if hashlib.sha256(f.read()).digest() == hashlib.sha256(blob).digest():
+                    return False
+    except OSError:
+        pass
+
+    tmp = chemin + ".tmp"
+    with open(tmp, 'wb') as f:
+        f.write(blob)
+    os.replace(tmp, chemin)
+    return True
+
+
+def ecrire_npy_int8(chemin, donnees, forme):
+    """Ecrit un .npy v1.0 (int8, fortran_order) sans dependre de numpy."""
+    entete = "{'descr': '|i1', 'fortran_order': True, 'shape': (%d, %d), }" % forme
+    # Prefixe (magic + version + longueur) de 10 octets, entete alignee sur 64 octets.
+    remplissage = 64 - (10 + len(entete) + 1) % 64
+    entete = (entete + " " * (remplissage % 64) + "\n").encode("latin1")
+    return ecrire_si_modifie(
+        chemin,
+        b"\x93NUMPY\x01\x00" + len(entete).to_bytes(2, "little") + entete + bytes(donnees)
+    )
+
+
+def lire_npy_int8(chemin):
+    """Relit un .npy ecrit par ecrire_npy_int8 : (forme, donnees) ou None."""
+    try:
+        with open(chemin, 'rb') as f:
+            brut = f.read()
+    except OSError:
+        return None
+
+    if not brut.startswith(b"\x93NUMPY\x01\x00"):
+        return None
+    longueur = int.from_bytes(brut[8:10], "little")
+    entete = brut[10:10 + longueur].decode("latin1")
+    forme = re.search(r"'shape': \((\d+), (\d+)\)", entete)
+    if not forme or "'|i1'" not in entete or "'fortran_order': True" not in entete:
+        return None
+
+    forme = (int(forme.group(1)), int(forme.group(2)))
+    donnees = bytearray(brut[10 + longueur:])
+    if len(donnees) != forme[0] * forme[1]:
+        return None
+    return forme, donnees
+
+
+def ecrire_json_compact(chemin, payload):
+    return ecrire_si_modifie(chemin, json_backend.dumps(payload, compact=True))
+
+
+def lire_json(chemin):
+    try:
+        return json_backend.load_path(chemin)
+    except Exception:
+        return None
+
+
+def ecrire_table_scrutins(table_scrutins):
+    ecrire_json_compact(os.path.join(DIR_SORTIE_VOTES, FICHIER_TABLE_SCRUTINS), {
+        'schemaVersion': VOTES_SCHEMA_VERSION,
+        'fields': list(CHAMPS_TABLE_SCRUTINS),
+        'positions': list(POSITION_LABELS),
+        'scrutins': table_scrutins
+    })
+
+
+def ecrire_votes_depute(dep_id, votes):
+    return ecrire_json_compact(os.path.join(DIR_SORTIE_VOTES, f"{dep_id}.json"), {
+        'schemaVersion': VOTES_SCHEMA_VERSION,
+        'table': FICHIER_TABLE_SCRUTINS,
+        'votes': votes
+    })
+
+
+def ecrire_matrice_votes(ids_deputes, table_scrutins, matrice):
+    forme = (len(ids_deputes), len(table_scrutins))
+    ecrire_npy_int8(os.path.join(DIR_SORTIE_VOTES, FICHIER_MATRICE_VOTES), matrice, forme)
+    ecrire_json_compact(os.path.join(DIR_SORTIE_VOTES, FICHIER_INDEX_MATRICE_VOTES), {
+        'schemaVersion': MATRICE_VOTES_SCHEMA_VERSION,
+        'path': FICHIER_MATRICE_VOTES,
+        'dtype': 'int8',
+        'order': 'F',
+        'shape': list(forme),
+        'positions': list(POSITION_LABELS),
+        'rows': ids_deputes,
+        'columns': [ligne[0] for ligne in table_scrutins]
+    })
+
+
+def ecrire_etat(ids_deputes, scrutins_connus):
+    """scrutins_connus : {nom de fichier source: [numero, empreinte]}."""
+    numeros = [int(numero) for numero, _empreinte in scrutins_connus.values() if numero.isdigit()]
+    os.makedirs(os.path.dirname(FICHIER_ETAT), exist_ok=True)
+    ecrire_json_compact(FICHIER_ETAT, {
+        'schemaVersion': ETAT_SCHEMA_VERSION,
+        'maxNumero': max(numeros, default=0),
+        'deputes': ids_deputes,
+        'scrutins': dict(sorted(scrutins_connus.items()))
+    })
+    if os.path.exists(ANCIEN_FICHIER_ETAT):
+        os.remove(ANCIEN_FICHIER_ETAT)
+
+
+def traitement_complet(ids_deputes, workers=1):
+    """Reconstruit toutes les sorties depuis le corpus complet."""
+    # Le corpus partage est mis en cache pour les etapes suivantes du pipeline.
+    print("Analyse des milliers de scrutins...")
+    scrutins = load_scrutins_corpus(workers=workers)
+    table_scrutins, index_par_numero = construire_table_scrutins(scrutins)
+    votes_par_depute = collecter_votes_par_depute(scrutins, ids_deputes, index_par_numero)
+
+    print(f"Génération de la table des scrutins ({len(table_scrutins)} scrutins)...")
+    ecrire_table_scrutins(table_scrutins)
+
+    print("Génération des fichiers individuels...")
+    ecrits = sum(ecrire_votes_depute(dep_id, votes) for dep_id, votes in votes_par_depute.items())
+    print(f"Fichiers de députés : {ecrits} écrits, {len(votes_par_depute) - ecrits} inchangés.")
+
+    print(f"Génération de la matrice des votes ({len(ids_deputes)} x {len(table_scrutins)})...")
+    ecrire_matrice_votes(ids_deputes, table_scrutins, construire_matrice_votes(scrutins, ids_deputes, index_par_numero))
+
+    ecrire_etat(ids_deputes, {scrutin.source: [scrutin.numero, scrutin.content_hash] for scrutin in scrutins})
+
+
+def traitement_incremental(ids_deputes):
+    """Fusionne les seuls scrutins nouveaux ou modifies dans les sorties existantes.
+
+    Retourne False (sans rien ecrire) quand une reconstruction complete est
+    necessaire : etat absent, liste des deputes modifiee, sorties illisibles,
+    scrutin disparu ou nouveau scrutin qui ne s'ajoute pas en fin de table.
+    """
+    etat = lire_json(FICHIER_ETAT)
+    if not isinstance(etat, dict) or etat.get('schemaVersion') != ETAT_SCHEMA_VERSION:
+        print("Incrémental : état absent ou obsolète, reconstruction complète.")
+        return False
+    if etat.get('deputes') != ids_deputes:
+        print("Incrémental : liste des députés modifiée, reconstruction complète.")
+        return False
+
+    table = lire_json(os.path.join(DIR_SORTIE_VOTES, FICHIER_TABLE_SCRUTINS))
+    matrice_lue = lire_npy_int8(os.path.join(DIR_SORTIE_VOTES, FICHIER_MATRICE_VOTES))
+    if not isinstance(table, dict) or table.get('schemaVersion') != VOTES_SCHEMA_VERSION or matrice_lue is None:
+        print("Incrémental : table des scrutins ou matrice illisible, reconstruction complète.")
+        return False
+    table_scrutins = table['scrutins']
+    forme, matrice = matrice_lue
+    if forme != (len(ids_deputes), len(table_scrutins)):
+        print("Incrémental : matrice désynchronisée, reconstruction complète.")
+        return False
+
+    # 1. Repérage par empreinte du contenu brut : seul ce qui a changé est décodé.
+    scrutins_connus = etat.get('scrutins') or {}
+    sources_vues = set()
+    modifies = []
+    for nom, blob in iter_scrutin_blobs(resolve_scrutins_source()):
+        sources_vues.add(nom)
+        if (scrutins_connus.get(nom) or [None, None])[1] == compute_content_hash(blob):
+            continue
+        scrutin = parse_scrutin_blob(nom, blob)
+        if scrutin is not None:
+            modifies.append(scrutin)
+
+    if set(scrutins_connus) - sources_vues:
+        print("Incrémental : scrutins disparus de la source, reconstruction complète.")
+        return False
+    if not modifies:
+        print("Incrémental : aucun scrutin nouveau ou modifié, sorties inchangées.")
+        return True
+
+    index_par_numero = {ligne[0]: index for index, ligne in enumerate(table_scrutins)}
+    nouveaux = sorted(
+        (scrutin for scrutin in modifies if scrutin.numero not in index_par_numero),
+        key=lambda scrutin: cle_numero(scrutin.numero)
+    )
+    max_numero = int(etat.get('maxNumero') or 0)
+    if any(not scrutin.numero.isdigit() or int(scrutin.numero) <= max_numero for scrutin in nouveaux):
+        print("Incrémental : nouveau scrutin hors séquence, reconstruction complète.")
+        return False
+
+    votes_par_depute = {}
+    for dep_id in ids_deputes:
+        payload = lire_json(os.path.join(DIR_SORTIE_VOTES, f"{dep_id}.json"))
+        if not isinstance(payload, dict) or payload.get('schemaVersion') != VOTES_SCHEMA_VERSION:
+            print(f"Incrémental : fichier de votes {dep_id} absent ou ancien format, reconstruction complète.")
+            return False
+        votes_par_depute[dep_id] = payload['votes']
+
+    print(f"Incrémental : {len(nouveaux)} nouveaux scrutins, {len(modifies) - len(nouveaux)} modifiés.")
+
+    # 2. Retrait des anciennes positions des scrutins modifiés.
+    deputes_modifies = set()
+    index_modifies = {index_par_numero[scrutin.numero] for scrutin in modifies if scrutin.numero in index_par_numero}
+    if index_modifies:
+        for dep_id, votes in votes_par_depute.items():
+            conserves = [vote for vote in votes if vote[0] not in index_modifies]
+            if len(conserves) != len(votes):
+                votes_par_depute[dep_id] = conserves
+                deputes_modifies.add(dep_id)
+
+    # 3. Ajout en fin de table des nouveaux scrutins, puis report des positions.
+    nb_deputes = len(ids_deputes)
+    for scrutin in nouveaux:
+        index_par_numero[scrutin.numero] = len(table_scrutins)
+        table_scrutins.append(None)
+    matrice.extend(bytes(nb_deputes * len(nouveaux)))
+
+    ligne_par_depute = {dep_id: ligne for ligne, dep_id in enumerate(ids_deputes)}
+    for scrutin in modifies:
+        index = index_par_numero[scrutin.numero]
+        table_scrutins[index] = [scrutin.numero, scrutin.date, scrutin.titre, scrutin.sort]
+        debut_colonne = index * nb_deputes
+        matrice[debut_colonne:debut_colonne + nb_deputes] = bytes(nb_deputes)
+        for ref, position in iter_votes(scrutin):
+            ligne = ligne_par_depute.get(ref)
+            if ligne is None:
+                continue
+            matrice[debut_colonne + ligne] = position
+            if position in POSITIONS_PUBLIEES:
+                votes_par_depute[ref].append([index, position])
+                deputes_modifies.add(ref)
+        scrutins_connus[scrutin.source] = [scrutin.numero, scrutin.content_hash]
+
+    # 4. Même ordre que la reconstruction complète : date décroissante, puis
+    # ordre des fichiers sources à date égale.
+    rang_par_numero = {scrutins_connus[nom][0]: rang for rang, nom in enumerate(sorted(scrutins_connus))}
+    for dep_id in deputes_modifies:
+        votes_par_depute[dep_id].sort(
+            key=lambda vote: (table_scrutins[vote[0]][1], -rang_par_numero.get(table_scrutins[vote[0]][0], 0)),
+            reverse=True
+        )
+
+    ecrire_table_scrutins(table_scrutins)
+    ecrits = sum(ecrire_votes_depute(dep_id, votes_par_depute[dep_id]) for dep_id in ids_deputes if dep_id in deputes_modifies)
+    ecrire_matrice_votes(ids_deputes, table_scrutins, matrice)
+    ecrire_etat(ids_deputes, scrutins_connus)
+    print(f"Fichiers de députés : {ecrits} écrits, {len(ids_deputes) - ecrits} inchangés.")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genere les fichiers de votes par depute")
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help="Processus de parsing des scrutins (defaut 1 = serie ; sortie identique)"
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help="Ne traiter que les scrutins nouveaux ou modifies (repli automatique sur une reconstruction complete)"
+    )
+    args = parser.parse_args()
+
+    # --- 1. CHARGEMENT LISTE DEPUTES ---
+    if not os.path.exists(DIR_SORTIE_VOTES):
+        os.makedirs(DIR_SORTIE_VOTES)
+
+    fichier_deputes_base = trouver_dernier_fichier_deputes(DOSSIER_DEPUTES)
+
+    print(f"Chargement de la liste des députés depuis {fichier_deputes_base}...")
+    liste_base = json_backend.load_path(fichier_deputes_base)
+    ids_deputes = [d['id'] for d in liste_base]
+
+    # --- 2. TRAITEMENT DES SCRUTINS ---
+    if not (args.incremental and traitement_incremental(ids_deputes)):
+        traitement_complet(ids_deputes, workers=args.workers)
+
+    print("Terminé !")
+
+
+if __name__ == "__main__":
+    main()
@@ -31,8 +31,7 @@ $zipPath = "Scrutins.json.zip"
 Write-Host "Téléchargement de $zipUrl..."
 Invoke-WebRequest -Uri $zipUrl -OutFile $zipPath
 
-Write-Host "Extraction..."
-Expand-Archive -Path $zipPath -DestinationPath "Scrutins" -Force
+# Pas d'extraction : les scripts lisent Scrutins.json.zip membre par membre.
 
 Write-Step "5. Traitement des votes"
 python scripts/process_votes.py
@@ -3,12 +3,15 @@
 const fs = require('fs');
 const path = require('path');
 const vm = require('vm');
+const { pathToFileURL } = require('url');
 
 const ROOT_DIR = path.resolve(__dirname, '..');
 const RUNTIME_PATH = path.join(ROOT_DIR, 'js', 'app-runtime.js');
 const LATEST_DEPUTES_PATH = path.join(ROOT_DIR, 'public', 'data', 'deputes_actifs', 'latest.json');
 const VERSIONED_DEPUTES_DIR = path.join(ROOT_DIR, 'public', 'data', 'deputes_actifs');
 const VOTES_DIR = path.join(ROOT_DIR, 'public', 'data', 'votes');
+const VOTES_REPOSITORY_PATH = path.join(ROOT_DIR, 'js', 'data', 'votes-repository.js');
+const COMPACT_VOTES_SCHEMA_VERSION = 2;
 const RAG_LEXICAL_INDEX_PATH = path.join(ROOT_DIR, 'public', 'data', 'rag', 'lexical_index.json');
 const LEGACY_LEXICAL_INDEX_PATH = path.join(ROOT_DIR, 'public', 'data', 'search_index.json');
 const REPORTS_DIR = path.join(ROOT_DIR, 'test-results', 'router-regression');
@@ -850,10 +853,10 @@ function createRunner(options, data, harness) {
       };
 
       const targetedDeputes = selectTargetedDeputes(data.deputes, options);
-      const supplementalCases = buildSupplementalDocumentCases(targetedDeputes);
+      const supplementalCases = await buildSupplementalDocumentCases(targetedDeputes);
 
       for (const [deputeIndex, depute] of targetedDeputes.entries()) {
-        const votes = loadDeputyVotes(depute.id);
+        const votes = await loadDeputyVotes(depute.id);
         const context = buildDeputyContext(depute, votes, data.searchIndexEntries);
         const cases = buildCasesForDeputy(context, data);
 
@@ -867,7 +870,7 @@ function createRunner(options, data, harness) {
       }
 
       for (const testCase of supplementalCases) {
-        const votes = loadDeputyVotes(testCase.depute.id);
+        const votes = await loadDeputyVotes(testCase.depute.id);
         const context = buildDeputyContext(testCase.depute, votes, data.searchIndexEntries);
         await runTestCase(testCase.case, context, harness, summary, casesStream, coverageState);
       }
@@ -896,14 +899,51 @@ function selectTargetedDeputes(deputes, options) {
   return targetedDeputes;
 }
 
-function loadDeputyVotes(deputeId) {
+let votesRepositoryPromise = null;
+const scrutinTables = new Map();
+
+function importVotesRepository() {
+  if (!votesRepositoryPromise) {
+    votesRepositoryPromise = import(pathToFileURL(VOTES_REPOSITORY_PATH).href);
+  }
+  return votesRepositoryPromise;
+}
+
+function loadScrutinTable(fileName) {
+  if (!scrutinTables.has(fileName)) {
+    const table = loadJson(path.join(VOTES_DIR, fileName));
+    if (!Array.isArray(table?.scrutins)) {
+      throw new Error(`Table des scrutins invalide: ${path.relative(ROOT_DIR, path.join(VOTES_DIR, fileName))}`);
+    }
+    scrutinTables.set(fileName, table);
+  }
+  return scrutinTables.get(fileName);
+}
+
+async function loadDeputyVotes(deputeId) {
   const votesPath = path.join(VOTES_DIR, `${deputeId}.json`);
   if (!fs.existsSync(votesPath)) {
     return [];
   }
 
-  const votes = loadJson(votesPath);
-  return Array.isArray(votes) ? votes : [];
+  const payload = loadJson(votesPath);
+  if (Array.isArray(payload)) {
+    return payload;
+  }
+
+  const relativePath = path.relative(ROOT_DIR, votesPath);
+  if (payload?.schemaVersion !== COMPACT_VOTES_SCHEMA_VERSION || !Array.isArray(payload.votes)) {
+    throw new Error(`Format de votes inconnu (schemaVersion ${payload?.schemaVersion ?? 'absent'}): ${relativePath}`);
+  }
+
+  // Meme expansion que le client (loadDeputeVotes), contre la table partagee.
+  const table = loadScrutinTable(payload.table || 'scrutins.json');
+  const unknown = payload.votes.find(([scrutinIndex]) => !Array.isArray(table.scrutins[scrutinIndex]));
+  if (unknown) {
+    throw new Error(`Scrutin ${unknown[0]} absent de la table ${payload.table || 'scrutins.json'}: ${relativePath}`);
+  }
+  const { expandCompactDeputeVotes } = await importVotesRepository();
+  return expandCompactDeputeVotes(payload, table);
 }
 
 function buildDeputyContext(depute, votes, searchIndexEntries) {
@@ -1060,13 +1100,13 @@ function buildCasesForDeputy(context) {
   return cases;
 }
 
-function buildSupplementalDocumentCases(deputes) {
+async function buildSupplementalDocumentCases(deputes) {
   const supportedTypes = new Set(SUPPLEMENTAL_DOCUMENT_TYPES);
   const discovered = new Set();
   const supplementalCases = [];
 
   for (const depute of deputes) {
-    const votes = loadDeputyVotes(depute.id);
+    const votes = await loadDeputyVotes(depute.id);
     const supportedVotes = sortVotesByDate(votes.map(vote => ({
       ...vote,
       exactQuery: extractExactQueryFromTitle(vote.titre || ''),
@@ -1116,7 +1156,7 @@ function buildSupplementalDocumentCases(deputes) {
 
   if (!discovered.has('loi')) {
     for (const depute of deputes) {
-      const votes = loadDeputyVotes(depute.id);
+      const votes = await loadDeputyVotes(depute.id);
       const vote = votes.find(entry => extractLawReferenceQuery(entry.titre || ''));
       if (!vote) {
         continue;
@@ -1132,7 +1172,7 @@ function buildSupplementalDocumentCases(deputes) {
 
   if (!discovered.has('traite')) {
     for (const depute of deputes) {
-      const votes = loadDeputyVotes(depute.id);
+      const votes = await loadDeputyVotes(depute.id);
       const exactQueryVote = votes.find(entry => {
         const title = String(entry.titre || '');
         return (/\baccord\b|\btrait[ée]\b/iu.test(title)) && extractExactQueryFromTitle(title);
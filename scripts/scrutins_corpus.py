@@ -0,0 +1,423 @@
+# -*- coding: utf-8 -*-
+"""Corpus partagé des scrutins (open data Assemblée nationale).
+
+Les scrutins bruts VTAN*.json sont lus une seule fois et ramenés à une
+représentation compacte et typée : métadonnées du scrutin, ventilation par
+groupe et votes nominatifs. Le résultat est mis en cache dans
+Scrutins/corpus.json, invalidé par une empreinte des sources, de sorte que
+process_votes.py, generate_semantic_index.py et link_dossiers.py partagent un
+seul parsing par run au lieu d'en refaire chacun un complet.
+
+Source : l'archive Scrutins.json.zip est lue membre par membre, sans
+extraction sur disque ; à défaut, le dossier extrait Scrutins/json.
+
+Usage :
+    from scrutins_corpus import load_scrutins_corpus
+    for scrutin in load_scrutins_corpus():
+        ...
+"""
+
+import fnmatch
+import glob
+import hashlib
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+
+import json_backend
+
+ARCHIVE_SCRUTINS = "./Scrutins.json.zip"
+DOSSIER_SCRUTINS = "./Scrutins/json"
+SCRUTIN_FILE_PATTERN = "VTAN*.json"
+FICHIER_CORPUS_CACHE = "./Scrutins/corpus.json"
+CORPUS_SCHEMA_VERSION = 2
+# Plusieurs tranches par processus pour lisser les ecarts de taille entre fichiers.
+SHARDS_PER_WORKER = 4
+
+# Codes de position nominative (un octet par votant dans Scrutin.positions).
+POSITION_ABSENT = 0
+POSITION_POUR = 1
+POSITION_CONTRE = 2
+POSITION_ABSTENTION = 3
+POSITION_NON_VOTANT = 4
+POSITION_LABELS = ("Absent", "Pour", "Contre", "Abstention", "Non-votant")
+
+# Rubriques du decompteNominatif, dans l'ordre historique de lecture.
+NOMINATIF_RUBRIQUES = (
+    ("pours", POSITION_POUR),
+    ("contres", POSITION_CONTRE),
+    ("abstentions", POSITION_ABSTENTION),
+    ("nonVotants", POSITION_NON_VOTANT),
+)
+
+# Les positions sont serialisees en chaine de chiffres dans le cache.
+_CODES_TO_DIGITS = bytes.maketrans(bytes(range(10)), b"0123456789")
+_DIGITS_TO_CODES = bytes.maketrans(b"0123456789", bytes(range(10)))
+
+
+class GroupeVentilation(NamedTuple):
+    """Ventilation d'un groupe politique pour un scrutin."""
+
+    organe_ref: str
+    nombre_membres: int
+    position_majoritaire: str
+    # (pour, contre, abstentions, nonVotants)
+    decompte: Tuple[int, int, int, int]
+
+
+class Scrutin(NamedTuple):
+    """Scrutin public sous forme compacte.
+
+    votants et positions sont parallèles : positions[i] est le code
+    POSITION_* de votants[i] (bytes : un octet par votant). content_hash
+    est l'empreinte du JSON brut (cf. compute_content_hash).
+    """
+
+    source: str
+    numero: str
+    uid: str
+    legislature: str
+    date: str
+    titre: str
+    sort: str
+    objet_libelle: str
+    dossier_ref: str
+    groupes: Tuple[GroupeVentilation, ...]
+    votants: Tuple[str, ...]
+    positions: bytes
+    content_hash: str = ""
+
+
+def log(message: str) -> None:
+    print(message, flush=True)
+
+
+def iter_votes(scrutin: Scrutin) -> Iterator[Tuple[str, int]]:
+    """Itère (acteurRef, code de position) pour un scrutin."""
+    return zip(scrutin.votants, scrutin.positions)
+
+
+def _as_list(value) -> list:
+    if not value:
+        return []
+    if isinstance(value, dict):
+        return [value]
+    return list(value)
+
+
+def _as_int(value) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def compute_content_hash(blob: bytes) -> str:
+    """Empreinte courte du contenu brut d'un scrutin (detection des modifications)."""
+    return hashlib.sha256(blob).hexdigest()[:16]
+
+
+def parse_scrutin(payload: Dict, source: str = "", content_hash: str = "") -> Scrutin | None:
+    """Convertit un JSON brut {"scrutin": {...}} en Scrutin (None si inexploitable)."""
+    scrutin = (payload or {}).get("scrutin") if isinstance(payload, dict) else None
+    if not isinstance(scrutin, dict):
+        return None
+
+    numero = str(scrutin.get("numero") or "").strip()
+    if not numero:
+        return None
+
+    objet = scrutin.get("objet") or {}
+    dossier_ref = objet.get("dossierLegislatif")
+    if isinstance(dossier_ref, dict):
+        dossier_ref = dossier_ref.get("uid") or dossier_ref.get("dossierRef")
+
+    groupes = []
+    votants = []
+    positions = bytearray()
+    organe = ((scrutin.get("ventilationVotes") or {}).get("organe")) or {}
+    for groupe in _as_list((organe.get("groupes") or {}).get("groupe")):
+        vote = groupe.get("vote") or {}
+        decompte = vote.get("decompteVoix") or {}
+        groupes.append(GroupeVentilation(
+            organe_ref=str(groupe.get("organeRef") or ""),
+            nombre_membres=_as_int(groupe.get("nombreMembresGroupe")),
+            position_majoritaire=str(vote.get("positionMajoritaire") or ""),
+            decompte=(
+                _as_int(decompte.get("pour")),
+                _as_int(decompte.get("contre")),
+                _as_int(decompte.get("abstentions")),
+                _as_int(decompte.get("nonVotants")),
+            ),
+        ))
+
+        nominatif = vote.get("decompteNominatif") or {}
+        for rubrique, code in NOMINATIF_RUBRIQUES:
+            for votant in _as_list((nominatif.get(rubrique) or {}).get("votant")):
+                acteur_ref = votant.get("acteurRef") if isinstance(votant, dict) else None
+                if acteur_ref:
+                    votants.append(acteur_ref)
+                    positions.append(code)
+
+    return Scrutin(
+        source=source,
+        numero=numero,
+        uid=str(scrutin.get("uid") or ""),
+        legislature=str(scrutin.get("legislature") or ""),
+        date=str(scrutin.get("dateScrutin") or ""),
+        titre=str(scrutin.get("titre") or ""),
+        sort=str(((scrutin.get("sort") or {}).get("code")) or ""),
+        objet_libelle=str(objet.get("libelle") or ""),
+        dossier_ref=str(dossier_ref or "").strip(),
+        groupes=tuple(groupes),
+        votants=tuple(votants),
+        positions=bytes(positions),
+        content_hash=content_hash,
+    )
+
+
+def parse_scrutin_blob(name: str, blob: bytes) -> Scrutin | None:
+    """Decode et convertit un fichier de scrutin brut (None si corrompu ou vide)."""
+    try:
+        payload = json_backend.loads(blob)
+    except Exception:
+        return None
+    return parse_scrutin(payload, name, compute_content_hash(blob))
+
+
+def resolve_scrutins_source(source: str | None = None) -> str | None:
+    """Archive zip si presente, sinon dossier extrait ; None si aucune source."""
+    if source:
+        return source if os.path.exists(source) else None
+    for candidate in (ARCHIVE_SCRUTINS, DOSSIER_SCRUTINS):
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def scrutins_available(source: str | None = None) -> bool:
+    return resolve_scrutins_source(source) is not None
+
+
+def is_archive_source(source: str) -> bool:
+    return os.path.isfile(source) and zipfile.is_zipfile(source)
+
+
+def list_scrutin_files(directory: str = DOSSIER_SCRUTINS) -> List[str]:
+    """Fichiers VTAN*.json tries par nom (ordre historique du pipeline)."""
+    return sorted(glob.glob(os.path.join(directory, SCRUTIN_FILE_PATTERN)))
+
+
+def list_archive_members(archive: zipfile.ZipFile) -> List[zipfile.ZipInfo]:
+    """Membres VTAN*.json de l'archive, tries par nom de fichier comme list_scrutin_files."""
+    members = [
+        info for info in archive.infolist()
+        if not info.is_dir() and fnmatch.fnmatch(os.path.basename(info.filename), SCRUTIN_FILE_PATTERN)
+    ]
+    return sorted(members, key=lambda info: os.path.basename(info.filename))
+
+
+def list_scrutin_names(source: str) -> List[str]:
+    """Noms de fichiers VTAN*.json de la source, tries."""
+    if is_archive_source(source):
+        with zipfile.ZipFile(source) as archive:
+            return [os.path.basename(info.filename) for info in list_archive_members(archive)]
+    return [os.path.basename(path) for path in list_scrutin_files(source)]
+
+
+def iter_scrutin_blobs(source: str, names: List[str] | None = None) -> Iterator[Tuple[str, bytes]]:
+    """Itère (nom de fichier, contenu brut) un scrutin a la fois, zip ou dossier.
+
+    names restreint la lecture a un sous-ensemble de fichiers, dans cet ordre.
+    """
+    if is_archive_source(source):
+        with zipfile.ZipFile(source) as archive:
+            members = {os.path.basename(info.filename): info for info in list_archive_members(archive)}
+            for name in (sorted(members) if names is None else names):
+                if name in members:
+                    yield name, archive.read(members[name])
+        return
+
+    paths = list_scrutin_files(source) if names is None else [os.path.join(source, name) for name in names]
+    for path in paths:
+        if os.path.isfile(path):
+            with open(path, "rb") as f:
+                yield os.path.basename(path), f.read()
+
+
+def iter_scrutin_payloads(
+    source: str | None = None,
+    names: List[str] | None = None,
+) -> Iterator[Tuple[str, Dict]]:
+    """Itère (nom de fichier, JSON brut) ; les scrutins illisibles sont sautes."""
+    source = resolve_scrutins_source(source)
+    if source is None:
+        return
+    for name, blob in iter_scrutin_blobs(source, names):
+        try:
+            payload = json_backend.loads(blob)
+        except Exception:
+            continue  # Fichier corrompu ou vide
+        yield name, payload
+
+
+def compute_sources_fingerprint(source: str) -> str:
+    """Empreinte des sources : change des qu'un scrutin change.
+
+    Zip : (nom, CRC, taille) de chaque membre, lus dans le repertoire central
+    sans decompresser. Dossier : (nom, taille, mtime) de chaque fichier.
+    """
+    digest = hashlib.sha256(f"corpus-v{CORPUS_SCHEMA_VERSION}".encode("utf-8"))
+    if is_archive_source(source):
+        with zipfile.ZipFile(source) as archive:
+            entries = [
+                (os.path.basename(info.filename), info.file_size, info.CRC)
+                for info in list_archive_members(archive)
+            ]
+    else:
+        entries = []
+        for path in list_scrutin_files(source):
+            stat = os.stat(path)
+            entries.append((os.path.basename(path), stat.st_size, stat.st_mtime_ns))
+
+    for name, size, marker in entries:
+        digest.update(f"\x1f{name}\x1e{size}\x1e{marker}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def encode_corpus(scrutins: List[Scrutin], fingerprint: str) -> Dict:
+    """Projection JSON compacte : les acteurRef sont factorises dans une table."""
+    acteurs = {}
+    rows = []
+    for scrutin in scrutins:
+        rows.append([
+            scrutin.source,
+            scrutin.numero,
+            scrutin.uid,
+            scrutin.legislature,
+            scrutin.date,
+            scrutin.titre,
+            scrutin.sort,
+            scrutin.objet_libelle,
+            scrutin.dossier_ref,
+            [[g.organe_ref, g.nombre_membres, g.position_majoritaire, list(g.decompte)] for g in scrutin.groupes],
+            [acteurs.setdefault(ref, len(acteurs)) for ref in scrutin.votants],
+            scrutin.positions.translate(_CODES_TO_DIGITS).decode("ascii"),
+            scrutin.content_hash,
+        ])
+
+    return {
+        "schemaVersion": CORPUS_SCHEMA_VERSION,
+        "fingerprint": fingerprint,
+        "acteurs": list(acteurs),
+        "scrutins": rows,
+    }
+
+
+def decode_corpus(payload: Dict) -> List[Scrutin]:
+    acteurs = [str(ref) for ref in payload.get("acteurs") or []]
+    scrutins = []
+    for row in payload.get("scrutins") or []:
+        scrutins.append(Scrutin(
+            *row[:9],
+            groupes=tuple(
+                GroupeVentilation(organe_ref, nombre_membres, position, tuple(decompte))
+                for organe_ref, nombre_membres, position, decompte in row[9]
+            ),
+            votants=tuple(acteurs[index] for index in row[10]),
+            positions=row[11].encode("ascii").translate(_DIGITS_TO_CODES),
+            content_hash=row[12],
+        ))
+    return scrutins
+
+
+def read_corpus_cache(cache_path: str, fingerprint: str) -> List[Scrutin] | None:
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        payload = json_backend.load_path(cache_path)
+    except Exception:
+        log(f"⚠️ Cache corpus illisible ({cache_path}), reconstruction.")
+        return None
+
+    if payload.get("schemaVersion") != CORPUS_SCHEMA_VERSION or payload.get("fingerprint") != fingerprint:
+        return None
+    return decode_corpus(payload)
+
+
+def write_corpus_cache(cache_path: str, scrutins: List[Scrutin], fingerprint: str) -> None:
+    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+    tmp = cache_path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(json_backend.dumps(encode_corpus(scrutins, fingerprint), compact=True))
+    os.replace(tmp, cache_path)
+
+
+def parse_scrutin_sources(source: str, names: List[str] | None = None) -> List[Scrutin]:
+    scrutins = []
+    for count, (name, blob) in enumerate(iter_scrutin_blobs(source, names), start=1):
+        if count % 500 == 0:
+            log(f"Traitement... {count}")
+        scrutin = parse_scrutin_blob(name, blob)
+        if scrutin is not None:
+            scrutins.append(scrutin)
+    return scrutins
+
+
+def parse_scrutin_sources_parallel(source: str, workers: int) -> List[Scrutin]:
+    """Decoupe la liste triee des fichiers en tranches contigues reparties sur un pool.
+
+    Chaque processus rouvre la source et parse sa tranche ; les tranches sont
+    recollees dans l'ordre de soumission, donc le resultat est identique au
+    parcours serie.
+    """
+    names = list_scrutin_names(source)
+    shard_count = min(len(names), workers * SHARDS_PER_WORKER)
+    if workers <= 1 or shard_count <= 1:
+        return parse_scrutin_sources(source, names)
+
+    shard_size = (len(names) + shard_count - 1) // shard_count
+    shards = [names[start:start + shard_size] for start in range(0, len(names), shard_size)]
+    log(f"Parsing parallele : {len(names)} fichiers, {len(shards)} tranches, {workers} processus.")
+
+    scrutins = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for shard_scrutins in executor.map(parse_scrutin_sources, [source] * len(shards), shards):
+            scrutins.extend(shard_scrutins)
+    return scrutins
+
+
+def load_scrutins_corpus(
+    source: str | None = None,
+    cache_path: str | None = FICHIER_CORPUS_CACHE,
+    workers: int = 1,
+) -> List[Scrutin]:
+    """Charge le corpus, depuis le cache si les sources n'ont pas bouge.
+
+    source vaut par defaut l'archive Scrutins.json.zip, ou a defaut le dossier
+    Scrutins/json. L'ordre est celui des noms de fichiers tries.
+    cache_path=None desactive le cache (lecture et ecriture). workers > 1
+    repartit le parsing sur un pool de processus (resultat identique).
+    """
+    source = resolve_scrutins_source(source)
+    if source is None:
+        return []
+
+    fingerprint = compute_sources_fingerprint(source)
+    if cache_path:
+        cached = read_corpus_cache(cache_path, fingerprint)
+        if cached is not None:
+            log(f"Corpus scrutins relu depuis le cache {cache_path} : {len(cached)} scrutins.")
+            return cached
+
+    log(f"Analyse des scrutins de {source}...")
+    if workers > 1:
+        scrutins = parse_scrutin_sources_parallel(source, workers)
+    else:
+        scrutins = parse_scrutin_sources(source)
+
+    if cache_path:
+        write_corpus_cache(cache_path, scrutins, fingerprint)
+        log(f"Corpus scrutins mis en cache dans {cache_path} : {len(scrutins)} scrutins.")
+    return scrutins
@@ -0,0 +1,415 @@
+# -*- coding: utf-8 -*-
+"""Index ANN (IVF) sur les vecteurs semantiques int8 packes.
+
+Les vecteurs de l'index packe (semantic_index_packed.json + .i8) sont
+regroupes par k-means spherique en `lists` listes inversees. Une requete ne
+compare alors que les centroides, puis les vecteurs des `nprobe` listes les
+plus proches, au lieu de tout le corpus : le cout croit en O(sqrt(n)) et non
+plus en O(n).
+
+Artefact : un entete JSON (semantic_index_ivf.json) et un binaire .ivf
+contenant, a la suite :
+    centroids    int8   [lists, dimension]  (normalises, echelle 127)
+    listOffsets  uint32 [lists + 1]         (little-endian)
+    rowIds       uint32 [rows]              (lignes de la matrice packee, par liste)
+
+L'index ne recopie pas les vecteurs : il reference les lignes de la matrice
+packee (synchronisation verifiee par packedDataSha256). L'entete publie le
+nombre de listes a sonder (defaultProbes) pour atteindre le rappel cible,
+mesure a la construction contre la recherche exhaustive ; les latences ne
+sont rapportees que par le harnais ci-dessous.
+
+Usage (searcher de reference, rappel@k et latence par nprobe) :
+    python scripts/semantic_ann.py public/data/rag/semantic_index_packed.json --k 10
+"""
+
+import argparse
+import hashlib
+import os
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+import json_backend
+
+SEMANTIC_ANN_SCHEMA_VERSION = 1
+SEMANTIC_ANN_FORMAT = "ivf-flat-int8"
+SEMANTIC_ANN_DATA_EXTENSION = ".ivf"
+SEMANTIC_ANN_KMEANS_ITERATIONS = 20
+SEMANTIC_ANN_SEED = 7
+# Rappel@k vise pour choisir defaultProbes.
+SEMANTIC_ANN_TARGET_RECALL = 0.95
+SEMANTIC_ANN_EVAL_K = 10
+SEMANTIC_ANN_EVAL_QUERIES = 200
+# Requetes d'evaluation : vecteur de document bruite (bruit de norme 0.6),
+# proxy d'une question proche mais distincte du texte indexe.
+SEMANTIC_ANN_EVAL_NOISE = 0.6
+VECTOR_SCALE = 127
+ASSIGN_CHUNK_ROWS = 8192
+
+
+def choose_list_count(rows: int) -> int:
+    """~sqrt(n) listes : equilibre cout centroides / cout des listes sondees."""
+    return max(1, min(rows, int(round(np.sqrt(rows)))))
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def assign_to_centroids(vectors: np.ndarray, centroids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(liste la plus proche, similarite) par vecteur, par tranches pour borner la memoire."""
+    assignments = np.empty(len(vectors), dtype=np.int64)
+    similarities = np.empty(len(vectors), dtype=np.float32)
+    for start in range(0, len(vectors), ASSIGN_CHUNK_ROWS):
+        scores = vectors[start:start + ASSIGN_CHUNK_ROWS] @ centroids.T
+        assignments[start:start + len(scores)] = np.argmax(scores, axis=1)
+        similarities[start:start + len(scores)] = scores[np.arange(len(scores)), assignments[start:start + len(scores)]]
+    return assignments, similarities
+
+
+def train_spherical_kmeans(
+    vectors: np.ndarray,
+    lists: int,
+    iterations: int = SEMANTIC_ANN_KMEANS_ITERATIONS,
+    seed: int = SEMANTIC_ANN_SEED,
+) -> np.ndarray:
+    """Centroides L2-normalises (k-means sur la sphere, similarite cosinus).
+
+    Deterministe pour une matrice donnee (graine fixe). Une liste videe est
+    re-amorcee sur le vecteur le moins bien represente.
+    """
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), size=lists, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignments, similarities = assign_to_centroids(vectors, centroids)
+        counts = np.bincount(assignments, minlength=lists)
+        sums = np.stack(
+            [np.bincount(assignments, weights=vectors[:, column], minlength=lists) for column in range(vectors.shape[1])],
+            axis=1
+        ).astype(np.float32)
+
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            worst = np.argsort(similarities, kind="stable")[:len(empty)]
+            sums[empty] = vectors[worst]
+
+        centroids = normalize_rows(sums)
+
+    return centroids
+
+
+def build_ivf_index(matrix: np.ndarray, lists: int | None = None, seed: int = SEMANTIC_ANN_SEED) -> Dict:
+    """Construit l'IVF d'une matrice int8 [rows, dimension] (en memoire)."""
+    vectors = normalize_rows(matrix)
+    lists = choose_list_count(len(vectors)) if lists is None else max(1, min(lists, len(vectors)))
+    centroids = train_spherical_kmeans(vectors, lists, seed=seed)
+    # Les centroides sont publies en int8 : l'affectation finale utilise la
+    # meme version quantifiee que le client pour choisir les listes a sonder.
+    centroids_int8 = np.clip(np.round(centroids * VECTOR_SCALE), -VECTOR_SCALE, VECTOR_SCALE).astype(np.int8)
+    assignments, _ = assign_to_centroids(vectors, centroids_int8.astype(np.float32))
+
+    order = np.argsort(assignments, kind="stable")
+    counts = np.bincount(assignments, minlength=lists)
+    list_offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.uint32)
+
+    return {
+        "centroids": centroids_int8,
+        "listOffsets": list_offsets,
+        "rowIds": order.astype(np.uint32),
+    }
+
+
+def prepare_ivf_search(ivf: Dict, matrix: np.ndarray) -> Dict:
+    """Disposition de recherche : centroides float32 et vecteurs recopies dans l'ordre des listes.
+
+    Une liste sondee devient une tranche contigue (pas de gather ligne a
+    ligne) ; c'est aussi ce que fait un client au chargement, en O(n).
+    """
+    row_ids = np.asarray(ivf["rowIds"], dtype=np.int64)
+    return {
+        "centroids": np.asarray(ivf["centroids"], dtype=np.float32),
+        "listOffsets": np.asarray(ivf["listOffsets"], dtype=np.int64),
+        "rowIds": row_ids,
+        "vectors": np.asarray(matrix, dtype=np.float32)[row_ids],
+    }
+
+
+def search_ivf(
+    query: np.ndarray,
+    search_index: Dict,
+    k: int = SEMANTIC_ANN_EVAL_K,
+    nprobe: int = 1,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Searcher de reference : (lignes packees, scores) des k meilleurs vecteurs, par score decroissant.
+
+    `search_index` vient de prepare_ivf_search.
+    """
+    query = np.asarray(query, dtype=np.float32)
+    centroids = search_index["centroids"]
+    offsets = search_index["listOffsets"]
+    nprobe = max(1, min(nprobe, len(centroids)))
+
+    if nprobe < len(centroids):
+        probed = np.argpartition(-(centroids @ query), nprobe - 1)[:nprobe]
+    else:
+        probed = np.arange(len(centroids))
+
+    positions = []
+    scores = []
+    for list_id in probed:
+        start, end = offsets[list_id], offsets[list_id + 1]
+        if end > start:
+            positions.append(np.arange(start, end))
+            scores.append(search_index["vectors"][start:end] @ query)
+    if not positions:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+    positions = np.concatenate(positions)
+    scores = np.concatenate(scores)
+    rows = search_index["rowIds"][positions]
+    top = min(k, len(rows))
+    best = np.argpartition(-scores, top - 1)[:top]
+    best = best[np.lexsort((rows[best], -scores[best]))]
+    return rows[best], scores[best]
+
+
+def exact_search(query: np.ndarray, matrix: np.ndarray, k: int) -> np.ndarray:
+    scores = matrix.astype(np.float32, copy=False) @ np.asarray(query, dtype=np.float32)
+    top = min(k, len(scores))
+    best = np.argpartition(-scores, top - 1)[:top]
+    return best[np.lexsort((best, -scores[best]))]
+
+
+def build_evaluation_queries(matrix: np.ndarray, count: int = SEMANTIC_ANN_EVAL_QUERIES, seed: int = SEMANTIC_ANN_SEED) -> np.ndarray:
+    """Requetes synthetiques reproductibles : documents tires au sort, bruites, renormalises."""
+    rng = np.random.default_rng(seed)
+    picked = rng.choice(len(matrix), size=min(count, len(matrix)), replace=False)
+    noise = normalize_rows(rng.standard_normal((len(picked), matrix.shape[1])).astype(np.float32))
+    return normalize_rows(normalize_rows(matrix[picked]) + SEMANTIC_ANN_EVAL_NOISE * noise)
+
+
+def probe_ladder(lists: int) -> List[int]:
+    ladder = []
+    nprobe = 1
+    while nprobe < lists:
+        ladder.append(nprobe)
+        nprobe *= 2
+    ladder.append(lists)
+    return ladder
+
+
+def evaluate_ivf_recall(
+    ivf: Dict,
+    matrix: np.ndarray,
+    queries: np.ndarray,
+    k: int = SEMANTIC_ANN_EVAL_K,
+    probes: List[int] | None = None,
+) -> List[Dict]:
+    """Rappel@k moyen et latence moyenne (ms) du searcher par nprobe, contre la recherche exhaustive."""
+    vectors = matrix.astype(np.float32)
+    search_index = prepare_ivf_search(ivf, vectors)
+    truths = [set(exact_search(query, vectors, k).tolist()) for query in queries]
+    results = []
+    for nprobe in probes or probe_ladder(len(ivf["centroids"])):
+        hits = 0
+        started = time.perf_counter()
+        for query, truth in zip(queries, truths):
+            rows, _scores = search_ivf(query, search_index, k=k, nprobe=nprobe)
+            hits += len(truth.intersection(rows.tolist()))
+        elapsed_ms = (time.perf_counter() - started) * 1000 / max(1, len(queries))
+        results.append({
+            "nprobe": nprobe,
+            "recall": round(hits / max(1, sum(len(truth) for truth in truths)), 4),
+            "meanQueryMs": round(elapsed_ms, 4),
+        })
+    return results
+
+
+def choose_default_probes(evaluation: List[Dict], target_recall: float = SEMANTIC_ANN_TARGET_RECALL) -> int:
+    for entry in evaluation:
+        if entry["recall"] >= target_recall:
+            return entry["nprobe"]
+    return evaluation[-1]["nprobe"]
+
+
+def get_ivf_data_path(header_path: str) -> str:
+    return os.path.splitext(header_path)[0] + SEMANTIC_ANN_DATA_EXTENSION
+
+
+def read_current_ivf_header(header_path: str, packed_header: Dict) -> Dict | None:
+    """Entete de l'IVF en place s'il est intact, au format courant et construit sur cette matrice packee."""
+    try:
+        header, _ivf = read_ivf_index(header_path)
+    except (OSError, KeyError, ValueError):
+        return None
+    if (
+        header.get("schemaVersion") != SEMANTIC_ANN_SCHEMA_VERSION
+        or header.get("format") != SEMANTIC_ANN_FORMAT
+        or header.get("packedDataSha256") != packed_header.get("dataSha256")
+    ):
+        return None
+    return header
+
+
+def write_ivf_index(header_path: str, packed_header_path: str, packed_header: Dict, matrix: np.ndarray) -> Dict:
+    """Construit, evalue et ecrit l'IVF d'un index packe. Retourne l'entete ecrit.
+
+    Si l'IVF en place a ete construit sur la meme matrice packee
+    (packedDataSha256), ni k-means ni evaluation ne sont relances : son entete
+    est retourne tel quel. L'entete ne publie que des mesures reproductibles
+    (rappel), pas de latence : deux constructions sur la meme matrice donnent
+    les memes octets.
+    """
+    from generate_semantic_index import write_bytes_if_changed
+
+    current = read_current_ivf_header(header_path, packed_header)
+    if current is not None:
+        return current
+
+    ivf = build_ivf_index(matrix)
+    queries = build_evaluation_queries(matrix)
+    evaluation = evaluate_ivf_recall(ivf, matrix, queries)
+    default_probes = choose_default_probes(evaluation)
+
+    sections = {}
+    blobs = []
+    offset = 0
+    for name, array, dtype in (
+        ("centroids", ivf["centroids"], "int8"),
+        ("listOffsets", ivf["listOffsets"], "uint32"),
+        ("rowIds", ivf["rowIds"], "uint32"),
+    ):
+        blob = np.ascontiguousarray(array).astype("<" + ("i1" if dtype == "int8" else "u4"), copy=False).tobytes()
+        sections[name] = {"offset": offset, "bytes": len(blob), "dtype": dtype, "shape": list(array.shape)}
+        blobs.append(blob)
+        offset += len(blob)
+    data = b"".join(blobs)
+
+    data_path = get_ivf_data_path(header_path)
+    header = {
+        "schemaVersion": SEMANTIC_ANN_SCHEMA_VERSION,
+        "generatedAt": packed_header.get("generatedAt"),
+        "format": SEMANTIC_ANN_FORMAT,
+        "metric": "dot",
+        "packedPath": os.path.basename(packed_header_path),
+        "packedDataSha256": packed_header.get("dataSha256"),
+        "rows": int(matrix.shape[0]),
+        "dimension": int(matrix.shape[1]),
+        "lists": int(len(ivf["centroids"])),
+        "centroidScale": VECTOR_SCALE,
+        "defaultProbes": default_probes,
+        "dataPath": os.path.basename(data_path),
+        "dataBytes": len(data),
+        "dataSha256": hashlib.sha256(data).hexdigest(),
+        "sections": sections,
+        "evaluation": {
+            "k": SEMANTIC_ANN_EVAL_K,
+            "queries": int(len(queries)),
+            "queryNoise": SEMANTIC_ANN_EVAL_NOISE,
+            "targetRecall": SEMANTIC_ANN_TARGET_RECALL,
+            "probes": [{"nprobe": entry["nprobe"], "recall": entry["recall"]} for entry in evaluation]
+        }
+    }
+
+    write_bytes_if_changed(data_path, data)
+    write_bytes_if_changed(header_path, json_backend.dumps(header))
+    return header
+
+
+def read_ivf_index(header_path: str) -> Tuple[Dict, Dict]:
+    """Relit un IVF : (entete, {centroids, listOffsets, rowIds})."""
+    header = json_backend.load_path(header_path)
+    with open(os.path.join(os.path.dirname(header_path), header["dataPath"]), "rb") as f:
+        data = f.read()
+    if hashlib.sha256(data).hexdigest() != header.get("dataSha256"):
+        raise ValueError(f"Index IVF corrompu ({header_path}) : empreinte differente")
+
+    arrays = {}
+    for name, section in header["sections"].items():
+        dtype = np.dtype("<i1") if section["dtype"] == "int8" else np.dtype("<u4")
+        chunk = data[section["offset"]:section["offset"] + section["bytes"]]
+        arrays[name] = np.frombuffer(chunk, dtype=dtype).reshape(section["shape"])
+    return header, arrays
+
+
+def describe_ivf_artifact(header_path: str, packed_header_path: str) -> Dict | None:
+    """Projection manifest de l'IVF, si present et synchrone avec l'index packe reference."""
+    if not os.path.exists(header_path) or not os.path.exists(packed_header_path):
+        return None
+
+    try:
+        header = json_backend.load_path(header_path)
+        packed_header = json_backend.load_path(packed_header_path)
+    except Exception:
+        return None
+
+    data_path = os.path.join(os.path.dirname(header_path), header.get("dataPath") or "")
+    if header.get("packedDataSha256") != packed_header.get("dataSha256") or not os.path.isfile(data_path):
+        return None
+
+    with open(header_path, "rb") as f:
+        header_sha256 = hashlib.sha256(f.read()).hexdigest()
+
+    default_probes = header.get("defaultProbes")
+    measured = next(
+        (entry for entry in header.get("evaluation", {}).get("probes", []) if entry.get("nprobe") == default_probes),
+        {}
+    )
+    return {
+        "path": os.path.basename(header_path),
+        "bytes": os.path.getsize(header_path),
+        "sha256": header_sha256,
+        "format": header.get("format", SEMANTIC_ANN_FORMAT),
+        "dataPath": header.get("dataPath"),
+        "dataBytes": os.path.getsize(data_path),
+        "dataSha256": header.get("dataSha256"),
+        "lists": header.get("lists"),
+        "defaultProbes": default_probes,
+        "recallAtK": measured.get("recall"),
+        "k": header.get("evaluation", {}).get("k")
+    }
+
+
+def main():
+    from generate_semantic_index import read_packed_semantic_index
+
+    parser = argparse.ArgumentParser(description="Rappel@k et latence du searcher IVF de reference")
+    parser.add_argument("packed_header", help="Entete d'index packe (ex. public/data/rag/semantic_index_packed.json)")
+    parser.add_argument("--ivf", default=None, help="Entete IVF (defaut : semantic_index_ivf.json a cote)")
+    parser.add_argument("--k", type=int, default=SEMANTIC_ANN_EVAL_K)
+    parser.add_argument("--queries", type=int, default=SEMANTIC_ANN_EVAL_QUERIES)
+    args = parser.parse_args()
+
+    packed_header, matrix = read_packed_semantic_index(args.packed_header)
+    ivf_path = args.ivf or args.packed_header.replace("_packed.json", "_ivf.json")
+    if os.path.exists(ivf_path):
+        header, ivf = read_ivf_index(ivf_path)
+        if header.get("packedDataSha256") != packed_header.get("dataSha256"):
+            print(f"⚠️ {ivf_path} ne correspond pas a l'index packe, reconstruction en memoire")
+            ivf = build_ivf_index(matrix)
+    else:
+        print(f"ℹ️ {ivf_path} absent, construction en memoire")
+        ivf = build_ivf_index(matrix)
+
+    queries = build_evaluation_queries(matrix, count=args.queries)
+    exact_started = time.perf_counter()
+    vectors = matrix.astype(np.float32)
+    for query in queries:
+        exact_search(query, vectors, args.k)
+    exact_ms = (time.perf_counter() - exact_started) * 1000 / max(1, len(queries))
+
+    print(f"\n📊 {matrix.shape[0]} vecteurs x {matrix.shape[1]}, {len(ivf['centroids'])} listes, {len(queries)} requetes")
+    print(f"   exhaustif : {exact_ms:.3f} ms/requete")
+    print("\nnprobe | rappel@k | ms/requete")
+    for entry in evaluate_ivf_recall(ivf, matrix, queries, k=args.k):
+        print(f"{entry['nprobe']:>6} | {entry['recall']:>8.4f} | {entry['meanQueryMs']:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+"""Codes binaires (1 bit par composante) des vecteurs semantiques packes.
+
+Premier etage de recherche a 1/8 des octets de l'index int8 : chaque vecteur
+est reduit au signe de ses composantes, apres centrage par le vecteur moyen
+du corpus (les embeddings E5 partagent une forte composante commune qui, non
+retiree, fixerait la plupart des signes). La requete est codee de meme ; les
+`shortlist` documents les plus proches en distance de Hamming sont ensuite
+re-classes par produit scalaire exact sur leurs lignes int8 (index packe,
+recuperables a l'unite : ligne r = octets [r*dimension, (r+1)*dimension)).
+
+Artefact : un entete JSON (semantic_index_binary.json, avec le vecteur de
+centrage) et un binaire .b1 de `rows` codes de dimension/8 octets (bits de
+poids fort en premier, comme numpy.packbits). L'entete publie la taille de
+shortlist (defaultShortlist) atteignant le rappel cible, mesuree a la
+construction contre la recherche exhaustive int8 ; les latences ne sont
+rapportees que par le harnais ci-dessous.
+
+Usage (harnais d'evaluation, rappel@k par taille de shortlist) :
+    python scripts/semantic_binary.py public/data/rag/semantic_index_packed.json --k 10
+"""
+
+import argparse
+import hashlib
+import os
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+import json_backend
+from semantic_ann import (
+    SEMANTIC_ANN_EVAL_K,
+    SEMANTIC_ANN_EVAL_NOISE,
+    SEMANTIC_ANN_EVAL_QUERIES,
+    SEMANTIC_ANN_TARGET_RECALL,
+    VECTOR_SCALE,
+    build_evaluation_queries,
+    exact_search,
+)
+
+SEMANTIC_BINARY_SCHEMA_VERSION = 1
+SEMANTIC_BINARY_FORMAT = "sign-bits-centered"
+SEMANTIC_BINARY_DATA_EXTENSION = ".b1"
+SEMANTIC_BINARY_SHORTLISTS = (10, 20, 50, 100, 200, 500, 1000)
+
+# Nombre de bits a 1 par valeur d'octet (popcount par table).
+_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def compute_center(matrix: np.ndarray) -> np.ndarray:
+    """Vecteur moyen du corpus, a l'echelle unitaire (celle des requetes)."""
+    return matrix.astype(np.float32).mean(axis=0) / VECTOR_SCALE
+
+
+def encode_sign_bits(vectors: np.ndarray, center: np.ndarray) -> np.ndarray:
+    """Codes packes [n, dimension/8] de signe(vecteur - centre) ; vecteurs a l'echelle unitaire."""
+    return np.packbits(np.atleast_2d(vectors) - center > 0, axis=1)
+
+
+def hamming_distances(codes: np.ndarray, query_code: np.ndarray) -> np.ndarray:
+    """Distances de Hamming code par code (popcount natif si numpy >= 2.0, table sinon)."""
+    if codes.shape[1] % 8 == 0:
+        # Mots de 64 bits : 8 fois moins d'operations qu'octet par octet.
+        codes = codes.view(np.uint64)
+        query_code = query_code.view(np.uint64)
+    differing = np.bitwise_xor(codes, query_code)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(differing).sum(axis=1, dtype=np.int32)
+    return _POPCOUNT[differing.view(np.uint8)].sum(axis=1, dtype=np.int32)
+
+
+def search_binary(
+    query: np.ndarray,
+    binary_index: Dict,
+    matrix: np.ndarray,
+    k: int = SEMANTIC_ANN_EVAL_K,
+    shortlist: int = 100,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Searcher de reference : Hamming sur les codes, puis re-classement int8 de la shortlist.
+
+    Retourne (lignes packees, scores) par score decroissant.
+    """
+    query = np.asarray(query, dtype=np.float32)
+    codes = binary_index["codes"]
+    shortlist = max(k, min(shortlist, len(codes)))
+
+    distances = hamming_distances(codes, encode_sign_bits(query, binary_index["center"])[0])
+    if shortlist < len(codes):
+        candidates = np.argpartition(distances, shortlist - 1)[:shortlist]
+    else:
+        candidates = np.arange(len(codes))
+
+    scores = matrix[candidates].astype(np.float32, copy=False) @ query
+    top = min(k, len(candidates))
+    best = np.argpartition(-scores, top - 1)[:top]
+    best = best[np.lexsort((candidates[best], -scores[best]))]
+    return candidates[best].astype(np.int64), scores[best]
+
+
+def evaluate_binary_recall(
+    binary_index: Dict,
+    matrix: np.ndarray,
+    queries: np.ndarray,
+    k: int = SEMANTIC_ANN_EVAL_K,
+    shortlists: Tuple[int, ...] = SEMANTIC_BINARY_SHORTLISTS,
+) -> List[Dict]:
+    """Rappel@k et latence (ms) par taille de shortlist, contre l'exhaustif sur les vecteurs int8."""
+    vectors = matrix.astype(np.float32)
+    truths = [set(exact_search(query, vectors, k).tolist()) for query in queries]
+    results = []
+    for shortlist in shortlists:
+        if shortlist < k:
+            continue
+        hits = 0
+        started = time.perf_counter()
+        for query, truth in zip(queries, truths):
+            rows, _scores = search_binary(query, binary_index, vectors, k=k, shortlist=shortlist)
+            hits += len(truth.intersection(rows.tolist()))
+        results.append({
+            "shortlist": shortlist,
+            "recall": round(hits / max(1, sum(len(truth) for truth in truths)), 4),
+            "meanQueryMs": round((time.perf_counter() - started) * 1000 / max(1, len(queries)), 4),
+        })
+        if shortlist >= len(matrix):
+            break
+    return results
+
+
+def choose_default_shortlist(evaluation: List[Dict], target_recall: float = SEMANTIC_ANN_TARGET_RECALL) -> int:
+    for entry in evaluation:
+        if entry["recall"] >= target_recall:
+            return entry["shortlist"]
+    return evaluation[-1]["shortlist"]
+
+
+def build_binary_index(matrix: np.ndarray) -> Dict:
+    center = compute_center(matrix)
+    return {
+        "center": center,
+        "codes": encode_sign_bits(matrix.astype(np.float32) / VECTOR_SCALE, center),
+    }
+
+
+def get_binary_data_path(header_path: str) -> str:
+    return os.path.splitext(header_path)[0] + SEMANTIC_BINARY_DATA_EXTENSION
+
+
+def read_current_binary_header(header_path: str, packed_header: Dict) -> Dict | None:
+    """Entete des codes en place s'ils sont intacts, au format courant et calcules sur cette matrice packee."""
+    try:
+        header, _binary_index = read_binary_index(header_path)
+    except (OSError, KeyError, ValueError):
+        return None
+    if (
+        header.get("schemaVersion") != SEMANTIC_BINARY_SCHEMA_VERSION
+        or header.get("format") != SEMANTIC_BINARY_FORMAT
+        or header.get("packedDataSha256") != packed_header.get("dataSha256")
+    ):
+        return None
+    return header
+
+
+def write_binary_index(header_path: str, packed_header_path: str, packed_header: Dict, matrix: np.ndarray) -> Dict:
+    """Construit, evalue et ecrit les codes binaires d'un index packe. Retourne l'entete ecrit.
+
+    Des codes en place calcules sur la meme matrice packee (packedDataSha256)
+    sont gardes sans nouvelle evaluation. Comme pour l'IVF, l'entete ne publie
+    que le rappel par shortlist, pas de latence.
+    """
+    from generate_semantic_index import write_bytes_if_changed
+
+    current = read_current_binary_header(header_path, packed_header)
+    if current is not None:
+        return current
+
+    binary_index = build_binary_index(matrix)
+    queries = build_evaluation_queries(matrix)
+    evaluation = evaluate_binary_recall(binary_index, matrix, queries)
+
+    data = binary_index["codes"].tobytes(order="C")
+    data_path = get_binary_data_path(header_path)
+    header = {
+        "schemaVersion": SEMANTIC_BINARY_SCHEMA_VERSION,
+        "generatedAt": packed_header.get("generatedAt"),
+        "format": SEMANTIC_BINARY_FORMAT,
+        "bitOrder": "msb-first",
+        "packedPath": os.path.basename(packed_header_path),
+        "packedDataSha256": packed_header.get("dataSha256"),
+        "rows": int(matrix.shape[0]),
+        "dimension": int(matrix.shape[1]),
+        "bytesPerVector": int(binary_index["codes"].shape[1]),
+        # Centrage a appliquer a la requete (L2-normalisee) avant le signe.
+        "center": [round(float(value), 6) for value in binary_index["center"]],
+        "defaultShortlist": choose_default_shortlist(evaluation),
+        "dataPath": os.path.basename(data_path),
+        "dataBytes": len(data),
+        "dataSha256": hashlib.sha256(data).hexdigest(),
+        "evaluation": {
+            "k": SEMANTIC_ANN_EVAL_K,
+            "queries": int(len(queries)),
+            "queryNoise": SEMANTIC_ANN_EVAL_NOISE,
+            "targetRecall": SEMANTIC_ANN_TARGET_RECALL,
+            "reference": "int8-exhaustive",
+            "shortlists": [{"shortlist": entry["shortlist"], "recall": entry["recall"]} for entry in evaluation]
+        }
+    }
+
+    write_bytes_if_changed(data_path, data)
+    write_bytes_if_changed(header_path, json_backend.dumps(header))
+    return header
+
+
+def read_binary_index(header_path: str) -> Tuple[Dict, Dict]:
+    """Relit des codes binaires : (entete, {center, codes})."""
+    header = json_backend.load_path(header_path)
+    with open(os.path.join(os.path.dirname(header_path), header["dataPath"]), "rb") as f:
+        data = f.read()
+    if hashlib.sha256(data).hexdigest() != header.get("dataSha256"):
+        raise ValueError(f"Codes binaires corrompus ({header_path}) : empreinte differente")
+
+    codes = np.frombuffer(data, dtype=np.uint8).reshape(header["rows"], header["bytesPerVector"])
+    return header, {"center": np.asarray(header["center"], dtype=np.float32), "codes": codes}
+
+
+def describe_binary_artifact(header_path: str, packed_header_path: str) -> Dict | None:
+    """Projection manifest des codes binaires, si presents et synchrones avec l'index packe."""
+    if not os.path.exists(header_path) or not os.path.exists(packed_header_path):
+        return None
+
+    try:
+        header = json_backend.load_path(header_path)
+        packed_header = json_backend.load_path(packed_header_path)
+    except Exception:
+        return None
+
+    data_path = os.path.join(os.path.dirname(header_path), header.get("dataPath") or "")
+    if header.get("packedDataSha256") != packed_header.get("dataSha256") or not os.path.isfile(data_path):
+        return None
+
+    with open(header_path, "rb") as f:
+        header_sha256 = hashlib.sha256(f.read()).hexdigest()
+
+    default_shortlist = header.get("defaultShortlist")
+    measured = next(
+        (entry for entry in header.get("evaluation", {}).get("shortlists", []) if entry.get("shortlist") == default_shortlist),
+        {}
+    )
+    return {
+        "path": os.path.basename(header_path),
+        "bytes": os.path.getsize(header_path),
+        "sha256": header_sha256,
+        "format": header.get("format", SEMANTIC_BINARY_FORMAT),
+        "dataPath": header.get("dataPath"),
+        "dataBytes": os.path.getsize(data_path),
+        "dataSha256": header.get("dataSha256"),
+        "bytesPerVector": header.get("bytesPerVector"),
+        "rescoring": "packed-int8",
+        "defaultShortlist": default_shortlist,
+        "recallAtK": measured.get("recall"),
+        "k": header.get("evaluation", {}).get("k")
+    }
+
+
+def main():
+    from generate_semantic_index import read_packed_semantic_index
+
+    parser = argparse.ArgumentParser(description="Rappel@k des codes binaires + re-classement int8, par shortlist")
+    parser.add_argument("packed_header", help="Entete d'index packe (ex. public/data/rag/semantic_index_packed.json)")
+    parser.add_argument("--k", type=int, default=SEMANTIC_ANN_EVAL_K)
+    parser.add_argument("--queries", type=int, default=SEMANTIC_ANN_EVAL_QUERIES)
+    args = parser.parse_args()
+
+    _packed_header, matrix = read_packed_semantic_index(args.packed_header)
+    binary_index = build_binary_index(matrix)
+    queries = build_evaluation_queries(matrix, count=args.queries)
+
+    code_bytes = binary_index["codes"].nbytes
+    print(f"\n📊 {matrix.shape[0]} vecteurs x {matrix.shape[1]}, {len(queries)} requetes")
+    print(f"   codes : {code_bytes / 1024:.1f} Ko contre {matrix.nbytes / 1024:.1f} Ko en int8 ({code_bytes / matrix.nbytes:.1%})")
+    print("\nshortlist | rappel@k | ms/requete")
+    for entry in evaluate_binary_recall(binary_index, matrix, queries, k=args.k):
+        print(f"{entry['shortlist']:>9} | {entry['recall']:>8.4f} | {entry['meanQueryMs']:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
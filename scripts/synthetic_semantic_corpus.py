@@ -0,0 +1,26 @@
+"""Corpus semantique synthetique commun aux tests des index ANN et binaire.
+
+Vecteurs int8 regroupes autour de themes, avec une composante commune forte
+(les embeddings E5 sont tres anisotropes), au format du payload single_vector
+attendu par write_packed_semantic_index. Graine fixe : meme corpus a chaque
+appel pour des parametres donnes.
+"""
+
+from typing import Dict
+
+import numpy as np
+
+
+def build_synthetic_semantic_payload(rows: int = 12000, dimension: int = 384, themes: int = 150) -> Dict:
+    rng = np.random.default_rng(11)
+    common = rng.standard_normal(dimension)
+    centers = rng.standard_normal((themes, dimension))
+    vectors = 2.0 * common + 0.9 * centers[rng.integers(0, themes, rows)] + rng.standard_normal((rows, dimension))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    quantized = np.clip(np.round(vectors * 127), -127, 127).astype(int)
+    return {
+        "schemaVersion": 2,
+        "generatedAt": "2026-01-01T00:00:00Z",
+        "model": {"dimension": dimension, "strategy": "single_vector", "vector_scale": 127},
+        "votes": {str(row + 1): {"embedding": quantized[row].tolist()} for row in range(rows)}
+    }
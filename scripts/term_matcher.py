@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""Recherche simultanee de termes (Aho-Corasick) pour la classification des scrutins.
+
+classify_vote et get_synonyms testaient chaque terme de CATEGORIES et de
+SYNONYMES par une recherche de sous-chaine (`terme in titre`) : un passage
+sur le titre par terme. L'automate est construit une fois pour tous les
+termes ; un seul parcours du texte, caractere par caractere, rapporte alors
+tous les termes presents, chevauchements compris (« sécurité » et
+« sécurité sociale »), quel que soit le nombre de termes.
+
+Les transitions sont completes (liens d'echec resolus a la construction) :
+un caractere coute une seule consultation de dictionnaire, tout caractere
+hors alphabet ramene a l'etat initial.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+def build_term_matcher(terms: Iterable[str]) -> Dict:
+    """Automate sur des termes deja normalises (la casse est a la charge de l'appelant)."""
+    terms = tuple(dict.fromkeys(term for term in terms if term))
+    children: List[Dict[str, int]] = [{}]
+    outputs: List[Tuple[str, ...]] = [()]
+    for term in terms:
+        state = 0
+        for char in term:
+            if char not in children[state]:
+                children.append({})
+                outputs.append(())
+                children[state][char] = len(children) - 1
+            state = children[state][char]
+        outputs[state] += (term,)
+
+    # Parcours en largeur : le lien d'echec d'un etat est toujours moins profond.
+    alphabet = {char for term in terms for char in term}
+    transitions: List[Dict[str, int]] = [dict() for _ in children]
+    failures = [0] * len(children)
+    transitions[0] = dict(children[0])
+    queue = deque(children[0].values())
+    while queue:
+        state = queue.popleft()
+        outputs[state] += outputs[failures[state]]
+        for char in alphabet:
+            child = children[state].get(char)
+            if child is not None:
+                failures[child] = transitions[failures[state]].get(char, 0) if state else 0
+                transitions[state][char] = child
+                queue.append(child)
+            else:
+                target = transitions[failures[state]].get(char, 0)
+                if target:
+                    transitions[state][char] = target
+
+    return {"terms": terms, "transitions": transitions, "outputs": outputs}
+
+
+def find_terms(matcher: Dict, text: str) -> Set[str]:
+    """Termes de l'automate presents dans `text` (sous-chaines, chevauchements compris)."""
+    transitions = matcher["transitions"]
+    outputs = matcher["outputs"]
+    found = set()
+    state = 0
+    for char in text:
+        state = transitions[state].get(char, 0)
+        if outputs[state]:
+            found.update(outputs[state])
+    return found
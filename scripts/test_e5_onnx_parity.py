@@ -0,0 +1,188 @@
+"""Borne la derive des backends ONNX de l'encodeur E5 par rapport a PyTorch.
+
+Usage : python scripts/test_e5_onnx_parity.py [--model CHEMIN_OU_ID]
+(code de sortie 1 si echec). Un petit modele BERT aleatoire, construit
+localement, est toujours verifie (hors ligne, y compris l'inference ONNX
+sans torch ni transformers importables). Le modele par defaut est ensuite
+celui des artefacts publies ; s'il est inaccessible, cette partie est
+sautee. Sans torch/transformers/onnxruntime installes, tout est saute.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from generate_semantic_index import (
+    SEMANTIC_MODEL_MAX_LENGTH,
+    SEMANTIC_PYTHON_MODEL_ID,
+    E5MeanPoolingEncoder,
+    OnnxE5MeanPoolingEncoder,
+    apply_semantic_prefix,
+    quantize_normalized_embedding,
+)
+
+# Cosinus minimal entre vecteurs torch et ONNX, par backend.
+MIN_COSINE = {
+    "onnx": 0.9999,
+    "onnx-int8": 0.98,
+}
+
+SAMPLE_TEXTS = [
+    "l'ensemble du projet de loi de finances pour 2026 (première lecture)",
+    "l'amendement n° 12 de M. X à l'article 3 de la proposition de loi visant à protéger le logement des étudiants",
+    "la motion de censure déposée en application de l'article 49, alinéa 3, de la Constitution",
+    "l'article premier du projet de loi relatif à l'immigration et au séjour des étrangers",
+    "le sous-amendement n° 2",
+    "scrutin 4242",
+    "l'amendement n° 1874 de Mme Y après l'article 12 du projet de loi de financement de la sécurité sociale "
+    "pour 2026 visant à exonérer de cotisations les heures supplémentaires des soignants hospitaliers " * 3,
+]
+
+passed = 0
+failed = 0
+
+
+def check(condition, message):
+    global passed, failed
+    if condition:
+        print(f"  OK: {message}")
+        passed += 1
+    else:
+        print(f"FAIL: {message}")
+        failed += 1
+
+
+def build_tiny_model(directory):
+    """Modele BERT minuscule (poids aleatoires fixes) et tokenizer WordPiece, sans reseau."""
+    import torch
+    from tokenizers import Tokenizer, models, normalizers, pre_tokenizers, processors
+    from transformers import BertConfig, BertModel, PreTrainedTokenizerFast
+
+    specials = ["[PAD]", "[UNK]", "[CLS]", "[SEP]"]
+    words = sorted({word for text in SAMPLE_TEXTS for word in text.lower().replace("'", " ").split()})
+    vocab = {token: position for position, token in enumerate(specials + ["passage", ":"] + words)}
+    tokenizer = Tokenizer(models.WordPiece(vocab, unk_token="[UNK]"))
+    tokenizer.normalizer = normalizers.BertNormalizer(lowercase=True)
+    tokenizer.pre_tokenizer = pre_tokenizers.BertPreTokenizer()
+    tokenizer.post_processor = processors.TemplateProcessing(
+        single="[CLS] $A [SEP]",
+        special_tokens=[("[CLS]", vocab["[CLS]"]), ("[SEP]", vocab["[SEP]"])],
+    )
+    PreTrainedTokenizerFast(
+        tokenizer_object=tokenizer,
+        unk_token="[UNK]",
+        pad_token="[PAD]",
+        cls_token="[CLS]",
+        sep_token="[SEP]",
+    ).save_pretrained(directory)
+
+    torch.manual_seed(0)
+    BertModel(BertConfig(
+        vocab_size=len(vocab),
+        hidden_size=32,
+        num_hidden_layers=2,
+        num_attention_heads=2,
+        intermediate_size=64,
+        max_position_embeddings=SEMANTIC_MODEL_MAX_LENGTH,
+    )).save_pretrained(directory)
+
+
+def check_backend(encoder, texts, reference, min_cosine):
+    embeddings = encoder.encode(texts, show_progress_bar=False, batch_size=3)
+    check(embeddings.shape == reference.shape, f"forme {embeddings.shape}")
+
+    cosines = np.sum(embeddings * reference, axis=1)
+    check(float(cosines.min()) >= min_cosine, f"cosinus minimal {cosines.min():.6f} >= {min_cosine}")
+    check(bool(np.allclose(np.linalg.norm(embeddings, axis=1), 1.0, atol=1e-5)), "vecteurs normalises L2")
+
+    if encoder.backend == "onnx":
+        # A fp32, la quantification publiee (int8 a l'echelle 127) ne doit pas bouger.
+        drift = max(
+            int(np.max(np.abs(np.asarray(quantize_normalized_embedding(left)) - quantize_normalized_embedding(right))))
+            for left, right in zip(embeddings, reference)
+        )
+        check(drift <= 1, f"ecart maximal apres quantification {drift} <= 1")
+    return embeddings
+
+
+def check_tiny_model(texts):
+    """Parite hors ligne sur un modele local, puis inference ONNX sans torch ni transformers."""
+    with tempfile.TemporaryDirectory() as directory:
+        model_dir = os.path.join(directory, "tiny-bert")
+        cache_dir = os.path.join(directory, "onnx")
+        try:
+            build_tiny_model(model_dir)
+            reference = E5MeanPoolingEncoder(model_dir).encode(texts, show_progress_bar=False)
+        except Exception as error:
+            print(f"ℹ️ Modele local saute : {error}")
+            return
+
+        print("=== Test parite E5 ONNX (modele local) ===\n")
+        print("onnx")
+        encoder = OnnxE5MeanPoolingEncoder(model_dir, cache_dir=cache_dir)
+        embeddings = check_backend(encoder, texts, reference, MIN_COSINE["onnx"])
+        from transformers import AutoTokenizer
+
+        long_texts = texts + [" ".join(texts) * 4]
+        expected = AutoTokenizer.from_pretrained(model_dir)(long_texts, max_length=SEMANTIC_MODEL_MAX_LENGTH, truncation=True)
+        actual = encoder.tokenizer(long_texts, max_length=SEMANTIC_MODEL_MAX_LENGTH, truncation=True)
+        check(actual["input_ids"] == expected["input_ids"], "tokenisation identique a AutoTokenizer, troncature comprise")
+        print("onnx-int8")
+        check_backend(OnnxE5MeanPoolingEncoder(model_dir, quantize=True, cache_dir=cache_dir), texts, reference, MIN_COSINE["onnx-int8"])
+
+        print("onnx sans torch ni transformers")
+        hidden = {name: sys.modules.get(name) for name in ("torch", "transformers")}
+        # None dans sys.modules : tout `import torch` leve ImportError.
+        sys.modules.update({name: None for name in hidden})
+        try:
+            encoder = OnnxE5MeanPoolingEncoder(model_dir, cache_dir=cache_dir)
+            check(encoder.torch is None, "torch non importe")
+            check(bool(np.array_equal(encoder.encode(texts, show_progress_bar=False, batch_size=3), embeddings)), "memes vecteurs qu'avec transformers installe")
+        finally:
+            for name, module in hidden.items():
+                if module is None:
+                    sys.modules.pop(name, None)
+                else:
+                    sys.modules[name] = module
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parite des backends ONNX de l'encodeur E5")
+    parser.add_argument('--model', default=SEMANTIC_PYTHON_MODEL_ID, help="Identifiant HuggingFace ou dossier local")
+    args = parser.parse_args()
+
+    texts = [apply_semantic_prefix(text, "passage: ") for text in SAMPLE_TEXTS]
+    check_tiny_model(texts)
+
+    try:
+        reference = E5MeanPoolingEncoder(args.model).encode(texts, show_progress_bar=False)
+    except Exception as error:
+        print(f"ℹ️ Modele {args.model} saute : {error}")
+        return finish()
+
+    print(f"=== Test parite E5 ONNX ({args.model}) ===\n")
+
+    for backend, min_cosine in MIN_COSINE.items():
+        try:
+            encoder = OnnxE5MeanPoolingEncoder(args.model, quantize=backend == "onnx-int8")
+        except Exception as error:
+            print(f"ℹ️ Modele {args.model} saute : {error}")
+            return finish()
+
+        print(f"{backend}")
+        check_backend(encoder, texts, reference, min_cosine)
+
+    return finish()
+
+
+def finish():
+    print(f"\n=== {passed} OK, {failed} echec(s) ===")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""Verifie que json_backend ecrit et relit exactement comme la stdlib.
+
+Usage : python scripts/test_json_backend.py (code de sortie 1 si echec).
+Sans orjson installe, seul le repli stdlib est verifie.
+"""
+
+import json
+import sys
+
+import json_backend
+
+passed = 0
+failed = 0
+
+
+def check(condition, message):
+    global passed, failed
+    if condition:
+        print(f"  OK: {message}")
+        passed += 1
+    else:
+        print(f"FAIL: {message}")
+        failed += 1
+
+
+def stdlib_dumps(payload, compact=False, indent=2):
+    if compact:
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return json.dumps(payload, ensure_ascii=False, indent=indent).encode("utf-8")
+
+
+PAYLOADS = {
+    "vote compact": {"schemaVersion": 2, "table": "scrutins.json", "votes": [[12, 1], [3, 2], [0, 3]]},
+    "texte accentue et echappements": {"titre": "l'amendement n° 12 — « adopté »\n\t\"x\"\\ \x01\x7f  / <b>", "vide": ""},
+    "conteneurs vides": {"a": [], "b": {}, "c": [[], [{}]], "d": None, "e": True, "f": False},
+    "vecteurs quantifies": {"vectors": {str(i): [(i * 37 + j) % 255 - 127 for j in range(384)] for i in range(50)}},
+    "flottants simples": {"coverage": 0.9731, "scale": 127.0, "zero": -0.0, "ratio": 1 / 3, "grand": 1e15},
+    "flottants exposants": {"petit": 1e-05, "tres_petit": 2.5e-07, "enorme": 1e16, "liste": [1.0, 1e22]},
+    "flottants non finis": {"nan": float("nan"), "inf": float("inf"), "moins_inf": float("-inf")},
+    "cles non textuelles": {1: "a", 2.5: "b", None: "c", True: "d"},
+    "entier hors 64 bits": {"big": 2 ** 70, "neg": -(2 ** 65)},
+    "tuples": {"paires": [(1, 2), (3, 4)]},
+    "racine liste": [1, "deux", 3.0, None],
+}
+
+print(f"=== Test json_backend (backend : {json_backend.BACKEND}) ===\n")
+
+print("1. dumps identique octet pour octet a json.dumps(ensure_ascii=False)")
+for name, payload in PAYLOADS.items():
+    check(json_backend.dumps(payload) == stdlib_dumps(payload), f"{name} (indent=2)")
+    check(json_backend.dumps(payload, compact=True) == stdlib_dumps(payload, compact=True), f"{name} (compact)")
+    check(json_backend.dumps(payload, indent=1) == stdlib_dumps(payload, indent=1), f"{name} (indent=1)")
+
+print("\n2. loads identique a json.loads")
+DOCUMENTS = [
+    b'{"numero":"12","votes":[[1,2]],"x":1.5e-7,"y":-0.0,"z":null}',
+    '{"titre":"l\'amendement n° 12 \\u00e9 \\ud83d\\ude00"}'.encode("utf-8"),
+    b'{"a":1,"a":2}',
+    b'{"int64":9223372036854775807,"neg":-9223372036854775808}',
+    b'[NaN, Infinity, -Infinity]',
+    '{"texte":"é"}',
+]
+for document in DOCUMENTS:
+    expected = json.loads(document.decode("utf-8") if isinstance(document, bytes) else document)
+    actual = json_backend.loads(document)
+    check(json.dumps(actual, sort_keys=True) == json.dumps(expected, sort_keys=True), f"loads {document[:40]!r}")
+
+print("\n3. erreurs de decodage inchangees")
+for document in (b"{corrupt", b"", "﻿{}".encode("utf-8")):
+    try:
+        json_backend.loads(document)
+        check(False, f"erreur attendue pour {document!r}")
+    except json.JSONDecodeError:
+        check(True, f"json.JSONDecodeError pour {document!r}")
+    except UnicodeDecodeError:
+        check(False, f"UnicodeDecodeError inattendue pour {document!r}")
+
+print(f"\n=== {passed} OK, {failed} echec(s) ===")
+sys.exit(1 if failed else 0)
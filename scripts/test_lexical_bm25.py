@@ -0,0 +1,146 @@
+"""Verifie l'index BM25 : analyseur, varints, ecriture/relecture, scoreur, phrases, manifest.
+
+Usage : python scripts/test_lexical_bm25.py (code de sortie 1 si echec).
+"""
+
+import os
+import random
+import sys
+import tempfile
+
+import json_backend
+from generate_semantic_index import extract_keywords_from_title, get_synonyms
+from lexical_bm25 import (
+    LEXICAL_BENCHMARK_QUERIES,
+    analyze_lexical_text,
+    build_memory_index,
+    decode_varints,
+    describe_bm25_artifact,
+    encode_varints,
+    lookup_term,
+    read_bm25_index,
+    score_bm25,
+    score_memory_index,
+    search_phrase,
+    tokenize_lexical_text,
+    write_bm25_index,
+)
+
+passed = 0
+failed = 0
+
+
+def check(condition, message):
+    global passed, failed
+    if condition:
+        print(f"  OK: {message}")
+        passed += 1
+    else:
+        print(f"FAIL: {message}")
+        failed += 1
+
+
+THEMES = [
+    "logement social loyers HLM", "immigration asile séjour", "réforme des retraites pension",
+    "budget sécurité sociale", "assurance chômage emploi", "énergie nucléaire climat",
+    "police municipale sécurité", "agriculture pesticides élevage", "fin de vie aide à mourir",
+    "intelligence artificielle numérique", "Nouvelle-Calédonie outre-mer", "hôpital médecins santé",
+]
+
+
+def build_index(count=3000, seed=5):
+    rng = random.Random(seed)
+    votes = {}
+    inverted_index = {}
+    for numero in rng.sample(range(1, count * 2), count):
+        theme = rng.choice(THEMES)
+        other = rng.choice(THEMES)
+        titre = f"l'amendement n° {rng.randint(1, 900)} de M. Dupont à l'article {rng.randint(1, 40)} du projet de loi {theme} ({other})"
+        if numero % 50 == 0:
+            titre += " : la fin de vie en établissement"
+        elif numero % 50 == 1:
+            titre += " : la vie des établissements, fin du dispositif"
+        keywords = theme.lower().split()[:2]
+        votes[str(numero)] = {
+            "titre": titre,
+            "subject": f"projet de loi {theme}",
+            "summary": f"projet de loi {theme}",
+            "law_title": f"Loi relative à {theme}" if numero % 3 else "",
+            "keywords": keywords,
+            "category": "autre",
+        }
+        for keyword in keywords:
+            inverted_index.setdefault(keyword, []).append(str(numero))
+    return {"votes": votes, "inverted_index": inverted_index, "lastUpdate": "2026-01-01"}
+
+
+print("=== Test index BM25 ===\n")
+
+print("analyseur")
+check(tokenize_lexical_text("Sécurité SOCIALE") == tokenize_lexical_text("securite sociale"), "accents et casse replies")
+check(len(set(tokenize_lexical_text("logements logement"))) == 1, "pluriel")
+check(len(set(tokenize_lexical_text("sociaux sociales social"))) == 1, "-aux et feminin")
+check(len(set(tokenize_lexical_text("protéger protégées"))) == 1, "infinitif et participe")
+check(tokenize_lexical_text("œuvre") == tokenize_lexical_text("oeuvre"), "ligatures")
+check([position for _term, position in analyze_lexical_text("fin de vie")[0]] == [0, 2], "les mots vides gardent leur position")
+
+titre = "l'ensemble du projet de loi relatif au logement, au logement social et à la rénovation énergétique des logements anciens et des bâtiments publics communaux"
+check(len({tuple(extract_keywords_from_title(titre)) for _ in range(5)}) == 1, "mots-cles deterministes")
+check(extract_keywords_from_title(titre)[:2] == ["ensemble", "logement"], "mots-cles dans l'ordre du titre")
+check(get_synonyms(["logement", "sécurité"]) == ["immobilier", "habitat", "HLM", "locatif", "propriété", "police", "sûreté", "ordre public"], "synonymes dans l'ordre de SYNONYMES")
+
+print("\nvarints")
+values = [0, 1, 127, 128, 300, 16383, 16384, 2 ** 32 + 5]
+check(decode_varints(encode_varints(values)) == values, "aller-retour LEB128")
+check(len(encode_varints([127])) == 1 and len(encode_varints([128])) == 2, "7 bits par octet")
+
+with tempfile.TemporaryDirectory() as directory:
+    lexical_path = os.path.join(directory, "lexical_index.json")
+    bm25_path = os.path.join(directory, "lexical_bm25.json")
+    index = build_index()
+    with open(lexical_path, "wb") as f:
+        f.write(json_backend.dumps(index))
+    header = write_bm25_index(bm25_path, lexical_path, index)
+
+    print("\nartefact")
+    check(header["vocabulary"] == sorted(header["vocabulary"]), f"vocabulaire trie ({header['vocabularySize']} termes)")
+    check(len(header["idf"]) == header["vocabularySize"], "un IDF par terme")
+    read_header, bm25_index = read_bm25_index(bm25_path)
+    check(read_header == header, "entete relu a l'identique")
+    check(bm25_index["documents"] == sorted(index["votes"], key=int), "ordinaux = numeros par ordre numerique")
+    position = lookup_term(bm25_index, "logement")
+    check(position is not None and lookup_term(bm25_index, "inexistant") is None, "recherche par dichotomie")
+    # Memes postings au format historique {terme: [numero, ...]}, sans tf ni longueurs.
+    postings, lengths = build_memory_index(index["votes"])
+    legacy_bytes = len(json_backend.dumps({term: list(documents) for term, documents in postings.items()}))
+    bm25_bytes = os.path.getsize(bm25_path) + header["dataBytes"]
+    check(bm25_bytes * 2 < legacy_bytes, f"{bm25_bytes} octets contre {legacy_bytes} au format inverted_index")
+
+    print("\nscoreur")
+    results = [score_bm25(bm25_index, query) for query in LEXICAL_BENCHMARK_QUERIES]
+    expected = [score_memory_index(postings, lengths, query) for query in LEXICAL_BENCHMARK_QUERIES]
+    check(results == expected, "top-10 identique au BM25 direct sur les termes re-tokenises")
+    check(all(results[0][i][1] >= results[0][i + 1][1] for i in range(len(results[0]) - 1)), "scores decroissants")
+    top_numero = score_bm25(bm25_index, "logement social")[0][0]
+    check("logement" in index["votes"][top_numero]["titre"], "meilleur document pertinent")
+    check(score_bm25(bm25_index, "de la des") == [], "requete de mots vides : aucun resultat")
+
+    print("\nphrases")
+    phrase_hits = search_phrase(bm25_index, "fin de vie", k=len(index["votes"]))
+    both_terms = [numero for numero, entry in index["votes"].items() if "fin " in entry["titre"] and " vie" in entry["titre"]]
+    check(phrase_hits and all("fin de vie" in index["votes"][numero]["titre"] for numero, _score in phrase_hits), f"{len(phrase_hits)} scrutins avec « fin de vie »")
+    check(len(phrase_hits) < len(both_terms), f"termes disjoints exclus ({len(both_terms)} scrutins avec fin et vie)")
+    check(not search_phrase(bm25_index, "vie de fin"), "ordre des termes respecte")
+    check(not search_phrase(bm25_index, "fin vie"), "ecart des mots vides respecte")
+    check(search_phrase(bm25_index, "Établissements") == score_bm25(bm25_index, "etablissement", k=10), "phrase d'un terme = BM25")
+
+    print("\nmanifest")
+    described = describe_bm25_artifact(bm25_path, lexical_path)
+    check(described is not None and described["documentCount"] == len(index["votes"]), "reference manifest")
+
+    with open(lexical_path, "wb") as f:
+        f.write(json_backend.dumps(build_index(count=100)))
+    check(describe_bm25_artifact(bm25_path, lexical_path) is None, "index BM25 desynchronise de l'index lexical ignore")
+
+print(f"\n=== {passed} OK, {failed} echec(s) ===")
+sys.exit(1 if failed else 0)
@@ -0,0 +1,265 @@
+"""Verifie la mise a jour incrementale de l'index BM25, des fragments et du manifest.
+
+Usage : python scripts/test_lexical_incremental.py (code de sortie 1 si echec).
+"""
+
+import hashlib
+import os
+import random
+import sys
+import tempfile
+
+import generate_semantic_index
+import json_backend
+from generate_semantic_index import describe_artifact_file, write_bytes_if_changed, write_json
+from lexical_bm25 import (
+    LEXICAL_BENCHMARK_QUERIES,
+    build_incremental_bm25_index,
+    build_lexical_delta,
+    build_votes_bm25_index,
+    decode_postings_block,
+    read_bm25_index,
+    read_bm25_state,
+    score_bm25,
+    search_phrase,
+    update_bm25_index,
+    write_bm25_index,
+)
+from lexical_shards import (
+    LEXICAL_MAX_SEGMENTS,
+    load_document_metadata,
+    open_lexical_shards,
+    score_sharded_bm25,
+    write_lexical_shards,
+)
+
+passed = 0
+failed = 0
+
+
+def check(condition, message):
+    global passed, failed
+    if condition:
+        print(f"  OK: {message}")
+        passed += 1
+    else:
+        print(f"FAIL: {message}")
+        failed += 1
+
+
+THEMES = [
+    "logement social loyers", "immigration asile", "réforme des retraites", "budget sécurité sociale",
+    "assurance chômage", "énergie nucléaire", "police municipale", "agriculture pesticides",
+    "fin de vie aide à mourir", "intelligence artificielle", "Nouvelle-Calédonie", "hôpital médecins",
+]
+
+
+def build_entry(rng, numero):
+    theme = rng.choice(THEMES)
+    words = " ".join(f"mot{rng.randint(1, 3000)}" for _ in range(6))
+    return {
+        "titre": f"l'amendement n° {rng.randint(1, 900)} du projet de loi {theme} ({words})",
+        "subject": f"projet de loi {theme}",
+        "summary": f"projet de loi {theme}",
+        "law_title": "",
+        "keywords": theme.lower().split()[:2],
+        "category": "autre",
+        "dossier_id": None,
+    }
+
+
+def write_lexical(path, index):
+    with open(path, "wb") as f:
+        f.write(json_backend.dumps(index))
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def postings_by_numero(bm25):
+    """{terme: {numero: positions}} : contenu independant des ordinaux."""
+    return {
+        term: {bm25["documents"][ordinal]: positions for ordinal, positions in decode_postings_block(postings, positions_block)}
+        for term, postings, positions_block in zip(bm25["vocabulary"], bm25["postings"], bm25["positions"])
+    }
+
+
+print("=== Test mise a jour lexicale incrementale ===\n")
+
+rng = random.Random(21)
+numeros = sorted(rng.sample(range(2, 9000), 2500))
+base = {"votes": {str(numero): build_entry(rng, numero) for numero in numeros}, "inverted_index": {}, "lastUpdate": "2026-01-01"}
+
+with tempfile.TemporaryDirectory() as directory:
+    lexical_path = os.path.join(directory, "lexical_index.json")
+    bm25_path = os.path.join(directory, "lexical_bm25.json")
+    shards_directory = os.path.join(directory, "lexical_shards")
+    base_sha256 = write_lexical(lexical_path, base)
+    base_header = write_bm25_index(bm25_path, lexical_path, base)
+    base_listing = write_lexical_shards(shards_directory, lexical_path, base)
+
+    # Nuit suivante : 40 nouveaux scrutins (dont un numero anterieur au dernier), 3 dossiers lies.
+    previous_votes = {numero: dict(entry) for numero, entry in base["votes"].items()}
+    votes = {numero: dict(entry) for numero, entry in base["votes"].items()}
+    votes["1"] = build_entry(rng, 1)
+    for numero in range(9000, 9039):
+        votes[str(numero)] = build_entry(rng, numero)
+    for numero in [str(numeros[10]), str(numeros[1200]), str(numeros[-3])]:
+        votes[numero]["law_title"] = "Loi relative à l'énergie nucléaire et au climat"
+        votes[numero]["dossier_id"] = "DLR5L17N0001"
+    votes[str(numeros[500])]["category"] = "energie"
+    updated = {"votes": dict(sorted(votes.items(), key=lambda item: int(item[0]))), "inverted_index": {}, "lastUpdate": "2026-01-02"}
+
+    print("ecart")
+    delta = build_lexical_delta(base_sha256, previous_votes, updated["votes"])
+    check(len(delta["added"]) == 40 and not delta["removed"], f"{len(delta['added'])} ajoutes")
+    check(sorted(delta["changed"]) == sorted([str(numeros[10]), str(numeros[1200]), str(numeros[-3])]), "re-indexes : champs indexes modifies seulement")
+    check(len(delta["updated"]) == 4, "modifies : toute entree differente (categorie comprise)")
+
+    write_lexical(lexical_path, updated)
+    bm25 = build_incremental_bm25_index(bm25_path, updated["votes"], delta)
+    full = build_votes_bm25_index(updated["votes"])
+
+    print("\nindex BM25")
+    check(bm25["update"] == {"added": 40, "changed": 3}, "mise a jour depuis l'artefact precedent")
+    check(bm25["documents"][:len(numeros)] == [str(numero) for numero in numeros], "ordinaux des scrutins existants conserves")
+    check(bm25["documents"][len(numeros)] == "1", "scrutin tardif ajoute apres les autres")
+    check(bm25["vocabulary"] == full["vocabulary"] and bm25["documentFrequencies"] == full["documentFrequencies"], "vocabulaire et frequences d'une reconstruction")
+    check(postings_by_numero(bm25) == postings_by_numero(full), "postings et positions d'une reconstruction")
+    check(bm25["lengths"][bm25["documents"].index(str(numeros[10]))] == full["lengths"][full["documents"].index(str(numeros[10]))], "longueur du document re-indexe")
+
+    header = write_bm25_index(bm25_path, lexical_path, updated, bm25=bm25)
+    _header, bm25_index = read_bm25_index(bm25_path)
+    reference_path = os.path.join(directory, "reference_bm25.json")
+    write_bm25_index(reference_path, lexical_path, updated)
+    _reference_header, reference_index = read_bm25_index(reference_path)
+    check(
+        [score_bm25(bm25_index, query) for query in LEXICAL_BENCHMARK_QUERIES]
+        == [score_bm25(reference_index, query) for query in LEXICAL_BENCHMARK_QUERIES],
+        "classement identique a une reconstruction"
+    )
+    check(search_phrase(bm25_index, "énergie nucléaire", k=50) == search_phrase(reference_index, "énergie nucléaire", k=50), "phrases identiques")
+    check(base_header["generation"] == 1 and header["generation"] == 2, "generation incrementee")
+
+    data_path = os.path.join(directory, header["dataPath"])
+    os.utime(data_path, ns=(0, 0))
+    again = write_bm25_index(bm25_path, lexical_path, updated, bm25=read_bm25_state(bm25_path)[1])
+    check(again["generation"] == 2 and os.stat(data_path).st_mtime_ns == 0, "contenu inchange : generation conservee, binaire non reecrit")
+
+    stale_delta = dict(delta, previousSha256="0" * 64)
+    check(build_incremental_bm25_index(bm25_path, updated["votes"], stale_delta)["update"] is None, "ecart d'un autre index : reconstruction complete")
+    try:
+        update_bm25_index(read_bm25_state(bm25_path)[1], {str(numeros[0]): []})
+        check(False, "document existant sans anciens postings refuse")
+    except ValueError:
+        check(True, "document existant sans anciens postings refuse")
+
+    print("\nfragments")
+    listing = write_lexical_shards(shards_directory, lexical_path, updated, bm25=bm25, delta=delta)
+    base_shards = listing["segments"][0]["termShards"]
+    rewritten = [shard["path"] for shard in base_shards if shard["path"] in listing["written"]]
+    check(listing["generation"] == 2 and listing["documents"]["generation"] == 2, "repertoire et documents.pst a la generation 2")
+    check(
+        [segment["firstOrdinal"] for segment in listing["segments"]] == [0, len(numeros)] and listing["segments"][1]["documents"] == 40,
+        "nouveaux scrutins dans un segment ajoute"
+    )
+    check(
+        [shard["firstTerm"] for shard in base_shards][1:] == [shard["firstTerm"] for shard in base_listing["segments"][0]["termShards"]][1:],
+        "bornes des tranches du segment de base conservees"
+    )
+    check(0 < len(rewritten) < len(base_shards), f"{len(rewritten)} fragments de base reecrits sur {len(base_shards)} (scrutins re-indexes)")
+    check(
+        all(shard["generation"] == (2 if shard["path"] in rewritten else 1) for shard in base_shards),
+        "generation par fragment : 2 si reecrit, 1 sinon"
+    )
+    added_bytes = sum(shard["bytes"] for shard in listing["segments"][1]["termShards"])
+    base_bytes = sum(shard["bytes"] for shard in base_shards)
+    check(added_bytes * 20 < base_bytes, f"segment ajoute : {added_bytes} octets contre {base_bytes} pour la base")
+    touched = {bm25["documents"].index(numero) // listing["documentShardSize"] for numero in delta["added"] + delta["updated"]}
+    docs_written = [name for name in listing["written"] if name.startswith("docs-")]
+    check(sorted(docs_written) == sorted(f"docs-{number:03d}.json" for number in touched), f"{len(docs_written)} fragments de metadonnees reecrits (scrutins ajoutes ou modifies)")
+    expected = [score_bm25(bm25_index, query) for query in LEXICAL_BENCHMARK_QUERIES]
+    results = [score_sharded_bm25(open_lexical_shards(shards_directory), query) for query in LEXICAL_BENCHMARK_QUERIES]
+    check(results == expected, "classement par segments identique")
+    sharded = open_lexical_shards(shards_directory)
+    check(
+        load_document_metadata(sharded, ["1", str(numeros[10])]) == {"1": updated["votes"]["1"], str(numeros[10]): updated["votes"][str(numeros[10])]},
+        "metadonnees par ordinal"
+    )
+
+    rebuilt = write_lexical_shards(os.path.join(directory, "rebuilt_shards"), lexical_path, updated, bm25=bm25)
+    check(
+        [shard["sha256"] for shard in rebuilt["documentShards"]] == [shard["sha256"] for shard in listing["documentShards"]],
+        "fragments de metadonnees repris identiques a une reconstruction"
+    )
+    current_sha256 = write_lexical(lexical_path, updated)
+    empty_delta = build_lexical_delta(current_sha256, updated["votes"], updated["votes"])
+    unchanged = write_lexical_shards(shards_directory, lexical_path, updated, bm25=bm25, delta=empty_delta)
+    check(unchanged["generation"] == 2 and not unchanged["written"], "sans changement : generation conservee, aucun fichier reecrit")
+
+    # Nuits suivantes : les segments ajoutes sont fusionnes au-dela de LEXICAL_MAX_SEGMENTS.
+    current = updated
+    counts = []
+    for night in range(LEXICAL_MAX_SEGMENTS + 2):
+        previous_votes = {numero: dict(entry) for numero, entry in current["votes"].items()}
+        votes = dict(current["votes"])
+        for numero in range(10000 + 10 * night, 10010 + 10 * night):
+            votes[str(numero)] = build_entry(rng, numero)
+        current = {"votes": votes, "inverted_index": {}, "lastUpdate": "2026-01-03"}
+        night_delta = build_lexical_delta(current_sha256, previous_votes, votes)
+        current_sha256 = write_lexical(lexical_path, current)
+        night_bm25 = build_incremental_bm25_index(bm25_path, votes, night_delta)
+        write_bm25_index(bm25_path, lexical_path, current, bm25=night_bm25)
+        night_listing = write_lexical_shards(shards_directory, lexical_path, current, bm25=night_bm25, delta=night_delta)
+        counts.append(len(night_listing["segments"]))
+    check(max(counts) == LEXICAL_MAX_SEGMENTS and counts[-1] < LEXICAL_MAX_SEGMENTS, f"segments par nuit : {counts}")
+    check(night_listing["segments"][0]["id"] == listing["segments"][0]["id"], "segment de base conserve a la fusion")
+    _header, night_index = read_bm25_index(bm25_path)
+    check(
+        [score_sharded_bm25(open_lexical_shards(shards_directory), query) for query in LEXICAL_BENCHMARK_QUERIES]
+        == [score_bm25(night_index, query) for query in LEXICAL_BENCHMARK_QUERIES],
+        "classement identique apres fusion"
+    )
+    check(
+        sorted(name for name in os.listdir(shards_directory) if name.startswith("terms-"))
+        == sorted(os.path.basename(shard["path"]) for segment in night_listing["segments"] for shard in segment["termShards"]),
+        "fragments des segments fusionnes retires"
+    )
+
+    print("\nmanifest")
+    artifact_path = os.path.join(directory, "semantic_index.json")
+    write_json(artifact_path, {"votes": {"1": [1, 2]}})
+    first = describe_artifact_file(artifact_path, None)
+    check(first["generation"] == 1 and first["sha256"] == hashlib.sha256(open(artifact_path, "rb").read()).hexdigest(), "empreinte des octets ecrits")
+    check(describe_artifact_file(artifact_path, first)["generation"] == 1, "meme empreinte : generation conservee")
+    write_json(artifact_path, {"votes": {"1": [3, 4]}})
+    check(describe_artifact_file(artifact_path, first)["generation"] == 2, "nouvelle empreinte : generation suivante")
+    check("mtimeNs" not in first, "aucune date de modification publiee")
+    generate_semantic_index.WRITTEN_SHA256.clear()
+    current = describe_artifact_file(artifact_path, first)
+    check(current["sha256"] == hashlib.sha256(open(artifact_path, "rb").read()).hexdigest(), "artefact non ecrit par cette execution : fichier relu")
+    with open(artifact_path, "wb") as f:
+        f.write(json_backend.dumps({"votes": {"1": [5, 6]}}))
+    changed = describe_artifact_file(artifact_path, current)
+    check(
+        changed["bytes"] == current["bytes"]
+        and changed["sha256"] == hashlib.sha256(open(artifact_path, "rb").read()).hexdigest()
+        and changed["generation"] == current["generation"] + 1,
+        "modifie hors execution, meme taille : jeton de version renouvele"
+    )
+    with open(artifact_path, "ab") as f:
+        f.write(b"\n")
+    check(describe_artifact_file(artifact_path, first)["generation"] == 2, "taille differente : fichier relu")
+
+    data = json_backend.dumps({"votes": {"1": [7, 8]}})
+    check(write_bytes_if_changed(artifact_path, data), "contenu different : fichier ecrit")
+    written = describe_artifact_file(artifact_path, None)
+    os.utime(artifact_path, ns=(10 ** 9, 10 ** 9))
+    before = os.stat(artifact_path).st_mtime_ns
+    check(
+        not write_bytes_if_changed(artifact_path, data, written["sha256"]) and os.stat(artifact_path).st_mtime_ns == before,
+        "contenu identique : fichier ni reecrit ni touche"
+    )
+    check(not write_bytes_if_changed(artifact_path, data), "contenu identique, empreinte inconnue : fichier relu, non reecrit")
+
+print(f"\n=== {passed} OK, {failed} echec(s) ===")
+sys.exit(1 if failed else 0)
@@ -0,0 +1,170 @@
+"""Verifie les fragments lexicaux : couverture, scoring paresseux, metadonnees, manifest.
+
+Usage : python scripts/test_lexical_shards.py (code de sortie 1 si echec).
+"""
+
+import hashlib
+import os
+import random
+import sys
+import tempfile
+
+import json_backend
+from lexical_bm25 import (
+    LEXICAL_BENCHMARK_QUERIES,
+    build_incremental_bm25_index,
+    build_lexical_delta,
+    read_bm25_index,
+    score_bm25,
+    write_bm25_index,
+)
+from lexical_shards import (
+    describe_lexical_shards,
+    load_document_metadata,
+    open_lexical_shards,
+    partition_terms,
+    repartition_terms,
+    score_sharded_bm25,
+    write_lexical_shards,
+)
+
+passed = 0
+failed = 0
+
+
+def check(condition, message):
+    global passed, failed
+    if condition:
+        print(f"  OK: {message}")
+        passed += 1
+    else:
+        print(f"FAIL: {message}")
+        failed += 1
+
+
+THEMES = [
+    "logement social loyers", "immigration asile", "réforme des retraites", "budget sécurité sociale",
+    "assurance chômage", "énergie nucléaire", "police municipale", "agriculture pesticides",
+    "fin de vie aide à mourir", "intelligence artificielle", "Nouvelle-Calédonie", "hôpital médecins",
+]
+
+
+def build_index(count=2500, seed=9, numeros=None):
+    rng = random.Random(seed)
+    votes = {}
+    for numero in sorted(numeros if numeros is not None else rng.sample(range(1, count * 3), count)):
+        theme = rng.choice(THEMES)
+        words = " ".join(f"mot{rng.randint(1, 3000)}" for _ in range(6))
+        votes[str(numero)] = {
+            "titre": f"l'amendement n° {rng.randint(1, 900)} du projet de loi {theme} ({words})",
+            "subject": f"projet de loi {theme}",
+            "summary": f"projet de loi {theme}",
+            "law_title": "",
+            "keywords": theme.lower().split()[:2],
+            "category": "autre",
+            "date": "2025-01-01",
+        }
+    return {"votes": votes, "inverted_index": {}, "lastUpdate": "2026-01-01"}
+
+
+print("=== Test fragments lexicaux ===\n")
+
+print("decoupage")
+check(partition_terms([(b"x" * 10, b"")] * 7, target_bytes=25) == [(0, 3), (3, 6), (6, 7)], "tranches contigues")
+check(partition_terms([]) == [(0, 0)], "vocabulaire vide")
+check(
+    repartition_terms(["a", "b", "c", "d", "e"], [(b"x" * 10, b"")] * 5, ["a", "c", "ca", "d"], target_bytes=100) == [(0, 2), (2, 3), (3, 5)],
+    "bornes precedentes reprises, tranche videe retiree"
+)
+
+with tempfile.TemporaryDirectory() as directory:
+    lexical_path = os.path.join(directory, "lexical_index.json")
+    shards_directory = os.path.join(directory, "lexical_shards")
+    index = build_index()
+    with open(lexical_path, "wb") as f:
+        f.write(json_backend.dumps(index))
+    listing = write_lexical_shards(shards_directory, lexical_path, index)
+    header = write_bm25_index(os.path.join(directory, "lexical_bm25.json"), lexical_path, index)
+    _header, bm25_index = read_bm25_index(os.path.join(directory, "lexical_bm25.json"))
+
+    print("\nartefact")
+    check(len(listing["segments"]) == 1 and listing["generation"] == 1, "premiere ecriture : un segment, generation 1")
+    term_shards = listing["segments"][0]["termShards"]
+    terms = sum(shard["terms"] for shard in term_shards)
+    check(len(term_shards) > 3 and terms == header["vocabularySize"], f"{terms} termes en {len(term_shards)} fragments")
+    firsts = [shard["firstTerm"] for shard in term_shards]
+    check(firsts == sorted(firsts) and all(
+        left["lastTerm"] < right["firstTerm"] for left, right in zip(term_shards, term_shards[1:])
+    ), "tranches disjointes dans l'ordre du vocabulaire")
+    documents = sum(shard["documents"] for shard in listing["documentShards"])
+    check(documents == len(index["votes"]), f"{documents} scrutins en {len(listing['documentShards'])} fragments de metadonnees")
+
+    print("\nchargement paresseux")
+    sharded = open_lexical_shards(shards_directory)
+    check(sharded["fetched"] == ["directory.json", "documents.pst"], "ouverture : repertoire et documents seulement")
+    expected = [score_bm25(bm25_index, query) for query in LEXICAL_BENCHMARK_QUERIES]
+    results = [score_sharded_bm25(open_lexical_shards(shards_directory), query) for query in LEXICAL_BENCHMARK_QUERIES]
+    check(results == expected, "classement identique a l'index BM25 complet")
+
+    results = score_sharded_bm25(sharded, "logement social")
+    loaded = len(sharded["termShards"])
+    check(0 < loaded <= 2, f"{loaded} fragment(s) de termes charges sur {len(term_shards)}")
+    numeros = [numero for numero, _score in results]
+    metadata = load_document_metadata(sharded, numeros)
+    check(metadata == {numero: index["votes"][numero] for numero in numeros}, "metadonnees des resultats")
+    check(len(sharded["documentShards"]) <= len(numeros) < len(listing["documentShards"]), f"{len(sharded['documentShards'])} fragment(s) de metadonnees charges")
+    check(load_document_metadata(sharded, ["0"]) == {}, "numero hors tranches")
+
+    print("\nmanifest")
+    described = describe_lexical_shards(shards_directory, lexical_path)
+    check(described is not None and described["path"] == "lexical_shards/directory.json", "repertoire reference")
+    check(
+        described is not None
+        and [len(segment["termShards"]) for segment in described["segments"]] == [len(term_shards)]
+        and described["segments"][0]["termShards"][0]["path"].startswith("lexical_shards/terms-")
+        and described["documentShards"][0]["path"].startswith("lexical_shards/docs-"),
+        "fragments listes"
+    )
+
+    smaller = build_index(count=300)
+    write_lexical_shards(shards_directory, lexical_path, smaller)
+    stale = [name for name in os.listdir(shards_directory) if name.startswith("docs-")]
+    check(len(stale) == 3, f"anciens fragments retires ({len(stale)} restants)")
+    with open(lexical_path, "wb") as f:
+        f.write(json_backend.dumps(smaller))
+    check(describe_lexical_shards(shards_directory, lexical_path) is None, "fragments desynchronises de l'index lexical ignores")
+
+with tempfile.TemporaryDirectory() as directory:
+    # Index BM25 reconstruit (artefact precedent perdu) alors que des numeros
+    # plus petits que les anciens arrivent : les ordinaux sont renumerotes,
+    # les segments en place ne peuvent pas etre repris.
+    lexical_path = os.path.join(directory, "lexical_index.json")
+    bm25_path = os.path.join(directory, "lexical_bm25.json")
+    shards_directory = os.path.join(directory, "lexical_shards")
+    base = build_index(numeros=range(10, 300))
+    with open(lexical_path, "wb") as f:
+        f.write(json_backend.dumps(base))
+    with open(lexical_path, "rb") as f:
+        base_sha256 = hashlib.sha256(f.read()).hexdigest()
+    bm25 = build_incremental_bm25_index(bm25_path, base["votes"], None)
+    write_bm25_index(bm25_path, lexical_path, base, bm25=bm25)
+    write_lexical_shards(shards_directory, lexical_path, base, bm25=bm25)
+
+    grown = build_index(numeros=[1, 5, *range(10, 310)])
+    delta = build_lexical_delta(base_sha256, base["votes"], grown["votes"])
+    with open(lexical_path, "wb") as f:
+        f.write(json_backend.dumps(grown))
+    os.remove(bm25_path)
+    bm25 = build_incremental_bm25_index(bm25_path, grown["votes"], delta)
+    write_bm25_index(bm25_path, lexical_path, grown, bm25=bm25)
+    listing = write_lexical_shards(shards_directory, lexical_path, grown, bm25=bm25, delta=delta)
+    _header, bm25_index = read_bm25_index(bm25_path)
+
+    print("\nreconstruction de repli")
+    check(bm25["update"] is None and len(listing["segments"]) == 1, "index BM25 reconstruit : fragments reconstruits en un segment")
+    expected = [score_bm25(bm25_index, query) for query in LEXICAL_BENCHMARK_QUERIES]
+    results = [score_sharded_bm25(open_lexical_shards(shards_directory), query) for query in LEXICAL_BENCHMARK_QUERIES]
+    check(results == expected, "classement identique a l'index BM25 reconstruit")
+
+print(f"\n=== {passed} OK, {failed} echec(s) ===")
+sys.exit(1 if failed else 0)
@@ -0,0 +1,108 @@
+"""Verifie l'aller-retour JSON -> index semantique packe (int8 binaire) -> JSON.
+
+Usage : python scripts/test_packed_semantic_index.py (code de sortie 1 si echec).
+"""
+
+import os
+import random
+import sys
+import tempfile
+
+import json_backend
+from generate_semantic_index import (
+    SEMANTIC_MULTI_VECTOR_SLOT_WEIGHTS,
+    build_semantic_model_descriptor,
+    describe_packed_artifact,
+    read_packed_semantic_index,
+    unpack_semantic_index,
+    write_json,
+    write_packed_semantic_index,
+)
+
+passed = 0
+failed = 0
+
+
+def check(condition, message):
+    global passed, failed
+    if condition:
+        print(f"  OK: {message}")
+        passed += 1
+    else:
+        print(f"FAIL: {message}")
+        failed += 1
+
+
+def random_embedding(rng, dimension):
+    return [rng.randint(-127, 127) for _ in range(dimension)]
+
+
+def build_payloads(vote_count=40, dimension=384):
+    rng = random.Random(7)
+    vote_ids = [str(numero) for numero in range(1, vote_count + 1)]
+    single = {
+        "schemaVersion": 2,
+        "generatedAt": "2026-01-01T00:00:00Z",
+        "model": build_semantic_model_descriptor("multilingual-e5-small", "intfloat/multilingual-e5-small", dimension, "single_vector"),
+        "votes": {vote_id: {"embedding": random_embedding(rng, dimension)} for vote_id in vote_ids}
+    }
+    multi = {
+        "schemaVersion": 2,
+        "generatedAt": "2026-01-01T00:00:00Z",
+        "model": {
+            **build_semantic_model_descriptor("multilingual-e5-small-multi-vector", "intfloat/multilingual-e5-small", dimension, "multi_vector_sections"),
+            "vector_count_per_document": len(SEMANTIC_MULTI_VECTOR_SLOT_WEIGHTS)
+        },
+        # Le dernier scrutin n'a qu'une section (texte vide pour l'autre slot).
+        "votes": {
+            vote_id: {"vectors": [
+                {"slot": slot, "embedding": random_embedding(rng, dimension)}
+                for slot in (SEMANTIC_MULTI_VECTOR_SLOT_WEIGHTS if vote_id != vote_ids[-1] else ["subject_summary"])
+            ]}
+            for vote_id in vote_ids
+        }
+    }
+    return single, multi
+
+
+print("=== Test index semantique packe ===\n")
+
+with tempfile.TemporaryDirectory() as directory:
+    for name, payload in zip(("single_vector", "multi_vector"), build_payloads()):
+        print(f"{name}")
+        json_path = os.path.join(directory, f"{name}.json")
+        header_path = os.path.join(directory, f"{name}_packed.json")
+        write_json(json_path, payload)
+        write_packed_semantic_index(header_path, payload)
+
+        header, matrix = read_packed_semantic_index(header_path)
+        rows = sum(len(entry.get("vectors", [None])) for entry in payload["votes"].values())
+        check(list(matrix.shape) == [rows, 384], f"forme {list(matrix.shape)}")
+        check(header["voteIds"][0] == "1" and len(header["voteIds"]) == rows, "ordre des scrutins publie par ligne")
+        check(header["model"] == payload["model"], "descripteur de modele conserve")
+
+        restored = unpack_semantic_index(header, matrix)
+        check(json_backend.dumps(restored["votes"]) == json_backend.dumps(payload["votes"]), "vecteurs identiques apres aller-retour")
+
+        data_bytes = os.path.getsize(os.path.join(directory, header["dataPath"]))
+        packed_bytes = data_bytes + os.path.getsize(header_path)
+        json_bytes = os.path.getsize(json_path)
+        check(data_bytes == rows * 384, f"matrice contigue de {data_bytes} octets")
+        check(packed_bytes * 3 < json_bytes, f"packe {packed_bytes} octets contre {json_bytes} en JSON")
+
+        described = describe_packed_artifact(header_path, payload)
+        check(described is not None and described["dataPath"] == header["dataPath"], "reference manifest")
+        check(describe_packed_artifact(header_path, {**payload, "generatedAt": "autre"}) is None, "entete desynchronise ignore")
+
+        data_path = os.path.join(directory, header["dataPath"])
+        before = [os.stat(path).st_mtime_ns for path in (header_path, data_path)]
+        os.utime(header_path, ns=(before[0] - 10 ** 9, before[0] - 10 ** 9))
+        os.utime(data_path, ns=(before[1] - 10 ** 9, before[1] - 10 ** 9))
+        write_packed_semantic_index(header_path, payload)
+        check(
+            [os.stat(path).st_mtime_ns for path in (header_path, data_path)] == [before[0] - 10 ** 9, before[1] - 10 ** 9],
+            "contenu identique : entete et matrice non reecrits"
+        )
+
+print(f"\n=== {passed} OK, {failed} echec(s) ===")
+sys.exit(1 if failed else 0)
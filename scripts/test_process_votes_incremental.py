@@ -0,0 +1,155 @@
+"""Verifie que process_votes.py --incremental produit les memes sorties qu'une reconstruction complete.
+
+Archive Scrutins.json.zip synthetique (quelques deputes, dates egales pour
+exercer l'ordre des fichiers sources) : une reconstruction complete sur
+l'archive de depart, puis une passe incrementale sur l'archive enrichie
+(nouveaux scrutins, scrutin modifie), comparee octet pour octet a une
+reconstruction complete directe sur l'archive enrichie.
+
+Usage : python scripts/test_process_votes_incremental.py (code de sortie 1 si echec).
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import zipfile
+
+import json_backend
+import process_votes
+from process_votes import traitement_complet, traitement_incremental
+
+passed = 0
+failed = 0
+
+
+def check(condition, message):
+    global passed, failed
+    if condition:
+        print(f"  OK: {message}")
+        passed += 1
+    else:
+        print(f"FAIL: {message}")
+        failed += 1
+
+
+DEPUTES = ["PA1", "PA2", "PA3", "PA4"]
+
+
+def build_scrutin(numero, date, titre, positions):
+    """positions : {acteurRef: rubrique du decompteNominatif}."""
+    nominatif = {}
+    for acteur_ref, rubrique in positions.items():
+        nominatif.setdefault(rubrique, {"votant": []})["votant"].append({"acteurRef": acteur_ref})
+    return {"scrutin": {
+        "numero": str(numero),
+        "uid": f"VTANR5L17V{numero}",
+        "legislature": "17",
+        "dateScrutin": date,
+        "titre": titre,
+        "sort": {"code": "adopté"},
+        "objet": {"libelle": titre},
+        "ventilationVotes": {"organe": {"groupes": {"groupe": [
+            {"organeRef": "PO1", "nombreMembresGroupe": "4", "vote": {"positionMajoritaire": "pour", "decompteNominatif": nominatif}}
+        ]}}}
+    }}
+
+
+def build_corpus(numeros):
+    rubriques = ("pours", "contres", "abstentions", "nonVotants")
+    corpus = {}
+    for numero in numeros:
+        # Dates egales deux a deux ; PA9 (hors liste) et PA4 (absent une fois sur trois).
+        positions = {dep_id: rubriques[(numero + rang) % 4] for rang, dep_id in enumerate(DEPUTES) if (numero + rang) % 3 or dep_id != "PA4"}
+        positions["PA9"] = "pours"
+        corpus[numero] = build_scrutin(numero, f"2026-01-{(numero + 1) // 2:02d}", f"Scrutin {numero}", positions)
+    return corpus
+
+
+def write_archive(directory, corpus):
+    with zipfile.ZipFile(os.path.join(directory, "Scrutins.json.zip"), "w") as archive:
+        for numero, payload in corpus.items():
+            archive.writestr(f"json/VTANR5L17V{numero}.json", json_backend.dumps(payload))
+
+
+def read_tree(directory):
+    tree = {}
+    for racine, _dossiers, fichiers in os.walk(directory):
+        for nom in fichiers:
+            chemin = os.path.join(racine, nom)
+            with open(chemin, "rb") as f:
+                tree[os.path.relpath(chemin, directory)] = f.read()
+    return tree
+
+
+def run_in(directory, traitement):
+    """Execute un traitement depuis `directory` (chemins relatifs du pipeline), sorties console masquees."""
+    courant = os.getcwd()
+    os.chdir(directory)
+    try:
+        os.makedirs(process_votes.DIR_SORTIE_VOTES, exist_ok=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            return traitement(DEPUTES)
+    finally:
+        os.chdir(courant)
+
+
+print("=== Test process_votes incremental ===\n")
+
+with tempfile.TemporaryDirectory() as racine:
+    incremental_dir = os.path.join(racine, "incremental")
+    complet_dir = os.path.join(racine, "complet")
+    os.makedirs(incremental_dir)
+    os.makedirs(complet_dir)
+
+    depart = build_corpus(range(1, 10))
+    enrichi = build_corpus(range(1, 12))
+    enrichi[3] = build_scrutin(3, "2026-01-02", "Scrutin 3 rectifie", {"PA1": "contres", "PA2": "pours", "PA3": "nonVotants"})
+
+    print("reconstruction complete")
+    write_archive(incremental_dir, depart)
+    run_in(incremental_dir, traitement_complet)
+    sorties = os.path.join(incremental_dir, process_votes.DIR_SORTIE_VOTES)
+    etat_path = os.path.join(incremental_dir, process_votes.FICHIER_ETAT)
+    check(os.path.isfile(etat_path), "etat ecrit dans .cache/")
+    check(not any(nom.startswith("process_state") for nom in os.listdir(sorties)), "aucun etat interne dans public/")
+
+    print("\nincremental")
+    write_archive(incremental_dir, enrichi)
+    check(run_in(incremental_dir, traitement_incremental) is True, "nouveaux scrutins et scrutin modifie fusionnes sans repli")
+    write_archive(complet_dir, enrichi)
+    run_in(complet_dir, traitement_complet)
+
+    incremental_tree = read_tree(sorties)
+    complet_tree = read_tree(os.path.join(complet_dir, process_votes.DIR_SORTIE_VOTES))
+    check(sorted(incremental_tree) == sorted(complet_tree), f"memes fichiers publies ({len(complet_tree)})")
+    differents = sorted(nom for nom in complet_tree if incremental_tree.get(nom) != complet_tree[nom])
+    check(not differents, f"sorties identiques octet pour octet {differents or ''}".rstrip())
+    with open(etat_path, "rb") as f:
+        etat_incremental = f.read()
+    with open(os.path.join(complet_dir, process_votes.FICHIER_ETAT), "rb") as f:
+        check(f.read() == etat_incremental, "etats identiques")
+
+    print("\nsans changement")
+    for chemin in [etat_path] + [os.path.join(sorties, nom) for nom in incremental_tree]:
+        os.utime(chemin, ns=(10 ** 9, 10 ** 9))
+    check(run_in(incremental_dir, traitement_incremental) is True, "archive inchangee : rien a fusionner")
+    check(
+        all(os.stat(os.path.join(sorties, nom)).st_mtime_ns == 10 ** 9 for nom in incremental_tree),
+        "aucun fichier public reecrit"
+    )
+
+    print("\nrepli")
+    os.makedirs(sorties, exist_ok=True)
+    ancien_etat = os.path.join(sorties, "process_state.json")
+    with open(ancien_etat, "wb") as f:
+        f.write(b"{}")
+    del enrichi[5]
+    write_archive(incremental_dir, enrichi)
+    check(run_in(incremental_dir, traitement_incremental) is False, "scrutin disparu : reconstruction complete demandee")
+    run_in(incremental_dir, traitement_complet)
+    check(not os.path.exists(ancien_etat), "ancien etat public retire")
+
+print(f"\n=== {passed} OK, {failed} echec(s) ===")
+sys.exit(1 if failed else 0)
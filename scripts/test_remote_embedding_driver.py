@@ -0,0 +1,154 @@
+"""Exerce les chemins API distants contre le faux serveur local (sans reseau).
+
+Lots concurrents, reessais sur 429/5xx avec Retry-After, budget d'appels,
+point de reprise de l'index distant, et fiche LLM de generate_dossier_fiches
+(si ses dependances sont installees).
+
+Usage : python scripts/test_remote_embedding_driver.py (code de sortie 1 si echec).
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from fake_openai_server import FakeServerConfig, embed_text, start_fake_server
+
+# Les modules lisent cles et URL a l'import : serveur demarre avant.
+server, BASE_URL = start_fake_server(FakeServerConfig(port=0, latency_ms=150))
+os.environ["EMBEDDING_API_KEY"] = "test"
+os.environ["EMBEDDING_API_BASE_URL"] = BASE_URL
+os.environ["ANALYSIS_API_KEY"] = "test"
+os.environ["ANALYSIS_API_BASE_URL"] = BASE_URL
+
+import generate_semantic_index as gsi  # noqa: E402
+
+passed = 0
+failed = 0
+
+
+def check(condition, message):
+    global passed, failed
+    if condition:
+        print(f"  OK: {message}")
+        passed += 1
+    else:
+        print(f"FAIL: {message}")
+        failed += 1
+
+
+def run_batches(base_url, batches, concurrency, max_calls=100, rpm=6000):
+    encoder = gsi.RemoteEmbeddingEncoder(base_url=base_url, api_key="test", rpm=rpm)
+    results = {}
+    started = time.monotonic()
+    completed = gsi.embed_remote_batches(
+        encoder,
+        batches,
+        lambda position, matrix: results.__setitem__(position, matrix),
+        max_calls=max_calls,
+        deadline=time.monotonic() + 60,
+        concurrency=concurrency
+    )
+    return completed, results, time.monotonic() - started, encoder
+
+
+batches = [[f"scrutin {batch} texte {row}" for row in range(8)] for batch in range(8)]
+
+print("=== Test driver d'embeddings distants (faux serveur) ===\n")
+
+print("embed_batch")
+matrix = gsi.RemoteEmbeddingEncoder(base_url=BASE_URL, api_key="test", rpm=6000).embed_batch(batches[0][:2])
+expected = np.asarray(embed_text(batches[0][0], gsi.REMOTE_EMBEDDING_MODEL, 2048)[:gsi.REMOTE_EMBEDDING_DIMENSION])
+check(matrix.shape == (2, gsi.REMOTE_EMBEDDING_DIMENSION), f"forme {matrix.shape}")
+check(bool(np.allclose(matrix[0], expected / np.linalg.norm(expected), atol=1e-5)), "troncature Matryoshka + normalisation L2")
+
+print("\nlots concurrents")
+completed, serial_results, serial_time, _ = run_batches(BASE_URL, batches, concurrency=1)
+completed, results, concurrent_time, _ = run_batches(BASE_URL, batches, concurrency=4)
+check(completed == len(batches), f"{completed}/{len(batches)} lots aboutis")
+check(all(np.array_equal(results[position], serial_results[position]) for position in serial_results), "vecteurs identiques au sequentiel")
+check(concurrent_time * 2 < serial_time, f"4 lots en vol : {concurrent_time:.2f}s contre {serial_time:.2f}s en sequentiel")
+
+print("\nseau a jetons")
+clock = [0.0]
+waits = []
+limiter = gsi.TokenBucketRateLimiter(60, clock=lambda: clock[0], sleep=lambda seconds: (waits.append(seconds), clock.__setitem__(0, clock[0] + seconds)))
+for _ in range(3):
+    limiter.acquire()
+check(waits == [1.0, 1.0], f"60 rpm : une requete par seconde ({waits})")
+limiter.defer(5)
+limiter.acquire()
+check(abs(waits[-1] - 5.0) < 1e-9, "Retry-After suspend les acquisitions")
+check(gsi.parse_retry_after("2.5") == 2.5 and gsi.parse_retry_after("") is None, "Retry-After en secondes")
+check(gsi.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0, "Retry-After en date HTTP (passee)")
+
+print("\n429 / 5xx avec Retry-After")
+flaky_server, flaky_url = start_fake_server(FakeServerConfig(
+    port=0, latency_ms=20, error_rate_429=0.3, error_rate_5xx=0.1, retry_after_s=0.2, seed=3
+))
+completed, results, _elapsed, encoder = run_batches(flaky_url, batches, concurrency=4)
+stats = flaky_server.RequestHandlerClass.state.stats
+check(completed == len(batches), f"{completed}/{len(batches)} lots aboutis malgre {stats['rateLimited']} 429 et {stats['serverErrors']} 5xx")
+check(all(np.array_equal(results[position], serial_results[position]) for position in results), "vecteurs inchanges apres reessais")
+flaky_server.shutdown()
+
+print("\nquota epuise (Retry-After long)")
+quota_server, quota_url = start_fake_server(FakeServerConfig(port=0, rpm=3, retry_after_s=3600))
+completed, results, elapsed, _encoder = run_batches(quota_url, batches, concurrency=2)
+check(completed == 3 and len(results) == 3, f"{completed} lots acquis avant le quota")
+check(elapsed < 10, f"arret immediat ({elapsed:.2f}s), pas d'attente d'une heure")
+quota_server.shutdown()
+
+print("\nbudget d'appels")
+completed, _results, _elapsed, encoder = run_batches(BASE_URL, batches, concurrency=4, max_calls=3)
+check(completed == 3 and encoder.calls == 3, f"{completed} lots pour un budget de 3 appels")
+
+print("\npoint de reprise de l'index distant")
+index = {"votes": {str(numero): {"titre": f"titre {numero}", "subject": f"sujet {numero % 5}"} for numero in range(1, 41)}}
+previous_batch_size = gsi.REMOTE_EMBEDDING_BATCH_SIZE
+gsi.REMOTE_EMBEDDING_BATCH_SIZE = 8
+cwd = os.getcwd()
+with tempfile.TemporaryDirectory() as directory:
+    os.chdir(directory)
+    try:
+        os.makedirs(os.path.dirname(gsi.FICHIER_SEMANTIC_REMOTE_INDEX))
+        partial, changed = gsi.generate_semantic_remote_index(index, max_calls=2, rpm=6000)
+        check(changed and partial["coverage"] == 0.4, f"run interrompu : couverture {partial['coverage']}")
+
+        # Artefact jamais ecrit (job tue) : le point de reprise suffit.
+        full, changed = gsi.generate_semantic_remote_index(index, max_calls=100, rpm=6000)
+        check(full["stats"]["newlyEmbedded"] == 40 and full["coverage"] == 1.0, "reprise : 16 repris + 24 embeddes")
+        gsi.write_json(gsi.FICHIER_SEMANTIC_REMOTE_INDEX, full, compact=True)
+
+        calls_before = server.RequestHandlerClass.state.stats["embeddingsRequests"]
+        unchanged, changed = gsi.generate_semantic_remote_index(index, max_calls=100, rpm=6000)
+        calls_after = server.RequestHandlerClass.state.stats["embeddingsRequests"]
+        check(not changed and calls_after == calls_before, "run suivant : aucun appel, aucun changement")
+
+        os.remove(gsi.FICHIER_SEMANTIC_REMOTE_INDEX)
+        rebuilt, changed = gsi.generate_semantic_remote_index(index, max_calls=0, rpm=6000)
+        check(rebuilt["votes"] == full["votes"], "artefact reconstruit depuis le seul point de reprise")
+    finally:
+        os.chdir(cwd)
+        gsi.REMOTE_EMBEDDING_BATCH_SIZE = previous_batch_size
+
+print("\nfiche LLM (chat/completions)")
+try:
+    import generate_dossier_fiches as fiches
+except ImportError as error:
+    print(f"ℹ️ Test saute : {error}")
+else:
+    import requests
+
+    limiter = fiches.RateLimiter(6000)
+    session = requests.Session()
+    fiches.probe_llm_configuration(limiter, session)
+    messages = fiches.build_llm_messages(fiches.SYSTEM_PROMPT, fiches.build_user_prompt("DLR5L17N1", {"titre": "Loi test"}, "texte"))
+    parsed = fiches.parse_fiche_json(fiches.call_llm(messages, limiter, session))
+    check(parsed is not None and parsed["verdictIncitations"] in fiches.VERDICTS_VALIDES, "fiche factice valide")
+
+server.shutdown()
+print(f"\n=== {passed} OK, {failed} echec(s) ===")
+sys.exit(1 if failed else 0)
@@ -0,0 +1,103 @@
+"""Verifie l'index ANN (IVF) : ecriture/relecture, rappel@k et synchronisation manifest.
+
+Corpus synthetique : vecteurs int8 regroupes autour de themes, avec une
+composante commune forte (les embeddings E5 sont tres anisotropes).
+
+Usage : python scripts/test_semantic_ann.py (code de sortie 1 si echec).
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from generate_semantic_index import read_packed_semantic_index, write_packed_semantic_index
+from semantic_ann import (
+    SEMANTIC_ANN_TARGET_RECALL,
+    build_evaluation_queries,
+    describe_ivf_artifact,
+    exact_search,
+    prepare_ivf_search,
+    read_ivf_index,
+    search_ivf,
+    write_ivf_index,
+)
+from synthetic_semantic_corpus import build_synthetic_semantic_payload
+
+passed = 0
+failed = 0
+
+
+def check(condition, message):
+    global passed, failed
+    if condition:
+        print(f"  OK: {message}")
+        passed += 1
+    else:
+        print(f"FAIL: {message}")
+        failed += 1
+
+
+print("=== Test index ANN (IVF) ===\n")
+
+with tempfile.TemporaryDirectory() as directory:
+    packed_path = os.path.join(directory, "semantic_index_packed.json")
+    ivf_path = os.path.join(directory, "semantic_index_ivf.json")
+    write_packed_semantic_index(packed_path, build_synthetic_semantic_payload())
+    packed_header, matrix = read_packed_semantic_index(packed_path)
+
+    started = time.perf_counter()
+    header = write_ivf_index(ivf_path, packed_path, packed_header, matrix)
+    print(f"  (construction + evaluation : {time.perf_counter() - started:.1f}s)")
+
+    print("artefact")
+    check(header["lists"] == 110 and header["rows"] == len(matrix), f"{header['lists']} listes pour {header['rows']} vecteurs")
+    read_header, ivf = read_ivf_index(ivf_path)
+    check(read_header == header, "entete relu a l'identique")
+    check(sorted(ivf["rowIds"].tolist()) == list(range(len(matrix))), "chaque ligne dans exactement une liste")
+    check(int(ivf["listOffsets"][-1]) == len(matrix), "listOffsets couvre toutes les lignes")
+    check(header["dataBytes"] < matrix.nbytes // 10, f"surcout {header['dataBytes']} octets pour {matrix.nbytes} de vecteurs")
+
+    print("\nrappel")
+    probes = {entry["nprobe"]: entry for entry in header["evaluation"]["probes"]}
+    default = probes[header["defaultProbes"]]
+    check(default["recall"] >= SEMANTIC_ANN_TARGET_RECALL, f"rappel@10 {default['recall']} a nprobe={header['defaultProbes']}")
+    check(header["defaultProbes"] < header["lists"] // 4, f"nprobe {header['defaultProbes']} << {header['lists']} listes")
+    check(probes[header["lists"]]["recall"] == 1.0, "sonder toutes les listes = recherche exhaustive")
+
+    vectors = matrix.astype(np.float32)
+    query = build_evaluation_queries(matrix, count=1, seed=3)[0]
+    rows, scores = search_ivf(query, prepare_ivf_search(ivf, matrix), k=10, nprobe=header["lists"])
+    check(rows.tolist() == exact_search(query, vectors, 10).tolist(), "ordre identique a l'exhaustif")
+    check(bool(np.all(np.diff(scores) <= 0)), "scores decroissants")
+
+    print("\nreconstruction")
+    check(all("meanQueryMs" not in entry for entry in header["evaluation"]["probes"]), "aucune latence dans l'artefact")
+    data_path = os.path.join(directory, header["dataPath"])
+    with open(data_path, "rb") as handle:
+        first_data = handle.read()
+    os.utime(ivf_path, ns=(1_000_000_000, 1_000_000_000))
+    os.utime(data_path, ns=(1_000_000_000, 1_000_000_000))
+    started = time.perf_counter()
+    check(write_ivf_index(ivf_path, packed_path, packed_header, matrix) == header, "entete en place reutilise")
+    check(time.perf_counter() - started < 1.0, "k-means non relance pour une matrice packee inchangee")
+    check(os.stat(ivf_path).st_mtime_ns == 1_000_000_000 and os.stat(data_path).st_mtime_ns == 1_000_000_000, "fichiers non reecrits")
+    os.remove(ivf_path)
+    check(write_ivf_index(ivf_path, packed_path, packed_header, matrix) == header, "reconstruction deterministe")
+    with open(data_path, "rb") as handle:
+        check(handle.read() == first_data, "donnees IVF identiques octet pour octet")
+    check(os.stat(data_path).st_mtime_ns == 1_000_000_000, "donnees identiques non reecrites")
+
+    print("\nmanifest")
+    described = describe_ivf_artifact(ivf_path, packed_path)
+    check(described is not None and described["defaultProbes"] == header["defaultProbes"], "reference manifest")
+    check(described is not None and described["recallAtK"] == default["recall"], "rappel publie")
+
+    payload = build_synthetic_semantic_payload(rows=500)
+    write_packed_semantic_index(packed_path, payload)
+    check(describe_ivf_artifact(ivf_path, packed_path) is None, "IVF desynchronise de l'index packe ignore")
+
+print(f"\n=== {passed} OK, {failed} echec(s) ===")
+sys.exit(1 if failed else 0)
@@ -0,0 +1,102 @@
+"""Verifie les codes binaires centres : taille, rappel apres re-classement int8, manifest.
+
+Usage : python scripts/test_semantic_binary.py (code de sortie 1 si echec).
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+import semantic_binary
+from generate_semantic_index import read_packed_semantic_index, write_packed_semantic_index
+from semantic_ann import SEMANTIC_ANN_TARGET_RECALL, build_evaluation_queries, exact_search
+from semantic_binary import (
+    build_binary_index,
+    describe_binary_artifact,
+    encode_sign_bits,
+    evaluate_binary_recall,
+    hamming_distances,
+    read_binary_index,
+    search_binary,
+    write_binary_index,
+)
+from synthetic_semantic_corpus import build_synthetic_semantic_payload
+
+passed = 0
+failed = 0
+
+
+def check(condition, message):
+    global passed, failed
+    if condition:
+        print(f"  OK: {message}")
+        passed += 1
+    else:
+        print(f"FAIL: {message}")
+        failed += 1
+
+
+print("=== Test codes binaires semantiques ===\n")
+
+with tempfile.TemporaryDirectory() as directory:
+    packed_path = os.path.join(directory, "semantic_index_packed.json")
+    binary_path = os.path.join(directory, "semantic_index_binary.json")
+    write_packed_semantic_index(packed_path, build_synthetic_semantic_payload())
+    packed_header, matrix = read_packed_semantic_index(packed_path)
+    header = write_binary_index(binary_path, packed_path, packed_header, matrix)
+
+    print("artefact")
+    check(header["bytesPerVector"] == 48, f"{header['bytesPerVector']} octets par vecteur de 384 composantes")
+    check(header["dataBytes"] * 8 == matrix.nbytes, f"{header['dataBytes']} octets contre {matrix.nbytes} en int8 (1/8)")
+    read_header, binary_index = read_binary_index(binary_path)
+    check(read_header == header, "entete relu a l'identique")
+    check(np.array_equal(binary_index["codes"], build_binary_index(matrix)["codes"]), "codes relus a l'identique")
+
+    print("\nhamming")
+    codes = binary_index["codes"]
+    table = semantic_binary._POPCOUNT[np.bitwise_xor(codes, codes[0])].sum(axis=1)
+    check(np.array_equal(hamming_distances(codes, codes[0]), table), "popcount 64 bits = table par octet")
+    check(int(hamming_distances(codes, codes[0])[0]) == 0, "distance nulle a soi-meme")
+
+    print("\nrappel")
+    shortlists = {entry["shortlist"]: entry for entry in header["evaluation"]["shortlists"]}
+    default = shortlists[header["defaultShortlist"]]
+    check(default["recall"] >= SEMANTIC_ANN_TARGET_RECALL, f"rappel@10 {default['recall']} avec shortlist={header['defaultShortlist']}")
+    check(header["defaultShortlist"] <= len(matrix) // 50, f"shortlist {header['defaultShortlist']} pour {len(matrix)} vecteurs")
+
+    vectors = matrix.astype(np.float32)
+    query = build_evaluation_queries(matrix, count=1, seed=5)[0]
+    rows, _scores = search_binary(query, binary_index, vectors, k=10, shortlist=len(matrix))
+    check(rows.tolist() == exact_search(query, vectors, 10).tolist(), "shortlist = corpus : identique a l'exhaustif int8")
+
+    # Sans centrage, la composante commune fixe la plupart des signes.
+    queries = build_evaluation_queries(matrix, count=100)
+    uncentered = {"center": np.zeros(matrix.shape[1], dtype=np.float32)}
+    uncentered["codes"] = encode_sign_bits(vectors / 127, uncentered["center"])
+    centered_recall = evaluate_binary_recall(binary_index, matrix, queries, shortlists=(50,))[0]["recall"]
+    uncentered_recall = evaluate_binary_recall(uncentered, matrix, queries, shortlists=(50,))[0]["recall"]
+    check(centered_recall > uncentered_recall, f"centrage : rappel {centered_recall} contre {uncentered_recall} (shortlist 50)")
+
+    print("\nreconstruction")
+    check(all("meanQueryMs" not in entry for entry in header["evaluation"]["shortlists"]), "aucune latence dans l'artefact")
+    data_path = os.path.join(directory, header["dataPath"])
+    os.utime(binary_path, ns=(1_000_000_000, 1_000_000_000))
+    os.utime(data_path, ns=(1_000_000_000, 1_000_000_000))
+    check(write_binary_index(binary_path, packed_path, packed_header, matrix) == header, "entete en place reutilise")
+    check(os.stat(binary_path).st_mtime_ns == 1_000_000_000 and os.stat(data_path).st_mtime_ns == 1_000_000_000, "fichiers non reecrits")
+    os.remove(binary_path)
+    check(write_binary_index(binary_path, packed_path, packed_header, matrix) == header, "reconstruction deterministe")
+    check(os.stat(data_path).st_mtime_ns == 1_000_000_000, "codes identiques non reecrits")
+
+    print("\nmanifest")
+    described = describe_binary_artifact(binary_path, packed_path)
+    check(described is not None and described["rescoring"] == "packed-int8", "reference manifest")
+    check(described is not None and described["recallAtK"] == default["recall"], "rappel publie")
+
+    write_packed_semantic_index(packed_path, build_synthetic_semantic_payload(rows=500))
+    check(describe_binary_artifact(binary_path, packed_path) is None, "codes desynchronises de l'index packe ignores")
+
+print(f"\n=== {passed} OK, {failed} echec(s) ===")
+sys.exit(1 if failed else 0)
@@ -0,0 +1,50 @@
+"""Verifie l'automate de termes et la parite de classify_vote / get_synonyms.
+
+Usage : python scripts/test_term_matcher.py (code de sortie 1 si echec).
+"""
+
+import random
+import sys
+
+from benchmark_term_matching import build_synthetic_titles, classify_vote_legacy, get_synonyms_legacy
+from generate_semantic_index import classify_vote, extract_keywords_from_title, get_synonyms
+from term_matcher import build_term_matcher, find_terms
+
+passed = 0
+failed = 0
+
+
+def check(condition, message):
+    global passed, failed
+    if condition:
+        print(f"  OK: {message}")
+        passed += 1
+    else:
+        print(f"FAIL: {message}")
+        failed += 1
+
+
+print("=== Test automate de termes ===\n")
+
+print("automate")
+matcher = build_term_matcher(["sécurité", "sécurité sociale", "curité", "ia", "social"])
+check(find_terms(matcher, "la sécurité sociale") == {"sécurité", "sécurité sociale", "curité", "ia", "social"}, "chevauchements rapportes")
+check(find_terms(matcher, "") == set() and find_terms(build_term_matcher([]), "texte") == set(), "texte ou automate vide")
+
+rng = random.Random(3)
+terms = ["".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(30)]
+random_matcher = build_term_matcher(terms)
+texts = ["".join(rng.choice("abcd") for _ in range(rng.randint(0, 40))) for _ in range(500)]
+check(all(find_terms(random_matcher, text) == {term for term in terms if term in text} for text in texts), "identique a `terme in texte` (500 textes aleatoires)")
+
+print("\nparite avec les boucles historiques")
+titles = build_synthetic_titles(5000)
+check(all(classify_vote(titre) == classify_vote_legacy(titre) for titre in titles), "classify_vote (5000 titres)")
+keywords = [extract_keywords_from_title(titre) for titre in titles]
+check(all(get_synonyms(words) == get_synonyms_legacy(words) for words in keywords), "get_synonyms (5000 titres)")
+check(get_synonyms(["san", "logements"]) == get_synonyms_legacy(["san", "logements"]), "mot-cle contenu dans un mot de base")
+check(classify_vote("Projet de loi de finances : TVA et impôt") == "fiscal", "classification")
+check(classify_vote("Motion de procédure") == classify_vote_legacy("Motion de procédure"), "egalite et absence de terme")
+
+print(f"\n=== {passed} OK, {failed} echec(s) ===")
+sys.exit(1 if failed else 0)